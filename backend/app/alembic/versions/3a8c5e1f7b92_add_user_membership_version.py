@@ -0,0 +1,28 @@
+"""Add user.membership_version
+
+Revision ID: 3a8c5e1f7b92
+Revises: 9d3f6b2a8e14
+Create Date: 2026-10-19 19:12:40.305871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '3a8c5e1f7b92'
+down_revision = '9d3f6b2a8e14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'user',
+        sa.Column('membership_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_column('user', 'membership_version')
@@ -0,0 +1,63 @@
+"""Convert task due_date to DATE and index it
+
+Revision ID: 3c9e5a1f7b42
+Revises: 7f287cbcd2ce
+Create Date: 2026-10-19 09:12:31.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e5a1f7b42'
+down_revision = '7f287cbcd2ce'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Backfill: keep the YYYY-MM-DD prefix of anything that looks like an ISO
+    # date (clients sometimes sent full timestamps), drop everything else,
+    # including dates that do not exist (2024-02-30) and would fail the cast.
+    op.execute(
+        """
+        CREATE FUNCTION pg_temp.safe_date(value text) RETURNS date AS $$
+        BEGIN
+            RETURN value::date;
+        EXCEPTION WHEN datetime_field_overflow OR invalid_datetime_format THEN
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        UPDATE task
+        SET due_date = CASE
+            WHEN due_date ~ '^\\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\\d|3[01])'
+            THEN pg_temp.safe_date(substring(due_date from 1 for 10))::text
+            ELSE NULL
+        END
+        WHERE due_date IS NOT NULL
+        """
+    )
+    op.execute("DROP FUNCTION pg_temp.safe_date(text)")
+    op.alter_column('task', 'due_date',
+               existing_type=sqlmodel.sql.sqltypes.AutoString(),
+               type_=sa.Date(),
+               existing_nullable=True,
+               postgresql_using='due_date::date')
+    op.create_index('ix_task_assignee_id_due_date', 'task', ['assignee_id', 'due_date'], unique=False)
+    op.create_index('ix_task_project_id_due_date', 'task', ['project_id', 'due_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_project_id_due_date', table_name='task')
+    op.drop_index('ix_task_assignee_id_due_date', table_name='task')
+    op.alter_column('task', 'due_date',
+               existing_type=sa.Date(),
+               type_=sqlmodel.sql.sqltypes.AutoString(),
+               existing_nullable=True,
+               postgresql_using="to_char(due_date, 'YYYY-MM-DD')")
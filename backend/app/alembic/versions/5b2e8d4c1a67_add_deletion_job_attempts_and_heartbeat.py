@@ -0,0 +1,30 @@
+"""Add deletionjob.attempts and heartbeat_at
+
+Revision ID: 5b2e8d4c1a67
+Revises: 3a8c5e1f7b92
+Create Date: 2026-10-19 21:04:17.552310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2e8d4c1a67'
+down_revision = '3a8c5e1f7b92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'deletionjob',
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column('deletionjob', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('deletionjob', 'heartbeat_at')
+    op.drop_column('deletionjob', 'attempts')
@@ -0,0 +1,36 @@
+"""Add comment_count and attachment_count to task
+
+Revision ID: 5b2f7c9d1e63
+Revises: 8d41b6e2c0f9
+Create Date: 2026-10-19 11:21:05.318442
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2f7c9d1e63'
+down_revision = '8d41b6e2c0f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task', sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('task', sa.Column('attachment_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(
+        """
+        UPDATE task SET
+            comment_count = (SELECT count(*) FROM comment WHERE comment.task_id = task.id),
+            attachment_count = (SELECT count(*) FROM attachment WHERE attachment.task_id = task.id)
+        """
+    )
+    op.alter_column('task', 'comment_count', server_default=None)
+    op.alter_column('task', 'attachment_count', server_default=None)
+
+
+def downgrade():
+    op.drop_column('task', 'attachment_count')
+    op.drop_column('task', 'comment_count')
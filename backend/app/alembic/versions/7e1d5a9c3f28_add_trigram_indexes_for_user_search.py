@@ -0,0 +1,39 @@
+"""Add trigram indexes for user search
+
+Revision ID: 7e1d5a9c3f28
+Revises: c2b9e4f7a031
+Create Date: 2026-10-19 17:12:05.447129
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '7e1d5a9c3f28'
+down_revision = 'c2b9e4f7a031'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+def upgrade():
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).first()
+    if not available:
+        # Search still works without the indexes, just with a sequential scan
+        logger.warning('pg_trgm is not available, skipping user search indexes')
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_user_email_trgm', 'user', ['email'], unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+    op.create_index('ix_user_full_name_trgm', 'user', ['full_name'], unique=False, postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'})
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_user_full_name_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_user_email_trgm')
@@ -0,0 +1,48 @@
+"""Add updated_at and tombstones for delta sync
+
+Revision ID: 8d41b6e2c0f9
+Revises: 3c9e5a1f7b42
+Create Date: 2026-10-19 10:03:47.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '8d41b6e2c0f9'
+down_revision = '3c9e5a1f7b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('task', 'section', 'comment'):
+        # server_default backfills existing rows; the ORM sets the value afterwards
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()))
+        op.alter_column(table, 'updated_at', server_default=None)
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+    op.create_table('tombstone',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('entity_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('entity_id', sa.Uuid(), nullable=False),
+    sa.Column('project_id', sa.Uuid(), nullable=True),
+    sa.Column('workspace_id', sa.Uuid(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tombstone_deleted_at'), 'tombstone', ['deleted_at'], unique=False)
+    op.create_index(op.f('ix_tombstone_project_id'), 'tombstone', ['project_id'], unique=False)
+    op.create_index(op.f('ix_tombstone_workspace_id'), 'tombstone', ['workspace_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_tombstone_workspace_id'), table_name='tombstone')
+    op.drop_index(op.f('ix_tombstone_project_id'), table_name='tombstone')
+    op.drop_index(op.f('ix_tombstone_deleted_at'), table_name='tombstone')
+    op.drop_table('tombstone')
+    for table in ('comment', 'section', 'task'):
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+        op.drop_column(table, 'updated_at')
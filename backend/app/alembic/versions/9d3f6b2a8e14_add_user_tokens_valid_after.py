@@ -0,0 +1,25 @@
+"""Add user.tokens_valid_after
+
+Revision ID: 9d3f6b2a8e14
+Revises: 7e1d5a9c3f28
+Create Date: 2026-10-19 18:05:12.481263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3f6b2a8e14'
+down_revision = '7e1d5a9c3f28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('tokens_valid_after', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('user', 'tokens_valid_after')
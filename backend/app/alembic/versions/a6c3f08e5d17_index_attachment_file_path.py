@@ -0,0 +1,25 @@
+"""Index attachment file_path
+
+Revision ID: a6c3f08e5d17
+Revises: e4a7d2c91b05
+Create Date: 2026-10-19 15:47:12.604381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c3f08e5d17'
+down_revision = 'e4a7d2c91b05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_attachment_file_path'), 'attachment', ['file_path'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_attachment_file_path'), table_name='attachment')
@@ -0,0 +1,41 @@
+"""Add partial indexes for pending invitations
+
+Revision ID: c2b9e4f7a031
+Revises: a6c3f08e5d17
+Create Date: 2026-10-19 16:31:48.220917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2b9e4f7a031'
+down_revision = 'a6c3f08e5d17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep only the newest pending invitation per workspace and email
+    op.execute(
+        """
+        UPDATE invitation SET status = 'expired'
+        WHERE status = 'pending' AND id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY workspace_id, email ORDER BY created_at DESC
+                ) AS rn
+                FROM invitation WHERE status = 'pending'
+            ) ranked WHERE rn > 1
+        )
+        """
+    )
+    op.create_index('ix_invitation_pending_expires_at', 'invitation', ['expires_at'], unique=False, postgresql_where=sa.text("status = 'pending'"))
+    op.create_index('uq_invitation_pending_workspace_id_email', 'invitation', ['workspace_id', 'email'], unique=True, postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade():
+    op.drop_index('uq_invitation_pending_workspace_id_email', table_name='invitation', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_index('ix_invitation_pending_expires_at', table_name='invitation', postgresql_where=sa.text("status = 'pending'"))
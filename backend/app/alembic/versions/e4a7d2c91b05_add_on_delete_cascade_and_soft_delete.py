@@ -0,0 +1,88 @@
+"""Add ON DELETE CASCADE foreign keys, soft delete and deletion jobs
+
+Revision ID: e4a7d2c91b05
+Revises: 5b2f7c9d1e63
+Create Date: 2026-10-19 14:02:37.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a7d2c91b05'
+down_revision = '5b2f7c9d1e63'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, referenced table, ondelete)
+FOREIGN_KEYS = [
+    ('workspacemember', 'workspace_id', 'workspace', 'CASCADE'),
+    ('invitation', 'workspace_id', 'workspace', 'CASCADE'),
+    ('project', 'workspace_id', 'workspace', 'CASCADE'),
+    ('projectmember', 'project_id', 'project', 'CASCADE'),
+    ('section', 'project_id', 'project', 'CASCADE'),
+    ('task', 'project_id', 'project', 'CASCADE'),
+    ('task', 'section_id', 'section', 'SET NULL'),
+    ('comment', 'task_id', 'task', 'CASCADE'),
+    ('activitylog', 'task_id', 'task', 'CASCADE'),
+    ('attachment', 'task_id', 'task', 'CASCADE'),
+    ('attachment', 'comment_id', 'comment', 'CASCADE'),
+]
+
+# Postgres does not index foreign key columns; without these every cascaded
+# delete scans the child table
+INDEXES = [
+    ('invitation', 'workspace_id'),
+    ('project', 'workspace_id'),
+    ('section', 'project_id'),
+    ('task', 'section_id'),
+    ('comment', 'task_id'),
+    ('activitylog', 'task_id'),
+    ('attachment', 'task_id'),
+    ('attachment', 'comment_id'),
+]
+
+
+def upgrade():
+    for table, column, referent, ondelete in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referent, [column], ['id'], ondelete=ondelete)
+    for table, column in INDEXES:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+    op.add_column('workspace', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('project', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    op.create_table('deletionjob',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('entity_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('entity_id', sa.Uuid(), nullable=False),
+    sa.Column('requested_by_id', sa.Uuid(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('total_rows', sa.Integer(), nullable=False),
+    sa.Column('deleted_rows', sa.Integer(), nullable=False),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(length=1000), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_deletionjob_entity_id'), 'deletionjob', ['entity_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_deletionjob_entity_id'), table_name='deletionjob')
+    op.drop_table('deletionjob')
+
+    op.drop_column('project', 'deleted_at')
+    op.drop_column('workspace', 'deleted_at')
+
+    for table, column in INDEXES:
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+    for table, column, referent, _ondelete in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referent, [column], ['id'])
@@ -0,0 +1,37 @@
+import uuid
+
+from fastapi import HTTPException
+from sqlmodel import Session, col, select
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.models import DeletionJob, User
+
+
+def purge(job_id: uuid.UUID) -> None:
+    """
+    Background task: remove the rows of a soft-deleted workspace or project.
+    Runs after the response is sent, with its own session.
+    """
+    with Session(engine) as session:
+        job = crud.claim_deletion_job(session=session, job_id=job_id)
+        if job:
+            crud.run_deletion_job(
+                session=session, job=job, batch_size=settings.DELETION_BATCH_SIZE
+            )
+
+
+def read_deletion_job(
+    session: Session, current_user: User, entity_id: uuid.UUID
+) -> DeletionJob:
+    job = session.exec(
+        select(DeletionJob)
+        .where(DeletionJob.entity_id == entity_id)
+        .order_by(col(DeletionJob.created_at).desc())
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Deletion not found")
+    if not current_user.is_superuser and job.requested_by_id != current_user.id:
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    return job
@@ -1,4 +1,6 @@
+import uuid
 from collections.abc import Generator
+from datetime import timezone
 from typing import Annotated
 
 import jwt
@@ -11,7 +13,9 @@ from sqlmodel import Session
 from app.core import security
 from app.core.config import settings
 from app.core.db import engine
-from app.models import TokenPayload, User
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT
+from app.core.token_denylist import denylist
+from app.models import ProjectMember, TokenPayload, User, WorkspaceMember
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -20,6 +24,10 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 def get_db() -> Generator[Session, None, None]:
     with Session(engine) as session:
+        if settings.METRICS_ENABLED:
+            # Check the connection out up front so the pool wait is measured
+            with DB_POOL_CHECKOUT_WAIT.time():
+                session.connection()
         yield session
 
 
@@ -27,7 +35,7 @@ SessionDep = Annotated[Session, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def decode_token(token: str, token_type: str = "access") -> TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -38,17 +46,91 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
+    if token_data.type != token_type or (
+        token_data.jti and denylist.is_revoked(token_data.jti)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+    return token_data
+
+
+def get_token_user(session: Session, token_data: TokenPayload) -> User:
     user = session.get(User, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    if user.tokens_valid_after and (
+        token_data.iat is None
+        or token_data.iat
+        < user.tokens_valid_after.replace(tzinfo=timezone.utc).timestamp()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
     return user
 
 
+def get_token_data(token: TokenDep) -> TokenPayload:
+    return decode_token(token)
+
+
+# FastAPI caches dependencies per request, so the token is decoded once however
+# many dependencies ask for it
+TokenDataDep = Annotated[TokenPayload, Depends(get_token_data)]
+
+
+def get_current_user(session: SessionDep, token_data: TokenDataDep) -> User:
+    return get_token_user(session, token_data)
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+class Memberships:
+    """
+    The current user's workspace and project roles (None if not a member).
+
+    Read from the access token's claims while their version matches the
+    user's membership_version, from the database otherwise.
+    """
+
+    def __init__(self, session: Session, user: User, token_data: TokenPayload):
+        self.session = session
+        self.user = user
+        self.claims = (
+            token_data
+            if settings.TOKEN_MEMBERSHIP_CLAIMS
+            and token_data.mv is not None
+            and token_data.mv == user.membership_version
+            else None
+        )
+
+    def workspace_role(self, workspace_id: uuid.UUID) -> str | None:
+        if self.claims and self.claims.ws is not None:
+            return self.claims.ws.get(workspace_id.hex)
+        member = self.session.get(WorkspaceMember, (workspace_id, self.user.id))
+        return member.role if member else None
+
+    def project_role(self, project_id: uuid.UUID) -> str | None:
+        if self.claims and self.claims.pj is not None:
+            return self.claims.pj.get(project_id.hex)
+        member = self.session.get(ProjectMember, (project_id, self.user.id))
+        return member.role if member else None
+
+
+def get_memberships(
+    session: SessionDep, current_user: CurrentUser, token_data: TokenDataDep
+) -> Memberships:
+    return Memberships(session, current_user, token_data)
+
+
+MembershipsDep = Annotated[Memberships, Depends(get_memberships)]
+
+
 def get_current_active_superuser(current_user: CurrentUser) -> User:
     if not current_user.is_superuser:
         raise HTTPException(
@@ -0,0 +1,83 @@
+"""
+Sparse fieldsets for list endpoints: `?fields=id,title,status` selects only
+those columns and returns only those keys. `id` is always included. Without
+`fields` the full rows are validated against the route's response model;
+partial rows cannot be, so they are serialized as they come.
+"""
+
+import functools
+from collections.abc import Callable, Iterable, Sequence
+from typing import Annotated, Any
+
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+def fields_query(columns: Sequence[Any]) -> Callable[..., list[str] | None]:
+    """
+    Dependency parsing `fields` into names of `columns` (by key, so labels
+    count), in column order. Unknown names are a 400.
+    """
+    allowed = [column.key for column in columns]
+
+    def parse_fields(
+        fields: Annotated[
+            str | None,
+            Query(description=f"Comma-separated subset of: {', '.join(allowed)}"),
+        ] = None,
+    ) -> list[str] | None:
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested.difference(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        return [name for name in allowed if name == "id" or name in requested]
+
+    return parse_fields
+
+
+def select_fields(
+    columns: Sequence[Any],
+    fields: Iterable[str] | None,
+    *,
+    required: Iterable[str] = (),
+) -> list[Any]:
+    """
+    The columns named in `fields`, plus `required` ones the query itself needs
+    (ordering, permission checks); those are not returned to the client.
+    """
+    if fields is None:
+        return list(columns)
+    names = {*fields, *required}
+    return [column for column in columns if column.key in names]
+
+
+def dump_rows(rows: Iterable[Any], fields: Sequence[str]) -> list[dict[str, Any]]:
+    return [{name: row._mapping[name] for name in fields} for row in rows]
+
+
+@functools.cache
+def _adapter(model: type[BaseModel]) -> TypeAdapter[Any]:
+    return TypeAdapter(model)
+
+
+def list_response(
+    model: type[BaseModel],
+    rows: Iterable[Any],
+    fields: Sequence[str] | None,
+    **extra: Any,
+) -> Response:
+    """
+    One page as {"data": rows, **extra}. Full pages are validated and dumped by
+    pydantic-core against `model`, the route's response model, which is much
+    cheaper than FastAPI's own response_model pass over ORM objects.
+    """
+    if fields:
+        return ORJSONResponse({"data": dump_rows(rows, fields), **extra})
+    adapter = _adapter(model)
+    page = adapter.validate_python({"data": [row._asdict() for row in rows], **extra})
+    return Response(adapter.dump_json(page), media_type="application/json")
@@ -8,6 +8,7 @@ from app.api.routes import (
     login,
     projects,
     sections,
+    sync,
     tasks,
     users,
     utils,
@@ -27,6 +28,7 @@ api_router.include_router(sections.router, tags=["sections"])
 api_router.include_router(tasks.router, tags=["tasks"])
 api_router.include_router(comments.router, tags=["comments"])
 api_router.include_router(attachments.router, tags=["attachments"])
+api_router.include_router(sync.router, tags=["sync"])
 api_router.include_router(invitations.router, prefix="/invitations", tags=["invitations"])
 
 
@@ -0,0 +1,123 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from typing import Any, Literal
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, tuple_
+from sqlmodel import Session, func, select
+
+# exact: COUNT(*) over the filtered query (default, previous behaviour)
+# estimated: the planner's row estimate, which for unfiltered scans is
+#   pg_class.reltuples scaled to the current table size
+# none: skip counting entirely, clients rely on has_more
+CountMode = Literal["exact", "estimated", "none"]
+
+
+def estimate_count(session: Session, statement: Any) -> int:
+    """
+    Return the planner's row estimate for statement without executing it.
+    """
+    compiled = statement.compile(dialect=session.get_bind().dialect)
+    plan = (
+        session.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+        .scalar()
+    )
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def paginate(
+    session: Session,
+    statement: Any,
+    *,
+    skip: int,
+    limit: int,
+    include_count: CountMode = "exact",
+) -> tuple[Sequence[Any], int | None, bool]:
+    """
+    Run one page of statement and return (rows, count, has_more).
+
+    One extra row is fetched to compute has_more, so no count query is needed
+    to tell whether another page exists.
+    """
+    rows = session.exec(statement.offset(skip).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    count: int | None = None
+    if include_count != "none":
+        if not has_more and (rows or skip == 0):
+            # Last page: the total is known without asking the database
+            count = skip + len(rows)
+        elif include_count == "estimated":
+            count = estimate_count(session, statement.order_by(None))
+        else:
+            count_statement = select(func.count()).select_from(
+                statement.order_by(None).subquery()
+            )
+            count = session.exec(count_statement).one()
+
+    return rows, count, has_more
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def _from_json(column: Any, value: Any) -> Any:
+    # JSON has no UUID or datetime; rebuild them from their string form
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    return python_type(value)
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list):
+            raise ValueError(cursor)
+        # strict: a cursor from another ordering has a different length
+        return [_from_json(c, v) for c, v in zip(columns, values, strict=True)]
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_paginate(
+    session: Session,
+    statement: Any,
+    *,
+    order_by: Sequence[Any],
+    cursor: str | None,
+    limit: int,
+    skip: int = 0,
+    include_count: CountMode = "exact",
+) -> tuple[Sequence[Any], int | None, bool, str | None]:
+    """
+    Run one page of statement ordered by the unique key order_by, starting
+    after cursor. Returns (rows, count, has_more, next_cursor).
+
+    Seeking past the last key stays fast at any depth, unlike OFFSET. The
+    count is only computed for the first page; clients keep it from there.
+    """
+    statement = statement.order_by(*order_by)
+    if cursor:
+        values = decode_cursor(cursor, order_by)
+        after = [
+            bindparam(None, v, type_=c.type)
+            for c, v in zip(order_by, values, strict=True)
+        ]
+        statement = statement.where(tuple_(*order_by) > tuple_(*after))
+        include_count = "none"
+    rows, count, has_more = paginate(
+        session, statement, skip=skip, limit=limit, include_count=include_count
+    )
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor([getattr(rows[-1], c.key) for c in order_by])
+    return rows, count, has_more, next_cursor
@@ -0,0 +1,136 @@
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+import anyio.to_thread
+from fastapi import HTTPException
+from sqlmodel import Session
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.deps import decode_token, get_token_user
+from app.core.config import settings
+from app.core.db import engine
+
+if TYPE_CHECKING:
+    # pyinstrument is only imported once a request is actually profiled
+    from pyinstrument.session import Session as ProfilerSession
+
+# Sessions recorded in worker threads for the request being profiled. Sync
+# endpoints and dependencies (get_db, get_current_user) run in the threadpool,
+# which a profiler started on the event loop thread cannot see.
+_thread_sessions: ContextVar["list[ProfilerSession] | None"] = ContextVar(
+    "profiler_thread_sessions", default=None
+)
+_original_run_sync = anyio.to_thread.run_sync
+
+
+async def _run_sync(func: Any, *args: Any, **kwargs: Any) -> Any:
+    sessions = _thread_sessions.get()
+    if sessions is None:
+        return await _original_run_sync(func, *args, **kwargs)
+
+    from pyinstrument import Profiler
+
+    def profiled(*call_args: Any) -> Any:
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL, async_mode="disabled")
+        profiler.start()
+        try:
+            return func(*call_args)
+        finally:
+            sessions.append(profiler.stop())
+
+    return await _original_run_sync(profiled, *args, **kwargs)
+
+
+def install_thread_profiling() -> None:
+    """
+    Replace anyio.to_thread.run_sync for the whole process, so threadpool
+    calls made while a request is profiled are profiled too. starlette and
+    FastAPI look the function up on the module at call time. Outside a
+    profiled request the replacement only adds a contextvar lookup.
+    """
+    anyio.to_thread.run_sync = _run_sync  # type: ignore[assignment]
+
+
+def _is_superuser(token: str) -> bool:
+    with Session(engine) as session:
+        try:
+            return get_token_user(session, decode_token(token)).is_superuser
+        except HTTPException:
+            return False
+
+
+class ProfilerMiddleware:
+    """
+    Profile an API request when a superuser sends an X-Profile header.
+
+    The response body is replaced with the profile: speedscope JSON for
+    ``X-Profile: speedscope``, pyinstrument's HTML report otherwise. Anyone
+    else sending the header gets the normal response. Without
+    install_thread_profiling() only code on the event loop shows up.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(settings.API_V1_STR):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        mode = headers.get("x-profile")
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if (
+            not mode
+            or scheme.lower() != "bearer"
+            or not await _original_run_sync(_is_superuser, token)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+        from pyinstrument.session import Session as ProfilerSession
+
+        status = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        sessions: list[ProfilerSession] = []
+        token_var = _thread_sessions.set(sessions)
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL, async_mode="enabled")
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            session = profiler.stop()
+            _thread_sessions.reset(token_var)
+        for thread_session in sessions:
+            session = ProfilerSession.combine(session, thread_session)
+        elapsed_ms = (time.perf_counter() - start) * 1e3
+
+        if mode.lower() == "speedscope":
+            body = SpeedscopeRenderer().render(session)
+            content_type = b"application/json"
+        else:
+            body = HTMLRenderer().render(session)
+            content_type = b"text/html; charset=utf-8"
+        encoded = body.encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", content_type),
+                    (b"content-length", str(len(encoded)).encode()),
+                    (b"x-profiled-status", str(status).encode()),
+                    (b"x-profiled-duration-ms", f"{elapsed_ms:.2f}".encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": encoded})
@@ -0,0 +1,105 @@
+import hashlib
+import math
+import time
+from typing import Annotated
+
+import structlog
+from fastapi import Form, HTTPException, Request
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+logger = structlog.get_logger()
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    "10/minute" -> (10, 60)
+    """
+    count, _, period = rate.partition("/")
+    return int(count), PERIODS[period]
+
+
+async def hit(bucket: str, key: str, rate: str) -> None:
+    """
+    Count a request against `rate` for `key` and raise 429 when over it.
+
+    Sliding window counter: the previous fixed window's count is weighted by
+    how much of it still overlaps the sliding window. Two small keys per
+    client instead of a log of timestamps, and one round trip. Rejected
+    requests count too, so a client that keeps hammering stays blocked.
+    If Redis is unavailable requests are let through.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    limit, period = parse_rate(rate)
+    now = time.time()
+    window = int(now // period)
+    current_key = f"ratelimit:{bucket}:{key}:{window}"
+    previous_key = f"ratelimit:{bucket}:{key}:{window - 1}"
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.incr(current_key)
+            pipe.expire(current_key, period * 2)
+            pipe.get(previous_key)
+            current, _, previous = await pipe.execute()
+    except RedisError as e:
+        logger.warning("rate_limit_unavailable", bucket=bucket, error=str(e))
+        return
+
+    elapsed = now - window * period
+    estimated = int(previous or 0) * (period - elapsed) / period + current
+    if estimated > limit:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests",
+            headers={"Retry-After": str(math.ceil(period - elapsed))},
+        )
+
+
+def _client_ip(request: Request) -> str:
+    # uvicorn puts the address from X-Forwarded-For here, but only for requests
+    # from SERVER_FORWARDED_ALLOW_IPS; otherwise this is the proxy's address
+    return request.client.host if request.client else "unknown"
+
+
+def _email_key(email: str) -> str:
+    # Keep addresses out of Redis
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+
+# Used as route-level dependencies so they run before the DB session is
+# opened and before any password hashing or email sending.
+
+
+async def limit_login(request: Request, username: Annotated[str, Form()]) -> None:
+    await hit("login:ip", _client_ip(request), settings.RATE_LIMIT_LOGIN_PER_IP)
+    await hit("login:email", _email_key(username), settings.RATE_LIMIT_LOGIN_PER_EMAIL)
+
+
+async def limit_signup(request: Request) -> None:
+    await hit("signup:ip", _client_ip(request), settings.RATE_LIMIT_SIGNUP_PER_IP)
+    # FastAPI has already read the body and checked it is JSON by now
+    body = await request.json()
+    if isinstance(body, dict) and isinstance(body.get("email"), str):
+        await hit(
+            "signup:email",
+            _email_key(body["email"]),
+            settings.RATE_LIMIT_SIGNUP_PER_EMAIL,
+        )
+
+
+async def limit_password_recovery(request: Request, email: str) -> None:
+    await hit(
+        "password-recovery:ip",
+        _client_ip(request),
+        settings.RATE_LIMIT_PASSWORD_RECOVERY_PER_IP,
+    )
+    await hit(
+        "password-recovery:email",
+        _email_key(email),
+        settings.RATE_LIMIT_PASSWORD_RECOVERY_PER_EMAIL,
+    )
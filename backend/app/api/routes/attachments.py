@@ -6,33 +6,36 @@ from typing import Any, Optional
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, UploadFile, File
-from sqlmodel import func, select
+from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep
+from app import crud
+from app.api.deps import CurrentUser, MembershipsDep, SessionDep
+from app.api.pagination import CountMode, paginate
 from app.models import (
     Attachment,
     AttachmentPublic,
     AttachmentsPublic,
     Message,
     Project,
-    ProjectMember,
     Task,
 )
 from app.core import s3
 
 router = APIRouter(prefix="/attachments", tags=["attachments"])
 
+# Created on the first local upload, not when the app is imported
 UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
 @router.get("/", response_model=AttachmentsPublic)
 def read_attachments(
     session: SessionDep,
     current_user: CurrentUser,
+    memberships: MembershipsDep,
     task_id: uuid.UUID,
     skip: int = 0,
     limit: int = 100,
+    include_count: CountMode = "exact",
 ) -> Any:
     """
     Retrieve attachments for a task.
@@ -43,19 +46,20 @@ def read_attachments(
 
     # Check permissions
     project = session.get(Project, task.project_id)
+    if not project or project.deleted_at:
+        raise HTTPException(status_code=404, detail="Task not found")
     if not current_user.is_superuser:
         if project.owner_id != current_user.id:
-            member = session.get(ProjectMember, (project.id, current_user.id))
+            member = memberships.project_role(project.id)
             if not member and project.is_private:
                 raise HTTPException(status_code=400, detail="Not enough permissions")
 
     statement = select(Attachment).where(Attachment.task_id == task_id).order_by(Attachment.created_at.desc())
-    count_statement = select(func.count()).select_from(statement.subquery())
-    count = session.exec(count_statement).one()
-    statement = statement.offset(skip).limit(limit)
-    attachments = session.exec(statement).all()
+    attachments, count, has_more = paginate(
+        session, statement, skip=skip, limit=limit, include_count=include_count
+    )
 
-    return AttachmentsPublic(data=attachments, count=count)
+    return AttachmentsPublic(data=attachments, count=count, has_more=has_more)
 
 
 @router.post("/", response_model=AttachmentPublic)
@@ -63,6 +67,7 @@ def create_attachment(
     *, 
     session: SessionDep, 
     current_user: CurrentUser, 
+    memberships: MembershipsDep,
     task_id: uuid.UUID,
     comment_id: Optional[uuid.UUID] = None,
     file: UploadFile = File(...)
@@ -76,9 +81,11 @@ def create_attachment(
 
     # Check permissions
     project = session.get(Project, task.project_id)
+    if not project or project.deleted_at:
+        raise HTTPException(status_code=404, detail="Task not found")
     if not current_user.is_superuser:
         if project.owner_id != current_user.id:
-           member = session.get(ProjectMember, (project.id, current_user.id))
+           member = memberships.project_role(project.id)
            if not member:
                raise HTTPException(status_code=400, detail="Not enough permissions")
 
@@ -100,6 +107,7 @@ def create_attachment(
         # Fallback to local
         file_path = UPLOAD_DIR / safe_filename
         try:
+            UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
             with file_path.open("wb") as buffer:
                 shutil.copyfileobj(file.file, buffer)
             file_path_str = str(file_path)
@@ -118,6 +126,7 @@ def create_attachment(
     )
 
     session.add(attachment)
+    crud.adjust_task_counters(session=session, task_id=task_id, attachments=1)
     session.commit()
     session.refresh(attachment)
     
@@ -152,13 +161,16 @@ def delete_attachment(
             except Exception:
                 pass # Warn?
 
+    crud.adjust_task_counters(
+        session=session, task_id=attachment.task_id, attachments=-1
+    )
     session.delete(attachment)
     session.commit()
     return Message(message="Attachment deleted successfully")
 
 @router.get("/{id}/url", response_model=Message)
 def get_attachment_url(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    session: SessionDep, current_user: CurrentUser, memberships: MembershipsDep, id: uuid.UUID
 ) -> Any:
     """
     Get a download/view URL for the attachment.
@@ -169,9 +181,11 @@ def get_attachment_url(
     
     # Check permissions (same as read)
     project = session.get(Project, attachment.task.project_id)
+    if not project or project.deleted_at:
+        raise HTTPException(status_code=404, detail="Attachment not found")
     if not current_user.is_superuser:
          if project.owner_id != current_user.id:
-            member = session.get(ProjectMember, (project.id, current_user.id))
+            member = memberships.project_role(project.id)
             if not member and project.is_private:
                 raise HTTPException(status_code=400, detail="Not enough permissions")
 
@@ -1,11 +1,15 @@
 
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlmodel import func, select
 
-from app.api.deps import CurrentUser, SessionDep
+from app import crud
+from app.api.deps import CurrentUser, MembershipsDep, SessionDep
+from app.api.fieldsets import fields_query, list_response, select_fields
+from app.api.pagination import CountMode, paginate
 from app.models import (
     Attachment,
     Comment,
@@ -15,21 +19,35 @@ from app.models import (
     CommentUpdate,
     Message,
     Project,
-    ProjectMember,
     Task,
     User,
 )
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
+COMMENT_LIST_COLUMNS: tuple[Any, ...] = (
+    Comment.content,
+    Comment.id,
+    Comment.task_id,
+    Comment.user_id,
+    Comment.created_at,
+    func.coalesce(User.full_name, User.email).label("user_full_name"),
+)
+CommentFields = Annotated[
+    list[str] | None, Depends(fields_query(COMMENT_LIST_COLUMNS))
+]
+
 
-@router.get("/", response_model=CommentsPublic)
+@router.get("/", response_model=CommentsPublic, response_class=ORJSONResponse)
 def read_comments(
     session: SessionDep,
     current_user: CurrentUser,
+    memberships: MembershipsDep,
     task_id: uuid.UUID,
+    fields: CommentFields,
     skip: int = 0,
     limit: int = 100,
+    include_count: CountMode = "exact",
 ) -> Any:
     """
     Retrieve comments for a task. Task ID is required.
@@ -40,30 +58,32 @@ def read_comments(
 
     # Check permissions (must be member of project)
     project = session.get(Project, task.project_id)
+    if not project or project.deleted_at:
+        raise HTTPException(status_code=404, detail="Task not found")
     if not current_user.is_superuser:
         if project.owner_id != current_user.id:
-            member = session.get(ProjectMember, (project.id, current_user.id))
+            member = memberships.project_role(project.id)
             if not member and project.is_private:
                 raise HTTPException(status_code=400, detail="Not enough permissions")
 
-    statement = select(Comment, User).join(User).where(Comment.task_id == task_id).order_by(Comment.created_at)
-    count_statement = select(func.count()).select_from(statement.subquery())
-    count = session.exec(count_statement).one()
-    statement = statement.offset(skip).limit(limit)
-    results = session.exec(statement).all()
-    
-    comments_public = []
-    for comment, user in results:
-        item = CommentPublic.model_validate(comment)
-        item.user_full_name = user.full_name or user.email
-        comments_public.append(item)
+    statement = (
+        select(*select_fields(COMMENT_LIST_COLUMNS, fields))
+        .join(User, Comment.user_id == User.id)
+        .where(Comment.task_id == task_id)
+        .order_by(Comment.created_at)
+    )
+    results, count, has_more = paginate(
+        session, statement, skip=skip, limit=limit, include_count=include_count
+    )
 
-    return CommentsPublic(data=comments_public, count=count)
+    return list_response(
+        CommentsPublic, results, fields, count=count, has_more=has_more
+    )
 
 
 @router.post("/", response_model=CommentPublic)
 def create_comment(
-    *, session: SessionDep, current_user: CurrentUser, comment_in: CommentCreate
+    *, session: SessionDep, current_user: CurrentUser, memberships: MembershipsDep, comment_in: CommentCreate
 ) -> Any:
     """
     Create a new comment.
@@ -74,14 +94,17 @@ def create_comment(
 
     # Check permissions
     project = session.get(Project, task.project_id)
+    if not project or project.deleted_at:
+        raise HTTPException(status_code=404, detail="Task not found")
     if not current_user.is_superuser:
         if project.owner_id != current_user.id:
-           member = session.get(ProjectMember, (project.id, current_user.id))
+           member = memberships.project_role(project.id)
            if not member:
                raise HTTPException(status_code=400, detail="Not enough permissions")
 
     comment = Comment.model_validate(comment_in, update={"user_id": current_user.id})
     session.add(comment)
+    crud.adjust_task_counters(session=session, task_id=task.id, comments=1)
     session.commit()
     session.refresh(comment)
     
@@ -109,12 +132,25 @@ def delete_comment(
     Delete a comment.
     """
     comment = session.get(Comment, id)
-    if not comment:
+    if not comment or comment.task.project.deleted_at:
         raise HTTPException(status_code=404, detail="Comment not found")
         
     if not current_user.is_superuser and comment.user_id != current_user.id:
          raise HTTPException(status_code=400, detail="Not enough permissions")
 
+    crud.create_tombstone(
+        session=session,
+        entity_type="comment",
+        entity_id=comment.id,
+        project_id=comment.task.project_id,
+    )
+    # Attachments on the comment are cascade-deleted with it
+    crud.adjust_task_counters(
+        session=session,
+        task_id=comment.task_id,
+        comments=-1,
+        attachments=-len(comment.attachments),
+    )
     session.delete(comment)
     session.commit()
     return Message(message="Comment deleted successfully")
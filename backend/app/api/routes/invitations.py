@@ -3,7 +3,10 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import col, delete, func, select
 
 from app import crud
@@ -11,14 +14,17 @@ from app.api import deps
 from app.core.config import settings
 from app.models import (
     Invitation,
+    InvitationBulkCreate,
     InvitationCreate,
     InvitationPublic,
+    InvitationsBulkPublic,
+    InvitationSkipped,
     Message,
     User,
     Workspace,
     WorkspaceMember,
 )
-from app.utils import generate_workspace_invitation_email, send_email
+from app.utils import generate_workspace_invitation_email, send_email, send_emails
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -28,6 +34,7 @@ def create_invitation(
     *,
     session: deps.SessionDep,
     current_user: deps.CurrentUser,
+    memberships: deps.MembershipsDep,
     invitation_in: InvitationCreate,
 ) -> Any:
     """
@@ -35,17 +42,11 @@ def create_invitation(
     """
     # Check if workspace exists
     workspace = session.get(Workspace, invitation_in.workspace_id)
-    if not workspace:
+    if not workspace or workspace.deleted_at:
         raise HTTPException(status_code=404, detail="Workspace not found")
 
     # Check permission (inviter must be a member of the workspace)
-    member = session.exec(
-        select(WorkspaceMember)
-        .where(WorkspaceMember.workspace_id == invitation_in.workspace_id)
-        .where(WorkspaceMember.user_id == current_user.id)
-    ).first()
-    
-    if not member:
+    if not memberships.workspace_role(invitation_in.workspace_id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
     # Check if user is already a member
@@ -89,7 +90,12 @@ def create_invitation(
         }
     )
     session.add(invitation)
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError:
+        # Another request created the pending invitation first
+        session.rollback()
+        raise HTTPException(status_code=400, detail="Invitation already sent")
     session.refresh(invitation)
 
     # Send email
@@ -111,6 +117,142 @@ def create_invitation(
     return invitation
 
 
+def send_invitation_emails(
+    *,
+    invitations: list[dict[str, Any]],
+    workspace_name: str,
+    inviter_name: str,
+    inviter_email: str,
+) -> None:
+    messages = [
+        (
+            invitation["email"],
+            generate_workspace_invitation_email(
+                email_to=invitation["email"],
+                workspace_name=workspace_name,
+                inviter_name=inviter_name,
+                inviter_email=inviter_email,
+                link=f"{settings.FRONTEND_HOST}/accept-invite?token={invitation['token']}",
+            ),
+        )
+        for invitation in invitations
+    ]
+    send_emails(messages=messages)
+
+
+@router.post("/bulk", response_model=InvitationsBulkPublic)
+def create_invitations_bulk(
+    *,
+    session: deps.SessionDep,
+    current_user: deps.CurrentUser,
+    memberships: deps.MembershipsDep,
+    invitations_in: InvitationBulkCreate,
+    background_tasks: BackgroundTasks,
+) -> Any:
+    """
+    Invite many emails to a workspace at once.
+
+    Emails that already belong to a member or have a pending invitation are
+    skipped. The invitation emails are sent after the response.
+    """
+    workspace = session.get(Workspace, invitations_in.workspace_id)
+    if not workspace or workspace.deleted_at:
+        raise HTTPException(status_code=404, detail="Workspace not found")
+
+    if not memberships.workspace_role(workspace.id):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    # Addresses are case-insensitive in practice; compare them lowercased
+    emails = list(
+        dict.fromkeys(email.strip().lower() for email in invitations_in.emails)
+    )
+    now = datetime.now(timezone.utc)
+
+    # Expired invitations don't block a new one, same as create_invitation
+    session.execute(
+        delete(Invitation)
+        .where(col(Invitation.workspace_id) == workspace.id)
+        .where(col(Invitation.status) == "pending")
+        .where(func.lower(Invitation.email).in_(emails))
+        .where(col(Invitation.expires_at) < now)
+    )
+    members = set(
+        session.exec(
+            select(func.lower(User.email))
+            .join(WorkspaceMember, col(WorkspaceMember.user_id) == col(User.id))
+            .where(WorkspaceMember.workspace_id == workspace.id)
+            .where(func.lower(User.email).in_(emails))
+        ).all()
+    )
+    invited = set(
+        session.exec(
+            select(func.lower(Invitation.email))
+            .where(Invitation.workspace_id == workspace.id)
+            .where(Invitation.status == "pending")
+            .where(func.lower(Invitation.email).in_(emails))
+        ).all()
+    )
+
+    skipped = [
+        InvitationSkipped(
+            email=email,
+            reason="already_member" if email in members else "already_invited",
+        )
+        for email in emails
+        if email in members or email in invited
+    ]
+    expires_at = now + timedelta(days=7)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "email": email,
+            "role": invitations_in.role,
+            "status": "pending",
+            "token": str(uuid.uuid4()),
+            "expires_at": expires_at,
+            "created_at": datetime.utcnow(),
+            "workspace_id": workspace.id,
+            "inviter_id": current_user.id,
+        }
+        for email in emails
+        if email not in members and email not in invited
+    ]
+    if rows:
+        # A concurrent request may have invited some of the same addresses;
+        # the partial unique index on pending (workspace_id, email) decides
+        inserted = set(
+            session.execute(
+                insert(Invitation)
+                .values(rows)
+                .on_conflict_do_nothing(
+                    index_elements=["workspace_id", "email"],
+                    index_where=text("status = 'pending'"),
+                )
+                .returning(col(Invitation.id))
+            ).scalars()
+        )
+        skipped += [
+            InvitationSkipped(email=row["email"], reason="already_invited")
+            for row in rows
+            if row["id"] not in inserted
+        ]
+        rows = [row for row in rows if row["id"] in inserted]
+    session.commit()
+
+    if rows and settings.emails_enabled:
+        background_tasks.add_task(
+            send_invitation_emails,
+            invitations=rows,
+            workspace_name=workspace.name,
+            inviter_name=current_user.full_name or current_user.email,
+            inviter_email=current_user.email,
+        )
+
+    return InvitationsBulkPublic(
+        data=[InvitationPublic.model_validate(row) for row in rows], skipped=skipped
+    )
+
+
 @router.get("/{token}", response_model=InvitationPublic)
 def get_invitation(
     *,
@@ -146,6 +288,10 @@ def accept_invitation(
     invitation = session.exec(select(Invitation).where(Invitation.token == token)).first()
     if not invitation:
         raise HTTPException(status_code=404, detail="Invitation not found")
+
+    workspace = session.get(Workspace, invitation.workspace_id)
+    if not workspace or workspace.deleted_at:
+        raise HTTPException(status_code=404, detail="Workspace not found")
     
     if invitation.expires_at.replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
         raise HTTPException(status_code=400, detail="Invitation expired")
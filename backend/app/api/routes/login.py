@@ -1,16 +1,33 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlmodel import Session
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.api import deps
+from app.api.deps import (
+    CurrentUser,
+    SessionDep,
+    TokenDataDep,
+    get_current_active_superuser,
+)
+from app.api.rate_limit import limit_login, limit_password_recovery
 from app.core import security
 from app.core.config import settings
 from app.core.security import get_password_hash
-from app.models import Message, NewPassword, Token, UserPublic, VerifyEmail
+from app.core.token_denylist import claim_refresh_token, denylist
+from app.models import (
+    Message,
+    NewPassword,
+    RefreshToken,
+    Token,
+    User,
+    UserPublic,
+    VerifyEmail,
+)
 from app.utils import (
     generate_password_reset_token,
     generate_reset_password_email,
@@ -22,7 +39,7 @@ from app.utils import (
 router = APIRouter(tags=["login"])
 
 
-@router.post("/login/access-token")
+@router.post("/login/access-token", dependencies=[Depends(limit_login)])
 def login_access_token(
     session: SessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ) -> Token:
@@ -36,14 +53,77 @@ def login_access_token(
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    return _issue_tokens(session, user)
+
+
+def _issue_tokens(session: Session, user: User) -> Token:
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    refresh_token_expires = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+    claims = (
+        crud.membership_claims(session=session, user=user)
+        if settings.TOKEN_MEMBERSHIP_CLAIMS
+        else None
+    )
     return Token(
         access_token=security.create_access_token(
-            user.id, expires_delta=access_token_expires
-        )
+            user.id, expires_delta=access_token_expires, claims=claims
+        ),
+        refresh_token=security.create_refresh_token(
+            user.id, expires_delta=refresh_token_expires
+        ),
     )
 
 
+@router.post("/login/refresh-token")
+def refresh_token(session: SessionDep, body: RefreshToken) -> Token:
+    """
+    Exchange a refresh token for a new access token and refresh token
+    """
+    token_data = deps.decode_token(body.refresh_token, "refresh")
+    user = deps.get_token_user(session, token_data)
+    # Refresh tokens are single use
+    if (
+        token_data.jti
+        and token_data.exp
+        and not claim_refresh_token(token_data.jti, token_data.exp)
+    ):
+        raise HTTPException(status_code=403, detail="Could not validate credentials")
+    return _issue_tokens(session, user)
+
+
+@router.post("/login/logout")
+def logout(
+    current_user: CurrentUser,
+    token_data: TokenDataDep,
+    body: RefreshToken | None = None,
+) -> Message:
+    """
+    Revoke the access token used for this request and, if given, the refresh
+    token issued with it
+    """
+    revoked = [token_data]
+    if body:
+        refresh = deps.decode_token(body.refresh_token, "refresh")
+        if refresh.sub != str(current_user.id):
+            raise HTTPException(status_code=400, detail="Invalid refresh token")
+        revoked.append(refresh)
+    for token_data in revoked:
+        if token_data.jti and token_data.exp:
+            denylist.revoke(token_data.jti, token_data.exp)
+    return Message(message="Logged out")
+
+
+@router.post("/login/logout-all")
+def logout_all(session: SessionDep, current_user: CurrentUser) -> Message:
+    """
+    Revoke every access and refresh token issued to the current user so far
+    """
+    current_user.tokens_valid_after = datetime.utcnow()
+    session.add(current_user)
+    session.commit()
+    return Message(message="Logged out everywhere")
+
+
 @router.post("/login/test-token", response_model=UserPublic)
 def test_token(current_user: CurrentUser) -> Any:
     """
@@ -68,14 +148,16 @@ def verify_email(session: SessionDep, body: VerifyEmail) -> Message:
         )
     if user.is_active:
         return Message(message="Email already verified")
-    
+
     user.is_active = True
     session.add(user)
     session.commit()
     return Message(message="Email verified successfully")
 
 
-@router.post("/password-recovery/{email}")
+@router.post(
+    "/password-recovery/{email}", dependencies=[Depends(limit_password_recovery)]
+)
 def recover_password(email: str, session: SessionDep) -> Message:
     """
     Password Recovery
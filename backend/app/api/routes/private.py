@@ -4,6 +4,7 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 
 from app.api.deps import SessionDep
+from app.core import slow_queries, tracing
 from app.core.security import get_password_hash
 from app.models import (
     User,
@@ -36,3 +37,32 @@ def create_user(user_in: PrivateUserCreate, session: SessionDep) -> Any:
     session.commit()
 
     return user
+
+
+@router.get("/traces/")
+def read_traces(limit: int = 50) -> Any:
+    """
+    Recent spans from the in-memory exporter (OTEL_EXPORTER=memory).
+    """
+    if tracing.memory_exporter is None:
+        return []
+    spans = tracing.memory_exporter.get_finished_spans()[-limit:]
+    return [
+        {
+            "name": span.name,
+            "trace_id": f"{span.context.trace_id:032x}",
+            "span_id": f"{span.context.span_id:016x}",
+            "parent_id": f"{span.parent.span_id:016x}" if span.parent else None,
+            "duration_ms": (span.end_time - span.start_time) / 1e6,
+            "attributes": dict(span.attributes or {}),
+        }
+        for span in spans
+    ]
+
+
+@router.get("/slow-queries/")
+def read_slow_queries(limit: int = 50) -> Any:
+    """
+    Recent slow statements with their captured plans, newest first.
+    """
+    return list(reversed(slow_queries.recent_slow_queries))[:limit]
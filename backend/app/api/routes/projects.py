@@ -1,19 +1,26 @@
 
 import uuid
 import json
-from typing import Any, Optional
+from typing import Annotated, Any, Optional
 
+from app.core.metrics import PROJECTS_CACHE_REQUESTS, REDIS_COMMAND_DURATION
 from app.core.redis_client import redis_client_sync
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select, SQLModel
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from sqlmodel import col, func, select, SQLModel
 
-from app.api.deps import CurrentUser, SessionDep
+from app import crud
+from app.api.deletion import purge, read_deletion_job
+from app.api.deps import CurrentUser, MembershipsDep, SessionDep
+from app.api.fieldsets import dump_rows, fields_query, list_response, select_fields
 from app.models import (
+    DeletionJobPublic,
     Message,
     Project,
     ProjectCreate,
     ProjectMember,
+    ProjectMembersPublic,
     ProjectPublic,
     ProjectPublicWithWorkspace,
     ProjectsPublic,
@@ -25,11 +32,33 @@ from app.models import (
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+# Only the columns ProjectPublicWithWorkspace needs, fetched as plain rows
+PROJECT_LIST_COLUMNS = (
+    *(getattr(Project, name) for name in ProjectPublic.model_fields),
+    Workspace.name.label("workspace_name"),
+)
+ProjectFields = Annotated[
+    list[str] | None, Depends(fields_query(PROJECT_LIST_COLUMNS))
+]
+PROJECT_MEMBER_COLUMNS = (
+    User.id,
+    User.full_name,
+    User.email,
+    User.avatar_url,
+    ProjectMember.role,
+    ProjectMember.project_id,
+)
+ProjectMemberFields = Annotated[
+    list[str] | None, Depends(fields_query(PROJECT_MEMBER_COLUMNS))
+]
+
 
 @router.get("/", response_model=ProjectsPublic)
 def read_projects(
     session: SessionDep, 
     current_user: CurrentUser, 
+    memberships: MembershipsDep,
+    fields: ProjectFields,
     workspace_id: Optional[uuid.UUID] = None,
     skip: int = 0, 
     limit: int = 100
@@ -40,16 +69,31 @@ def read_projects(
     # Redis Caching
     try:
         cache_key = f"projects:{current_user.id}:{workspace_id or 'all'}:{skip}:{limit}"
-        cached_data = redis_client_sync.get(cache_key)
+        if fields:
+            cache_key += f":{','.join(fields)}"
+        with REDIS_COMMAND_DURATION.labels("get").time():
+            cached_data = redis_client_sync.get(cache_key)
         if cached_data:
+            PROJECTS_CACHE_REQUESTS.labels("hit").inc()
+            if fields:
+                return Response(cached_data, media_type="application/json")
             data = json.loads(cached_data)
             return ProjectsPublic(**data)
+        PROJECTS_CACHE_REQUESTS.labels("miss").inc()
     except Exception:
         # Fallback if redis fails
-        pass
+        PROJECTS_CACHE_REQUESTS.labels("error").inc()
 
+    # The visibility check below reads these whatever the client asked for
+    columns = select_fields(
+        PROJECT_LIST_COLUMNS, fields, required=["id", "owner_id", "is_private"]
+    )
     if current_user.is_superuser:
-        statement = select(Project)
+        statement = (
+            select(*columns)
+            .join(Workspace, Project.workspace_id == Workspace.id)
+            .where(col(Project.deleted_at).is_(None))
+        )
         if workspace_id:
             statement = statement.where(Project.workspace_id == workspace_id)
         count_statement = select(func.count()).select_from(statement.subquery())
@@ -74,7 +118,7 @@ def read_projects(
         
         if workspace_id:
              # Check workspace membership
-            member = session.get(WorkspaceMember, (workspace_id, current_user.id))
+            member = memberships.workspace_role(workspace_id)
             if not member and not current_user.is_superuser:
                  raise HTTPException(status_code=400, detail="Not a member of this workspace")
             
@@ -83,18 +127,28 @@ def read_projects(
             # But wait, we need to know if user is project member.
             
             # Just fetching all for now and filtering in python (inefficient but safe for MVP start)
-            statement = select(Project).where(Project.workspace_id == workspace_id)
+            statement = (
+                select(*columns)
+                .join(Workspace, Project.workspace_id == Workspace.id)
+                .where(Project.workspace_id == workspace_id)
+                .where(col(Project.deleted_at).is_(None))
+            )
             all_projects = session.exec(statement).all()
+            member_of = set(
+                session.exec(
+                    select(ProjectMember.project_id)
+                    .join(Project, Project.id == ProjectMember.project_id)
+                    .where(Project.workspace_id == workspace_id)
+                    .where(ProjectMember.user_id == current_user.id)
+                ).all()
+            )
             
             visible_projects = []
             for p in all_projects:
                 if not p.is_private:
                     visible_projects.append(p)
-                else:
-                    # Check membership
-                    pm = session.get(ProjectMember, (p.id, current_user.id))
-                    if pm or p.owner_id == current_user.id:
-                        visible_projects.append(p)
+                elif p.id in member_of or p.owner_id == current_user.id:
+                    visible_projects.append(p)
             
             projects = visible_projects[skip : skip + limit]
             count = len(visible_projects)
@@ -103,32 +157,36 @@ def read_projects(
              # Global list (e.g. "My Projects")
              # Return all projects where user is owner or member
              statement = (
-                 select(Project)
+                 select(*columns)
+                 .join(Workspace, Project.workspace_id == Workspace.id)
                  .join(ProjectMember, Project.id == ProjectMember.project_id, isouter=True)
                  .where(
                      (Project.owner_id == current_user.id) | 
                      (ProjectMember.user_id == current_user.id)
                  )
+                 .where(col(Project.deleted_at).is_(None))
                  .distinct()
                  .offset(skip).limit(limit)
              )
              projects = session.exec(statement).all()
              count = len(projects)
 
-    # Populate workspace_name
-    final_projects = []
-    for p in projects:
-        ws = session.get(Workspace, p.workspace_id)
-        ws_name = ws.name if ws else "Unknown"
-        p_dict = p.model_dump()
-        p_dict["workspace_name"] = ws_name
-        final_projects.append(ProjectPublicWithWorkspace(**p_dict))
+    result: Any
+    if fields:
+        # Partial rows cannot be validated as ProjectPublicWithWorkspace
+        result = ORJSONResponse({"data": dump_rows(projects, fields), "count": count})
+        cached = result.body
+    else:
+        result = ProjectsPublic(
+            data=[ProjectPublicWithWorkspace(**p._asdict()) for p in projects],
+            count=count,
+        )
+        cached = result.model_dump_json()
 
-    result = ProjectsPublic(data=final_projects, count=count)
-    
     # Cache result
     try:
-        redis_client_sync.setex(cache_key, 30, result.model_dump_json())
+        with REDIS_COMMAND_DURATION.labels("setex").time():
+            redis_client_sync.setex(cache_key, 30, cached)
     except Exception:
         pass
         
@@ -136,12 +194,12 @@ def read_projects(
 
 
 @router.get("/{id}", response_model=ProjectPublic)
-def read_project(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_project(session: SessionDep, current_user: CurrentUser, memberships: MembershipsDep, id: uuid.UUID) -> Any:
     """
     Get project by ID.
     """
     project = session.get(Project, id)
-    if not project:
+    if not project or project.deleted_at:
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Permission check
@@ -151,13 +209,13 @@ def read_project(session: SessionDep, current_user: CurrentUser, id: uuid.UUID)
             pass
         else:
             # Check if project member
-            pm = session.get(ProjectMember, (id, current_user.id))
+            pm = memberships.project_role(id)
             if pm:
                 pass
             else:
                 # Check if public and workspace member
                 if not project.is_private:
-                    wm = session.get(WorkspaceMember, (project.workspace_id, current_user.id))
+                    wm = memberships.workspace_role(project.workspace_id)
                     if wm:
                          pass
                     else:
@@ -170,18 +228,18 @@ def read_project(session: SessionDep, current_user: CurrentUser, id: uuid.UUID)
 
 @router.post("/", response_model=ProjectPublic)
 def create_project(
-    *, session: SessionDep, current_user: CurrentUser, project_in: ProjectCreate
+    *, session: SessionDep, current_user: CurrentUser, memberships: MembershipsDep, project_in: ProjectCreate
 ) -> Any:
     """
     Create new project.
     """
     # Verify workspace membership
     workspace = session.get(Workspace, project_in.workspace_id)
-    if not workspace:
+    if not workspace or workspace.deleted_at:
         raise HTTPException(status_code=404, detail="Workspace not found")
         
     if not current_user.is_superuser:
-        member = session.get(WorkspaceMember, (project_in.workspace_id, current_user.id))
+        member = memberships.workspace_role(project_in.workspace_id)
         if not member:
              raise HTTPException(status_code=400, detail="Not a member of this workspace")
 
@@ -210,7 +268,7 @@ def update_project(
     Update a project.
     """
     project = session.get(Project, id)
-    if not project:
+    if not project or project.deleted_at:
         raise HTTPException(status_code=404, detail="Project not found")
     
     if not current_user.is_superuser:
@@ -239,7 +297,7 @@ def add_project_member(
     Add a member to a project.
     """
     project = session.get(Project, id)
-    if not project:
+    if not project or project.deleted_at:
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Permission check: Only project owner (or admins?) can add members
@@ -268,15 +326,20 @@ def add_project_member(
     return Message(message="Member added successfully")
 
 
-@router.get("/{id}/members", response_model=Any) # Using Any/custom helper response for MVP
+@router.get("/{id}/members", response_model=ProjectMembersPublic)
 def read_project_members(
-    *, session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    memberships: MembershipsDep,
+    id: uuid.UUID,
+    fields: ProjectMemberFields,
 ) -> Any:
     """
     Get project members.
     """
     project = session.get(Project, id)
-    if not project:
+    if not project or project.deleted_at:
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Permission check
@@ -284,46 +347,62 @@ def read_project_members(
          # Members can see other members? Yes.
          # Public project? Yes.
          if project.owner_id != current_user.id:
-             pm = session.get(ProjectMember, (id, current_user.id))
+             pm = memberships.project_role(id)
              if not pm and project.is_private:
                   raise HTTPException(status_code=400, detail="Not enough permissions")
 
     statement = (
-        select(ProjectMember, User)
-        .join(User, ProjectMember.user_id == User.id)
+        select(*select_fields(PROJECT_MEMBER_COLUMNS, fields))
+        .join(ProjectMember, ProjectMember.user_id == User.id)
         .where(ProjectMember.project_id == id)
     )
     results = session.exec(statement).all()
-    
-    # Format response
-    members = []
-    for pm, user in results:
-        members.append({
-            "id": user.id,
-            "full_name": user.full_name,
-            "email": user.email,
-            "avatar_url": user.avatar_url,
-            "role": pm.role,
-            "project_id": pm.project_id
-        })
-    
-    return {"data": members, "count": len(members)}
+
+    return list_response(ProjectMembersPublic, results, fields, count=len(results))
 
 @router.delete("/{id}", response_model=Message)
 def delete_project(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    session: SessionDep,
+    current_user: CurrentUser,
+    id: uuid.UUID,
+    background_tasks: BackgroundTasks,
 ) -> Any:
     """
     Delete a project.
+
+    The project disappears immediately; its sections, tasks and their
+    comments and attachments are removed in the background.
     """
     project = session.get(Project, id)
-    if not project:
+    if not project or project.deleted_at:
         raise HTTPException(status_code=404, detail="Project not found")
     
     if not current_user.is_superuser:
          if project.owner_id != current_user.id:
             raise HTTPException(status_code=400, detail="Not enough permissions")
 
-    session.delete(project)
+    # Children go with the project; a single project tombstone tells sync
+    # clients to drop everything under it.
+    crud.create_tombstone(
+        session=session,
+        entity_type="project",
+        entity_id=project.id,
+        project_id=project.id,
+        workspace_id=project.workspace_id,
+    )
+    job = crud.create_deletion_job(
+        session=session, entity=project, requested_by_id=current_user.id
+    )
     session.commit()
+    background_tasks.add_task(purge, job.id)
     return Message(message="Project deleted successfully")
+
+
+@router.get("/{id}/deletion", response_model=DeletionJobPublic)
+def read_project_deletion(
+    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+) -> Any:
+    """
+    Get the progress of a project deletion.
+    """
+    return read_deletion_job(session, current_user, id)
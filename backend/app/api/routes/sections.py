@@ -1,15 +1,18 @@
 
 import uuid
-from typing import Any, Optional
+from typing import Annotated, Any, Optional
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep
+from app import crud
+from app.api.deps import CurrentUser, MembershipsDep, SessionDep
+from app.api.fieldsets import dump_rows, fields_query, select_fields
+from app.api.pagination import CountMode, paginate
 from app.models import (
     Message,
     Project,
-    ProjectMember,
     Section,
     SectionCreate,
     SectionPublic,
@@ -19,54 +22,70 @@ from app.models import (
 
 router = APIRouter(prefix="/sections", tags=["sections"])
 
+SECTION_LIST_COLUMNS = tuple(getattr(Section, name) for name in SectionPublic.model_fields)
+SectionFields = Annotated[
+    list[str] | None, Depends(fields_query(SECTION_LIST_COLUMNS))
+]
+
 
 @router.get("/", response_model=SectionsPublic)
 def read_sections(
     session: SessionDep, 
     current_user: CurrentUser, 
+    memberships: MembershipsDep,
     project_id: uuid.UUID,
+    fields: SectionFields,
     skip: int = 0, 
-    limit: int = 100
+    limit: int = 100,
+    include_count: CountMode = "exact",
 ) -> Any:
     """
     Retrieve sections for a project. Project ID is required.
     """
     # Check project existence and permissions
     project = session.get(Project, project_id)
-    if not project:
+    if not project or project.deleted_at:
         raise HTTPException(status_code=404, detail="Project not found")
         
     if not current_user.is_superuser:
         if project.owner_id != current_user.id:
-             member = session.get(ProjectMember, (project_id, current_user.id))
+             member = memberships.project_role(project_id)
              # If project is private and user is not member -> 400/404
              if not member and project.is_private:
                   raise HTTPException(status_code=400, detail="Not a member of this project")
              # If public, minimal access allowed? For now sections are part of project structure, so likely read access is fine for public projects.
 
-    statement = select(Section).where(Section.project_id == project_id).order_by(Section.order)
-    count_statement = select(func.count()).select_from(statement.subquery())
-    count = session.exec(count_statement).one()
-    statement = statement.offset(skip).limit(limit)
-    sections = session.exec(statement).all()
+    if fields:
+        # Partial rows cannot be validated as SectionPublic
+        statement = select(*select_fields(SECTION_LIST_COLUMNS, fields))
+    else:
+        statement = select(Section)
+    statement = statement.where(Section.project_id == project_id).order_by(Section.order)
+    sections, count, has_more = paginate(
+        session, statement, skip=skip, limit=limit, include_count=include_count
+    )
 
-    return SectionsPublic(data=sections, count=count)
+    if fields:
+        return ORJSONResponse(
+            {"data": dump_rows(sections, fields), "count": count, "has_more": has_more}
+        )
+    return SectionsPublic(data=sections, count=count, has_more=has_more)
 
 
 @router.post("/", response_model=SectionPublic)
 def create_section(
-    *, session: SessionDep, current_user: CurrentUser, section_in: SectionCreate
+    *, session: SessionDep, current_user: CurrentUser, memberships: MembershipsDep, section_in: SectionCreate
 ) -> Any:
     """
     Create new section.
     """
     project = session.get(Project, section_in.project_id)
-    if not project:
+    if not project or project.deleted_at:
         raise HTTPException(status_code=404, detail="Project not found")
         
     if not current_user.is_superuser:
         if project.owner_id != current_user.id:
-            member = session.get(ProjectMember, (project.id, current_user.id))
+            member = memberships.project_role(project.id)
             if not member:
                  raise HTTPException(status_code=400, detail="Not a member of this project")
             # Maybe restrict section creation to Editor/Admin role? For now all members.
@@ -83,6 +102,7 @@ def update_section(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    memberships: MembershipsDep,
     id: uuid.UUID,
     section_in: SectionUpdate,
 ) -> Any:
@@ -90,13 +110,13 @@ def update_section(
     Update a section.
     """
     section = session.get(Section, id)
-    if not section:
+    project = session.get(Project, section.project_id) if section else None
+    if not section or not project or project.deleted_at:
         raise HTTPException(status_code=404, detail="Section not found")
     
     if not current_user.is_superuser:
-         project = session.get(Project, section.project_id)
          if project.owner_id != current_user.id:
-             member = session.get(ProjectMember, (project.id, current_user.id))
+             member = memberships.project_role(project.id)
              if not member:
                   raise HTTPException(status_code=400, detail="Not enough permissions")
 
@@ -116,15 +136,21 @@ def delete_section(
     Delete a section.
     """
     section = session.get(Section, id)
-    if not section:
+    project = session.get(Project, section.project_id) if section else None
+    if not section or not project or project.deleted_at:
         raise HTTPException(status_code=404, detail="Section not found")
     
     if not current_user.is_superuser:
-         project = session.get(Project, section.project_id)
          if project.owner_id != current_user.id:
               # Only Project Owner can delete sections? Or maybe Admin role?
               raise HTTPException(status_code=400, detail="Not enough permissions")
 
+    crud.create_tombstone(
+        session=session,
+        entity_type="section",
+        entity_id=section.id,
+        project_id=section.project_id,
+    )
     session.delete(section)
     session.commit()
     return Message(message="Section deleted successfully")
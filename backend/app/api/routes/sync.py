@@ -0,0 +1,202 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+from sqlalchemy import bindparam, true, tuple_, union
+from sqlmodel import Session, and_, col, or_, select
+
+from app.api.deps import CurrentUser, SessionDep
+from app.models import (
+    Comment,
+    CommentPublic,
+    Project,
+    ProjectMember,
+    Section,
+    SyncPublic,
+    Task,
+    Tombstone,
+    User,
+    WorkspaceMember,
+)
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+# Rows committed by a transaction that started before the previous sync can
+# carry an updated_at slightly older than that sync's token. Re-read a short
+# window so they are not lost; clients upsert by id, so duplicates are harmless.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Each kind of row is paged on its own (timestamp, id) key
+STREAMS: dict[str, tuple[Any, Any]] = {
+    "tasks": (col(Task.updated_at), col(Task.id)),
+    "sections": (col(Section.updated_at), col(Section.id)),
+    "comments": (col(Comment.updated_at), col(Comment.id)),
+    "deleted": (col(Tombstone.deleted_at), col(Tombstone.id)),
+}
+
+
+def _encode_token(token: dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+
+
+def _decode_token(token: str) -> dict[str, Any]:
+    """
+    {"since": iso} once the client is caught up. While paging through one
+    round, also {"until": iso, "after": {stream: [iso, id]}} for the streams
+    with rows left; the others are done for this round.
+    """
+    try:
+        decoded = base64.urlsafe_b64decode(token.encode()).decode()
+        if not decoded.startswith("{"):
+            # Tokens issued before paging held just the timestamp
+            datetime.fromisoformat(decoded)
+            return {"since": decoded}
+        data: dict[str, Any] = json.loads(decoded)
+        for value in (data.get("since"), data.get("until")):
+            if value is not None:
+                datetime.fromisoformat(value)
+        for ts, id in data.get("after", {}).values():
+            datetime.fromisoformat(ts)
+            uuid.UUID(id)
+        return data
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+def _page(
+    session: Session,
+    statement: Any,
+    stream: str,
+    since_ts: datetime,
+    until_ts: datetime,
+    after: list[str] | None,
+    limit: int,
+) -> tuple[list[Any], list[str] | None]:
+    """
+    Up to `limit` rows of `stream` changed after since_ts and no later than
+    until_ts, continuing after the `after` key. Returns the rows and the key
+    to continue from, if any.
+    """
+    ts_col, id_col = STREAMS[stream]
+    statement = statement.where(ts_col > since_ts, ts_col <= until_ts).order_by(
+        ts_col, id_col
+    )
+    if after:
+        values = (datetime.fromisoformat(after[0]), uuid.UUID(after[1]))
+        statement = statement.where(
+            tuple_(ts_col, id_col)
+            > tuple_(
+                bindparam(None, values[0], type_=ts_col.type),
+                bindparam(None, values[1], type_=id_col.type),
+            )
+        )
+    rows = list(session.exec(statement.limit(limit + 1)).all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1][0] if stream == "comments" else rows[-1]
+    key = getattr(last, ts_col.key), getattr(last, id_col.key)
+    return rows, [key[0].isoformat(), str(key[1])]
+
+
+@router.get("/", response_model=SyncPublic)
+def sync(
+    session: SessionDep,
+    current_user: CurrentUser,
+    since: str | None = None,
+    limit: int = 500,
+) -> Any:
+    """
+    Return tasks, sections and comments created or changed after the `since`
+    token, plus the ids of rows deleted since then, across every project the
+    user can see. Without a token everything visible is returned.
+
+    At most `limit` rows of each kind are returned. Pass the returned
+    `next_token` as `since` on the next call; while `has_more` is true, call
+    again right away to get the rest.
+    """
+    token = _decode_token(since) if since else {"since": None}
+    # Where this round ends: rows changed later wait for the next round, so
+    # pages of one round cannot shift under the client
+    until = token.get("until") or datetime.utcnow().isoformat()
+    until_ts = datetime.fromisoformat(until)
+    since_ts = (
+        datetime.fromisoformat(token["since"]) - SYNC_OVERLAP
+        if token.get("since")
+        else datetime.min
+    )
+    # First page of a round: every stream, from the start
+    after: dict[str, Any] = token.get("after", dict.fromkeys(STREAMS))
+
+    live_projects = select(Project.id).where(col(Project.deleted_at).is_(None))
+    if current_user.is_superuser:
+        task_visible: Any = col(Task.project_id).in_(live_projects)
+        section_visible: Any = col(Section.project_id).in_(live_projects)
+        tombstone_visible: Any = true()
+    else:
+        member_projects = union(
+            select(Project.id).where(Project.owner_id == current_user.id),
+            select(ProjectMember.project_id).where(
+                ProjectMember.user_id == current_user.id
+            ),
+        ).subquery()
+        visible_projects = live_projects.where(
+            col(Project.id).in_(select(member_projects))
+        )
+        user_workspaces = select(WorkspaceMember.workspace_id).where(
+            WorkspaceMember.user_id == current_user.id
+        )
+        task_visible = col(Task.project_id).in_(visible_projects)
+        section_visible = col(Section.project_id).in_(visible_projects)
+        tombstone_visible = or_(
+            # Includes deleted projects, whose tombstones clients still need
+            col(Tombstone.project_id).in_(select(member_projects)),
+            # Membership rows of a purged project are gone with it
+            and_(
+                Tombstone.entity_type == "project",
+                col(Tombstone.workspace_id).in_(user_workspaces),
+            ),
+        )
+
+    statements = {
+        "tasks": select(Task).where(task_visible),
+        "sections": select(Section).where(section_visible),
+        "comments": select(Comment, User)
+        .join(Task, Comment.task_id == Task.id)
+        .join(User, Comment.user_id == User.id)
+        .where(task_visible),
+        "deleted": select(Tombstone).where(tombstone_visible),
+    }
+    results: dict[str, list[Any]] = dict.fromkeys(STREAMS, [])
+    remaining: dict[str, list[str]] = {}
+    for stream, statement in statements.items():
+        if stream not in after:
+            continue
+        results[stream], next_key = _page(
+            session, statement, stream, since_ts, until_ts, after[stream], limit
+        )
+        if next_key:
+            remaining[stream] = next_key
+
+    comments = []
+    for comment, user in results["comments"]:
+        item = CommentPublic.model_validate(comment)
+        item.user_full_name = user.full_name or user.email
+        comments.append(item)
+
+    if remaining:
+        next_token = {"since": token.get("since"), "until": until, "after": remaining}
+    else:
+        next_token = {"since": until}
+    return SyncPublic(
+        tasks=results["tasks"],
+        sections=results["sections"],
+        comments=comments,
+        deleted=results["deleted"],
+        next_token=_encode_token(next_token),
+        has_more=bool(remaining),
+    )
@@ -1,11 +1,16 @@
 
 import uuid
-from typing import Any, Optional
+from datetime import date
+from typing import Annotated, Any, Optional
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlmodel import Session, col, select
 
-from app.api.deps import CurrentUser, SessionDep
+from app import crud
+from app.api.deps import CurrentUser, MembershipsDep, SessionDep
+from app.api.fieldsets import fields_query, list_response, select_fields
+from app.api.pagination import CountMode, paginate
 from app.models import (
     Message,
     Project,
@@ -15,7 +20,6 @@ from app.models import (
 
     TaskPublic,
     TasksPublicWithProject,
-    TaskPublicWithProject,
     TaskUpdate,
     User,
     Workspace,
@@ -24,37 +28,75 @@ from app.utils import generate_task_assignment_email, send_email
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# Only the columns TaskPublicWithProject needs, fetched as plain rows
+TASK_LIST_COLUMNS = (
+    *(getattr(Task, name) for name in TaskPublic.model_fields),
+    Project.name.label("project_name"),
+    Project.color.label("project_color"),
+)
+TaskFields = Annotated[list[str] | None, Depends(fields_query(TASK_LIST_COLUMNS))]
+
+
+def _filter_due_date(statement: Any, due_after: date | None, due_before: date | None) -> Any:
+    # Both bounds hit ix_task_assignee_id_due_date / ix_task_project_id_due_date
+    if due_after:
+        statement = statement.where(Task.due_date >= due_after)
+    if due_before:
+        statement = statement.where(Task.due_date < due_before)
+    if due_after or due_before:
+        statement = statement.order_by(Task.due_date)
+    return statement
 
-@router.get("/", response_model=TasksPublicWithProject)
+
+def _get_task(session: Session, id: uuid.UUID) -> tuple[Task, Project]:
+    # Tasks of a soft-deleted project are gone as far as clients can tell,
+    # even before the purge removes them
+    task = session.get(Task, id)
+    project = session.get(Project, task.project_id) if task else None
+    if not task or not project or project.deleted_at:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task, project
+
+
+@router.get(
+    "/", response_model=TasksPublicWithProject, response_class=ORJSONResponse
+)
 def read_tasks(
     session: SessionDep, 
     current_user: CurrentUser, 
+    memberships: MembershipsDep,
+    fields: TaskFields,
     project_id: Optional[uuid.UUID] = None,
     assignee_id: Optional[uuid.UUID] = None,
+    due_after: Optional[date] = None,
+    due_before: Optional[date] = None,
     skip: int = 0, 
-    limit: int = 100
+    limit: int = 100,
+    include_count: CountMode = "exact",
 ) -> Any:
     """
-    Retrieve tasks. Option filters by project_id.
+    Retrieve tasks. Option filters by project_id, assignee_id and due date range.
+
+    The due date range is half-open: due_after <= due_date < due_before.
+    Pass fields (e.g. id,title,status,assignee_id) to get only those keys.
     """
+    # DISTINCT needs the ORDER BY column in the select list
+    columns = select_fields(
+        TASK_LIST_COLUMNS,
+        fields,
+        required=["due_date"] if due_after or due_before else [],
+    )
     if current_user.is_superuser:
-        statement = select(Task, Project).join(Project, Task.project_id == Project.id)
+        statement = (
+            select(*columns)
+            .join(Project, Task.project_id == Project.id)
+            .where(col(Project.deleted_at).is_(None))
+        )
         if project_id:
             statement = statement.where(Task.project_id == project_id)
         if assignee_id:
             statement = statement.where(Task.assignee_id == assignee_id)
-            
-        count_statement = select(func.count()).select_from(statement.subquery())
-        count = session.exec(count_statement).one()
-        statement = statement.offset(skip).limit(limit)
-        results = session.exec(statement).all()
-        
-        tasks_data = []
-        for task, project in results:
-            task_dict = task.model_dump()
-            task_dict["project_name"] = project.name
-            task_dict["project_color"] = project.color
-            tasks_data.append(TaskPublicWithProject(**task_dict))
+        statement = _filter_due_date(statement, due_after, due_before)
 
     else:
         # Access Control:
@@ -64,71 +106,60 @@ def read_tasks(
         if project_id:
              # Check project membership
             project = session.get(Project, project_id)
-            if not project:
+            if not project or project.deleted_at:
                   raise HTTPException(status_code=404, detail="Project not found")
             
             if project.owner_id != current_user.id:
-                 member = session.get(ProjectMember, (project_id, current_user.id))
+                 member = memberships.project_role(project_id)
                  if not member and project.is_private:
                       # If public project in workspace user is member of... complicated.
                       # Sticking to explicit project membership or ownership for now safe default.
                       # TODO: Expand to Workspace members if project is Public
                       raise HTTPException(status_code=400, detail="Not a member of this project")
 
-            statement = select(Task, Project).join(Project, Task.project_id == Project.id)
+            statement = select(*columns).join(Project, Task.project_id == Project.id)
             statement = statement.where(Task.project_id == project_id)
         else:
              # Filter by projects user is member/owner of
              # SELECT * FROM task JOIN project ...
              # Simplified: JOIN ProjectMember
              statement = (
-                 select(Task, Project)
+                 select(*columns)
                  .join(Project, Task.project_id == Project.id)
                  .join(ProjectMember, Project.id == ProjectMember.project_id, isouter=True)
                  .where(
                      (Project.owner_id == current_user.id) | 
                      (ProjectMember.user_id == current_user.id)
                  )
+                 .where(col(Project.deleted_at).is_(None))
                  .distinct()
              )
         
         # Apply filters
         if assignee_id:
              statement = statement.where(Task.assignee_id == assignee_id)
+        statement = _filter_due_date(statement, due_after, due_before)
 
-        count_statement = select(func.count()).select_from(statement.subquery())
-        # count = session.exec(count_statement).one() # Error with distinct sometimes?
-        
-        # Simple count
-        results = session.exec(statement).all()
-        count = len(results)
-        
-        results_page = results[skip : skip + limit]
-        
-        tasks_data = []
-        for task, project in results_page:
-            task_dict = task.model_dump()
-            task_dict["project_name"] = project.name
-            task_dict["project_color"] = project.color
-            tasks_data.append(TaskPublicWithProject(**task_dict))
+    results, count, has_more = paginate(
+        session, statement, skip=skip, limit=limit, include_count=include_count
+    )
 
-    return TasksPublicWithProject(data=tasks_data, count=count)
+    return list_response(
+        TasksPublicWithProject, results, fields, count=count, has_more=has_more
+    )
 
 
 @router.get("/{id}", response_model=TaskPublic)
-def read_task(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_task(session: SessionDep, current_user: CurrentUser, memberships: MembershipsDep, id: uuid.UUID) -> Any:
     """
     Get task by ID.
     """
-    task = session.get(Task, id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    task, project = _get_task(session, id)
     
     # Permission check
     if not current_user.is_superuser:
-        project = session.get(Project, task.project_id)
         if project.owner_id != current_user.id:
-             member = session.get(ProjectMember, (project.id, current_user.id))
+             member = memberships.project_role(project.id)
              if not member:
                   raise HTTPException(status_code=400, detail="Not enough permissions")
 
@@ -137,19 +168,19 @@ def read_task(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) ->
 
 @router.post("/", response_model=TaskPublic)
 def create_task(
-    *, session: SessionDep, current_user: CurrentUser, task_in: TaskCreate
+    *, session: SessionDep, current_user: CurrentUser, memberships: MembershipsDep, task_in: TaskCreate
 ) -> Any:
     """
     Create new task.
     """
     # Verify project membership
     project = session.get(Project, task_in.project_id)
-    if not project:
+    if not project or project.deleted_at:
         raise HTTPException(status_code=404, detail="Project not found")
         
     if not current_user.is_superuser:
         if project.owner_id != current_user.id:
-            member = session.get(ProjectMember, (project.id, current_user.id))
+            member = memberships.project_role(project.id)
             if not member:
                  raise HTTPException(status_code=400, detail="Not a member of this project")
 
@@ -195,22 +226,20 @@ def update_task(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    memberships: MembershipsDep,
     id: uuid.UUID,
     task_in: TaskUpdate,
 ) -> Any:
     """
     Update a task.
     """
-    task = session.get(Task, id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    task, project = _get_task(session, id)
     
     # Check permissions (Member of project can update? Or only Assignee/Owner?)
     # For now, any project member can update tasks (Collaboration)
     if not current_user.is_superuser:
-         project = session.get(Project, task.project_id)
          if project.owner_id != current_user.id:
-             member = session.get(ProjectMember, (project.id, current_user.id))
+             member = memberships.project_role(project.id)
              if not member:
                   raise HTTPException(status_code=400, detail="Not enough permissions")
 
@@ -261,17 +290,17 @@ def delete_task(
     """
     Delete a task.
     """
-    task = session.get(Task, id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    task, project = _get_task(session, id)
     
     if not current_user.is_superuser:
          # Only Project Owner or Task Creator (Owner) can delete?
          if task.owner_id != current_user.id:
-              project = session.get(Project, task.project_id)
               if project.owner_id != current_user.id:
                   raise HTTPException(status_code=400, detail="Not enough permissions")
 
+    crud.create_tombstone(
+        session=session, entity_type="task", entity_id=task.id, project_id=task.project_id
+    )
     session.delete(task)
     session.commit()
     return Message(message="Task deleted successfully")
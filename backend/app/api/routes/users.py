@@ -1,8 +1,8 @@
 import uuid
-from typing import Any
+from typing import Any, Literal
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from sqlmodel import col, delete, or_, select
 
 from app import crud
 from app.api.deps import (
@@ -10,6 +10,8 @@ from app.api.deps import (
     SessionDep,
     get_current_active_superuser,
 )
+from app.api.pagination import CountMode, keyset_paginate
+from app.api.rate_limit import limit_signup
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
 from app.models import (
@@ -39,18 +41,46 @@ router = APIRouter(prefix="/users", tags=["users"])
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
-    """
-    Retrieve users.
+def read_users(
+    session: SessionDep,
+    q: str | None = None,
+    order_by: Literal["email", "id"] = "email",
+    cursor: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    include_count: CountMode = "exact",
+) -> Any:
     """
+    Retrieve users, optionally matching q anywhere in email or full name.
 
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
-
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
-
-    return UsersPublic(data=users, count=count)
+    Pass next_cursor from the response as cursor to get the next page.
+    """
+    statement = select(User)
+    if q:
+        # Escape LIKE wildcards so q is matched literally
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        statement = statement.where(
+            or_(
+                col(User.email).ilike(pattern, escape="\\"),
+                col(User.full_name).ilike(pattern, escape="\\"),
+            )
+        )
+    # Both keys are unique, so the key alone is a stable cursor
+    order_column = User.email if order_by == "email" else User.id
+    users, count, has_more, next_cursor = keyset_paginate(
+        session,
+        statement,
+        order_by=[order_column],
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+        include_count=include_count,
+    )
+
+    return UsersPublic(
+        data=users, count=count, has_more=has_more, next_cursor=next_cursor
+    )
 
 
 @router.post(
@@ -144,7 +174,9 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
     return Message(message="User deleted successfully")
 
 
-@router.post("/signup", response_model=UserPublic)
+@router.post(
+    "/signup", dependencies=[Depends(limit_signup)], response_model=UserPublic
+)
 def register_user(session: SessionDep, user_in: UserRegister) -> Any:
     """
     Create new user without the need to be logged in.
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
@@ -29,3 +29,13 @@ def test_email(email_to: EmailStr) -> Message:
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
+
+
+@router.get("/ready/")
+async def readiness(request: Request) -> bool:
+    """
+    Ready once startup warmup (DB pool, Redis, templates, S3) has finished.
+    """
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Not ready")
+    return True
@@ -1,12 +1,19 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlmodel import col, func, select
 
-from app.api.deps import CurrentUser, SessionDep
+from app import crud
+from app.api.deletion import purge, read_deletion_job
+from app.api.deps import CurrentUser, MembershipsDep, SessionDep
+from app.api.fieldsets import fields_query, list_response, select_fields
+from app.api.pagination import CountMode, paginate
 from app.models import (
+    DeletionJobPublic,
     Message,
+    User,
     Workspace,
     WorkspaceCreate,
     WorkspaceMember,
@@ -18,12 +25,23 @@ from app.models import (
     WorkspaceMemberPublic,
 )
 
+# Only the columns WorkspaceMemberPublic needs, fetched as plain rows
+MEMBER_LIST_COLUMNS = (
+    *(getattr(User, name) for name in WorkspaceMemberPublic.model_fields if name != "role"),
+    WorkspaceMember.role,
+)
+MemberFields = Annotated[list[str] | None, Depends(fields_query(MEMBER_LIST_COLUMNS))]
+
 router = APIRouter(prefix="/workspaces", tags=["workspaces"])
 
 
 @router.get("/", response_model=WorkspacesPublic)
 def read_workspaces(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    include_count: CountMode = "exact",
 ) -> Any:
     """
     Retrieve workspaces.
@@ -33,46 +51,40 @@ def read_workspaces(
     # Better: Join with WorkspaceMember to find workspaces the user belongs to.
     
     if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Workspace)
-        count = session.exec(count_statement).one()
-        statement = select(Workspace).offset(skip).limit(limit)
-        workspaces = session.exec(statement).all()
+        statement = select(Workspace)
     else:
         # User's workspaces
         statement = (
             select(Workspace)
             .join(WorkspaceMember, Workspace.id == WorkspaceMember.workspace_id)
             .where(WorkspaceMember.user_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
         )
-        # Note: Count might be complex with join, doing simple count for now
-        # Actually count only matches
-        count_statement = (
-             select(func.count())
-             .select_from(Workspace)
-             .join(WorkspaceMember, Workspace.id == WorkspaceMember.workspace_id)
-             .where(WorkspaceMember.user_id == current_user.id)
-        )
-        count = session.exec(count_statement).one()
-        workspaces = session.exec(statement).all()
+    statement = statement.where(col(Workspace.deleted_at).is_(None))
+
+    workspaces, count, has_more = paginate(
+        session, statement, skip=skip, limit=limit, include_count=include_count
+    )
 
-    return WorkspacesPublic(data=workspaces, count=count)
+    return WorkspacesPublic(data=workspaces, count=count, has_more=has_more)
 
 
 @router.get("/{id}", response_model=WorkspacePublic)
-def read_workspace(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_workspace(
+    session: SessionDep,
+    current_user: CurrentUser,
+    memberships: MembershipsDep,
+    id: uuid.UUID,
+) -> Any:
     """
     Get workspace by ID.
     """
     workspace = session.get(Workspace, id)
-    if not workspace:
+    if not workspace or workspace.deleted_at:
         raise HTTPException(status_code=404, detail="Workspace not found")
     
     if not current_user.is_superuser:
         # Check membership
-        member = session.get(WorkspaceMember, (id, current_user.id))
-        if not member:
+        if not memberships.workspace_role(id):
              raise HTTPException(status_code=400, detail="Not enough permissions")
 
     return workspace
@@ -110,7 +122,7 @@ def update_workspace(
     Update a workspace.
     """
     workspace = session.get(Workspace, id)
-    if not workspace:
+    if not workspace or workspace.deleted_at:
         raise HTTPException(status_code=404, detail="Workspace not found")
     
     if not current_user.is_superuser:
@@ -128,43 +140,69 @@ def update_workspace(
 
 @router.delete("/{id}", response_model=Message)
 def delete_workspace(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    session: SessionDep,
+    current_user: CurrentUser,
+    id: uuid.UUID,
+    background_tasks: BackgroundTasks,
 ) -> Any:
     """
     Delete a workspace.
+
+    The workspace and its projects disappear immediately; their contents
+    are removed in the background.
     """
     workspace = session.get(Workspace, id)
-    if not workspace:
+    if not workspace or workspace.deleted_at:
         raise HTTPException(status_code=404, detail="Workspace not found")
     
     if not current_user.is_superuser:
          if workspace.owner_id != current_user.id:
             raise HTTPException(status_code=400, detail="Not enough permissions")
 
-    session.delete(workspace)
+    job = crud.create_deletion_job(
+        session=session, entity=workspace, requested_by_id=current_user.id
+    )
     session.commit()
+    background_tasks.add_task(purge, job.id)
     return Message(message="Workspace deleted successfully")
 
 
-@router.get("/{id}/members", response_model=WorkspaceMembersPublic)
+@router.get("/{id}/deletion", response_model=DeletionJobPublic)
+def read_workspace_deletion(
+    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+) -> Any:
+    """
+    Get the progress of a workspace deletion.
+    """
+    return read_deletion_job(session, current_user, id)
+
+
+@router.get(
+    "/{id}/members",
+    response_model=WorkspaceMembersPublic,
+    response_class=ORJSONResponse,
+)
 def read_workspace_members(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    memberships: MembershipsDep,
+    id: uuid.UUID,
+    fields: MemberFields,
+    skip: int = 0,
+    limit: int = 100,
 ) -> Any:
     """
     Retrieve members of a workspace with roles.
     """
     workspace = session.get(Workspace, id)
-    if not workspace:
+    if not workspace or workspace.deleted_at:
         raise HTTPException(status_code=404, detail="Workspace not found")
         
     # Check if current user is member
     if not current_user.is_superuser:
-        member = session.get(WorkspaceMember, (id, current_user.id))
-        if not member:
+        if not memberships.workspace_role(id):
              raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    from app.models import User # Import inside to avoid circular deps if any
-    
     count_statement = (
         select(func.count())
         .select_from(User)
@@ -173,21 +211,13 @@ def read_workspace_members(
     )
     count = session.exec(count_statement).one()
     
-    # Select User and WorkspaceMember.role
     statement = (
-        select(User, WorkspaceMember.role)
+        select(*select_fields(MEMBER_LIST_COLUMNS, fields))
         .join(WorkspaceMember, User.id == WorkspaceMember.user_id)
         .where(WorkspaceMember.workspace_id == id)
         .offset(skip)
         .limit(limit)
     )
     results = session.exec(statement).all()
-    
-    # Transform to WorkspaceMemberPublic
-    members_data = []
-    for user, role in results:
-        member_dict = user.model_dump()
-        member_dict["role"] = role
-        members_data.append(WorkspaceMemberPublic(**member_dict))
-    
-    return WorkspaceMembersPublic(data=members_data, count=count)
+
+    return list_response(WorkspaceMembersPublic, results, fields, count=count)
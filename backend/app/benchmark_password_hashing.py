@@ -0,0 +1,84 @@
+"""
+Time password hashing on this host for a range of cost parameters, to pick
+the PASSWORD_* settings. Every login and password change pays this once per
+request, in a worker thread:
+
+    python -m app.benchmark_password_hashing
+    python -m app.benchmark_password_hashing --bcrypt-rounds 11 12 13 \\
+        --argon2-memory-cost 19456 65536
+"""
+
+import argparse
+import logging
+import secrets
+import time
+from collections.abc import Iterator
+
+from app.core.config import settings
+from app.core.security import password_context
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def time_hash(iterations: int, scheme: str, **costs: int) -> float:
+    """
+    Median seconds per hash with `scheme` and `costs`.
+    """
+    context = password_context(scheme, **costs)
+    password = secrets.token_urlsafe(16)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        context.hash(password)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def _candidates(args: argparse.Namespace) -> Iterator[tuple[str, dict[str, int]]]:
+    for rounds in args.bcrypt_rounds:
+        yield "bcrypt", {"bcrypt_rounds": rounds}
+    for time_cost in args.argon2_time_cost:
+        for memory_cost in args.argon2_memory_cost:
+            yield (
+                "argon2",
+                {
+                    "argon2_time_cost": time_cost,
+                    "argon2_memory_cost": memory_cost,
+                    "argon2_parallelism": args.argon2_parallelism,
+                },
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark password hashing costs")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument(
+        "--bcrypt-rounds", type=int, nargs="*", default=[10, 11, 12, 13, 14]
+    )
+    parser.add_argument("--argon2-time-cost", type=int, nargs="*", default=[1, 2, 3])
+    parser.add_argument(
+        "--argon2-memory-cost",
+        type=int,
+        nargs="*",
+        default=[19456, 47104, 65536],
+        help="KiB",
+    )
+    parser.add_argument(
+        "--argon2-parallelism", type=int, default=settings.PASSWORD_ARGON2_PARALLELISM
+    )
+    args = parser.parse_args()
+
+    current = time_hash(args.iterations, settings.PASSWORD_HASH_SCHEME)
+    logger.info(
+        f"current settings ({settings.PASSWORD_HASH_SCHEME}): "
+        f"{current * 1e3:.1f} ms per hash"
+    )
+    for scheme, costs in _candidates(args):
+        elapsed = time_hash(args.iterations, scheme, **costs)
+        params = ", ".join(f"{name}={value}" for name, value in costs.items())
+        logger.info(f"{scheme} {params}: {elapsed * 1e3:.1f} ms per hash")
+
+
+if __name__ == "__main__":
+    main()
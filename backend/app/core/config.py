@@ -6,6 +6,7 @@ from pydantic import (
     AnyUrl,
     BeforeValidator,
     EmailStr,
+    Field,
     HttpUrl,
     PostgresDsn,
     computed_field,
@@ -23,6 +24,9 @@ def parse_cors(v: Any) -> list[str] | str:
     raise ValueError(v)
 
 
+RateLimit = Annotated[str, Field(pattern=r"^\d+/(second|minute|hour|day)$")]
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         # Use top level .env file (one level above ./backend/)
@@ -32,8 +36,17 @@ class Settings(BaseSettings):
     )
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
-    # 60 minutes * 24 hours * 8 days = 8 days
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Access tokens are short-lived; clients get new ones with the refresh
+    # token, which lasts 60 minutes * 24 hours * 8 days = 8 days
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # How long a token revoked on one worker may still be accepted by others
+    TOKEN_DENYLIST_SYNC_SECONDS: float = 5.0
+    # Put the user's workspace and project roles in access tokens so routes can
+    # authorize without membership queries while the claims are current.
+    # Users with more memberships than the max get tokens without claims.
+    TOKEN_MEMBERSHIP_CLAIMS: bool = False
+    TOKEN_MEMBERSHIP_CLAIMS_MAX: int = 100
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
 
@@ -48,6 +61,28 @@ class Settings(BaseSettings):
             self.FRONTEND_HOST
         ]
 
+    # `python -m app.server`; workers default to the CPUs available
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int | None = Field(default=None, ge=1)
+    SERVER_LOOP: Literal["auto", "asyncio", "uvloop"] = "auto"
+    SERVER_HTTP: Literal["auto", "h11", "httptools"] = "auto"
+    # Longer than the proxy keeps idle upstream connections (Traefik: 90s), so
+    # it never reuses one we are closing
+    SERVER_KEEP_ALIVE_TIMEOUT: int = 95
+    SERVER_BACKLOG: int = 2048
+    # Proxies whose X-Forwarded-For/-Proto uvicorn trusts, comma-separated, or
+    # "*". Must include the proxy (Traefik) or every client gets its address
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    # Recycle a worker after this many requests (plus up to the jitter)
+    SERVER_MAX_REQUESTS: int | None = None
+    SERVER_MAX_REQUESTS_JITTER: int = 0
+    # Seconds to let in-flight requests finish on shutdown
+    SERVER_GRACEFUL_TIMEOUT: int | None = 30
+    # DB connections each worker opens before it reports ready; at most the
+    # pool size (5) stay open
+    WARMUP_DB_CONNECTIONS: int = Field(default=5, ge=0)
+
     PROJECT_NAME: str
     SENTRY_DSN: HttpUrl | None = None
     POSTGRES_SERVER: str
@@ -59,6 +94,70 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
 
+    # Limits for the unauthenticated endpoints, as "<count>/<second|minute|hour|day>",
+    # kept in Redis and shared by all workers
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN_PER_IP: RateLimit = "20/minute"
+    RATE_LIMIT_LOGIN_PER_EMAIL: RateLimit = "10/minute"
+    RATE_LIMIT_SIGNUP_PER_IP: RateLimit = "10/hour"
+    RATE_LIMIT_SIGNUP_PER_EMAIL: RateLimit = "3/hour"
+    RATE_LIMIT_PASSWORD_RECOVERY_PER_IP: RateLimit = "10/hour"
+    RATE_LIMIT_PASSWORD_RECOVERY_PER_EMAIL: RateLimit = "3/hour"
+
+    # OpenTelemetry tracing; "memory" keeps spans in-process for /private/traces
+    OTEL_ENABLED: bool = False
+    OTEL_SERVICE_NAME: str = "backend"
+    OTEL_SAMPLE_RATIO: float = Field(default=1.0, ge=0.0, le=1.0)
+    OTEL_EXPORTER: Literal["otlp", "console", "memory"] = "console"
+    # Defaults to the OTEL_EXPORTER_OTLP_* environment variables when unset
+    OTEL_EXPORTER_OTLP_ENDPOINT: str | None = None
+
+    # Superusers can send X-Profile on API requests to get a pyinstrument
+    # report. Off by default: it swaps anyio's threadpool entry point for the
+    # whole process (see app.api.profiling)
+    PROFILING_ENABLED: bool = False
+    PROFILING_INTERVAL: float = 0.001
+
+    # Response compression, negotiated from Accept-Encoding. Encodings are in
+    # order of preference when the client accepts several equally; levels
+    # trade CPU for bandwidth
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: Annotated[
+        list[Literal["zstd", "br", "gzip"]] | str, BeforeValidator(parse_cors)
+    ] = ["zstd", "br", "gzip"]
+    # Bytes; smaller responses are not worth the CPU or the encoding overhead
+    COMPRESSION_MINIMUM_SIZE: int = Field(default=1024, ge=0)
+    # Media type prefixes; images, archives and uploads are already compressed
+    COMPRESSION_CONTENT_TYPES: Annotated[
+        list[str] | str, BeforeValidator(parse_cors)
+    ] = ["application/json", "text/", "application/javascript", "image/svg+xml"]
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, ge=1, le=9)
+    COMPRESSION_BROTLI_QUALITY: int = Field(default=4, ge=0, le=11)
+    COMPRESSION_ZSTD_LEVEL: int = Field(default=3, ge=1, le=22)
+
+    # Prometheus metrics at /metrics
+    METRICS_ENABLED: bool = True
+
+    # Per-request SQL statement counting (X-DB-* headers / log fields)
+    QUERY_STATS_ENABLED: bool = True
+    # A statement shape executed this many times in one request is reported as N+1
+    QUERY_STATS_REPEAT_THRESHOLD: int = 5
+
+    # Statements slower than this are logged; outside production their plan
+    # is captured with EXPLAIN (ANALYZE, BUFFERS) in the background
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    # Re-capture the plan of the same statement at most this often (seconds)
+    SLOW_QUERY_EXPLAIN_INTERVAL: int = 300
+
+    # Rows removed per transaction when purging a deleted workspace or project
+    DELETION_BATCH_SIZE: int = 1000
+    # A running purge that has not finished a batch for this long is taken to
+    # be orphaned (its worker died) and may be resumed
+    DELETION_STALE_SECONDS: int = 600
+    # Give up on a deletion after this many runs; it stays "failed"
+    DELETION_MAX_ATTEMPTS: int = 5
+
     S3_BUCKET: str | None = None
     AWS_ACCESS_KEY_ID: str | None = None
     AWS_SECRET_ACCESS_KEY: str | None = None
@@ -92,12 +191,24 @@ class Settings(BaseSettings):
         return self
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
+    # Messages sent over one SMTP connection by send_emails
+    EMAILS_BATCH_SIZE: int = 50
 
     @computed_field  # type: ignore[prop-decorator]
     @property
     def emails_enabled(self) -> bool:
         return bool(self.SMTP_HOST and self.EMAILS_FROM_EMAIL)
 
+    # New and changed passwords are hashed with PASSWORD_HASH_SCHEME; hashes
+    # using another scheme or other cost parameters are upgraded on login.
+    # `python -m app.benchmark_password_hashing` shows what each costs here.
+    PASSWORD_HASH_SCHEME: Literal["bcrypt", "argon2"] = "bcrypt"
+    PASSWORD_BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=31)
+    # argon2id; memory in KiB, per hash and per concurrent login
+    PASSWORD_ARGON2_TIME_COST: int = Field(default=2, ge=1)
+    PASSWORD_ARGON2_MEMORY_COST: int = Field(default=19456, ge=8)
+    PASSWORD_ARGON2_PARALLELISM: int = Field(default=1, ge=1)
+
     EMAIL_TEST_USER: EmailStr = "test@example.com"
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
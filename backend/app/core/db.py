@@ -1,10 +1,33 @@
+from contextlib import ExitStack
+
+from sqlalchemy import text
 from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
+from app.core.metrics import instrument_pool
+from app.core.query_stats import instrument_engine
+from app.core.slow_queries import instrument_slow_queries
 from app.models import User, UserCreate
 
 engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+if settings.QUERY_STATS_ENABLED:
+    instrument_engine(engine)
+if settings.METRICS_ENABLED:
+    instrument_pool(engine)
+if settings.SLOW_QUERY_LOG_ENABLED:
+    instrument_slow_queries(engine)
+
+
+def warm_pool(connections: int) -> None:
+    """
+    Open `connections` pool connections up front. They are checked out
+    together so each is a separate connection, then returned to the pool.
+    """
+    with ExitStack() as stack:
+        for _ in range(connections):
+            conn = stack.enter_context(engine.connect())
+            conn.execute(text("SELECT 1"))
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
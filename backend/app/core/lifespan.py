@@ -0,0 +1,68 @@
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+import structlog
+from fastapi import FastAPI
+from redis.exceptions import RedisError
+
+from app.core import metrics, s3
+from app.core.config import settings
+from app.core.db import engine, warm_pool
+from app.core.redis_client import redis_client, redis_client_sync
+from app.core.slow_queries import drain_explains
+from app.core.tracing import flush_tracing
+from app.utils import preload_email_templates
+
+logger = structlog.get_logger()
+
+
+async def warm_up() -> None:
+    """
+    Pay connection setup and template compilation before the first request
+    instead of during it.
+    """
+    start = time.perf_counter()
+    # The app cannot serve anything without the database, so a failure here
+    # fails startup
+    await anyio.to_thread.run_sync(warm_pool, settings.WARMUP_DB_CONNECTIONS)
+    try:
+        await redis_client.ping()
+        await anyio.to_thread.run_sync(redis_client_sync.ping)
+    except RedisError as e:
+        # Rate limiting and the token denylist carry on without Redis
+        logger.warning("warmup_redis_unavailable", error=str(e))
+    await anyio.to_thread.run_sync(preload_email_templates)
+    await anyio.to_thread.run_sync(s3.get_s3_client)
+    logger.info(
+        "warmup_complete", elapsed_ms=round((time.perf_counter() - start) * 1e3, 2)
+    )
+
+
+async def shut_down() -> None:
+    """
+    Runs after uvicorn has stopped accepting connections and in-flight
+    requests, including their BackgroundTasks (emails, purges), have finished
+    or SERVER_GRACEFUL_TIMEOUT ran out.
+    """
+    await anyio.to_thread.run_sync(drain_explains, settings.SERVER_GRACEFUL_TIMEOUT)
+    await anyio.to_thread.run_sync(flush_tracing)
+    await redis_client.aclose()
+    redis_client_sync.close()
+    engine.dispose()
+    metrics.mark_process_dead()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Read by /utils/ready/; uvicorn only starts serving once startup is done,
+    # but a request already being handled at shutdown can see it go False
+    app.state.ready = False
+    await warm_up()
+    app.state.ready = True
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        await shut_down()
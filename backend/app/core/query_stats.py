@@ -0,0 +1,106 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    # Statements are compiled with bind placeholders, so the SQL text is
+    # already the statement's shape; the same shape many times is an N+1.
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def repeated(self) -> list[tuple[str, int]]:
+        threshold = settings.QUERY_STATS_REPEAT_THRESHOLD
+        return [(s, n) for s, n in self.shapes.most_common() if n >= threshold]
+
+
+# Set per request by QueryStatsMiddleware. Sync endpoints and dependencies run
+# in a threadpool with a copy of the context, which still points at the same
+# QueryStats object, so their queries are counted too.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(
+    conn: Any, _cursor: Any, _statement: str, *_args: Any
+) -> None:
+    if current_query_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats.count += 1
+    stats.total_time += elapsed
+    stats.shapes[statement] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Count the SQL statements each HTTP request executes.
+
+    Outside production the totals are returned as X-DB-* response headers;
+    in production they are emitted as structured log fields instead.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        expose_headers = settings.ENVIRONMENT != "production"
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start" and expose_headers:
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.total_time * 1e3:.2f}".encode()),
+                    (b"x-db-repeated-queries", str(len(stats.repeated())).encode()),
+                ]
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_query_stats.reset(token)
+            if not expose_headers and stats.count:
+                repeated = stats.repeated()
+                log = logger.warning if repeated else logger.info
+                log(
+                    "request_db_stats",
+                    method=scope["method"],
+                    path=scope["path"],
+                    db_queries=stats.count,
+                    db_time_ms=round(stats.total_time * 1e3, 2),
+                    db_repeated=[
+                        {"statement": s[:200], "count": n} for s, n in repeated
+                    ],
+                )
@@ -1,13 +1,43 @@
+import functools
 import logging
-import boto3
-from botocore.exceptions import ClientError
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
 from app.core.config import settings
+from app.core.metrics import S3_OPERATION_DURATION
 
 logger = logging.getLogger(__name__)
 
-def get_s3_client():
+
+@contextmanager
+def _timed(operation: str) -> Iterator[None]:
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        S3_OPERATION_DURATION.labels(operation, outcome).observe(
+            time.perf_counter() - start
+        )
+
+
+# boto3 ships without type information, hence Any for the client
+def get_s3_client() -> Any:
     if not settings.S3_BUCKET:
         return None
+    return _create_s3_client()
+
+
+# Clients are thread-safe and slow to build (they load the service model), so
+# each process creates one, at startup (see app.core.lifespan) or on first use
+@functools.cache
+def _create_s3_client() -> Any:
+    # boto3 takes a while to import; only load it once S3 is actually used
+    import boto3
+
     return boto3.client(
         "s3",
         aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
@@ -21,12 +51,15 @@ def upload_file_to_s3(file_obj, key: str, content_type: str = None) -> bool:
         logger.warning("S3 client not configured, skipping upload")
         return False
 
+    from botocore.exceptions import ClientError
+
     try:
         extra_args = {}
         if content_type:
             extra_args["ContentType"] = content_type
             
-        s3_client.upload_fileobj(file_obj, settings.S3_BUCKET, key, ExtraArgs=extra_args)
+        with _timed("upload"):
+            s3_client.upload_fileobj(file_obj, settings.S3_BUCKET, key, ExtraArgs=extra_args)
         return True
     except ClientError as e:
         logger.error(f"Error uploading to S3: {e}")
@@ -36,13 +69,15 @@ def get_presigned_url(key: str, expiration: int = 3600) -> str | None:
     s3_client = get_s3_client()
     if not s3_client:
         return None
+    from botocore.exceptions import ClientError
 
     try:
-        response = s3_client.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": settings.S3_BUCKET, "Key": key},
-            ExpiresIn=expiration,
-        )
+        with _timed("presign"):
+            response = s3_client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": settings.S3_BUCKET, "Key": key},
+                ExpiresIn=expiration,
+            )
         return response
     except ClientError as e:
         logger.error(f"Error generating presigned URL: {e}")
@@ -52,10 +87,44 @@ def delete_file_from_s3(key: str) -> bool:
     s3_client = get_s3_client()
     if not s3_client:
         return False
+    from botocore.exceptions import ClientError
 
     try:
-        s3_client.delete_object(Bucket=settings.S3_BUCKET, Key=key)
+        with _timed("delete"):
+            s3_client.delete_object(Bucket=settings.S3_BUCKET, Key=key)
         return True
     except ClientError as e:
         logger.error(f"Error deleting from S3: {e}")
         return False
+
+def list_objects(prefix: str) -> Iterator[dict[str, Any]]:
+    s3_client = get_s3_client()
+    if not s3_client:
+        return
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=settings.S3_BUCKET, Prefix=prefix):
+        yield from page.get("Contents", [])
+
+def delete_files_from_s3(keys: list[str]) -> list[str]:
+    """
+    Delete up to 1000 keys with one DeleteObjects call. Returns the keys
+    that could not be deleted.
+    """
+    s3_client = get_s3_client()
+    if not s3_client or not keys:
+        return list(keys)
+    from botocore.exceptions import ClientError
+
+    try:
+        with _timed("delete_batch"):
+            response = s3_client.delete_objects(
+                Bucket=settings.S3_BUCKET,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+            )
+    except ClientError as e:
+        logger.error(f"Error batch deleting from S3: {e}")
+        return list(keys)
+    errors = response.get("Errors", [])
+    for error in errors:
+        logger.error(f"Error deleting {error['Key']} from S3: {error['Message']}")
+    return [error["Key"] for error in errors]
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar
+from datetime import date, datetime
+from typing import Any
+
+import structlog
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Most recent slow statements with their plans, newest last. Per process; read
+# by the local-only /private/slow-queries/ route.
+recent_slow_queries: deque[dict[str, Any]] = deque(maxlen=100)
+
+# Set per request by SlowQueryMiddleware. The router stores the matched route
+# in the same scope dict later on, so it is available by the time queries run.
+current_request_scope: ContextVar[Scope | None] = ContextVar(
+    "current_request_scope", default=None
+)
+
+# EXPLAIN ANALYZE runs the statement again, so plans are captured one at a
+# time, in the background, at most once per statement shape per interval.
+_explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+_pending_explains: set[Future[None]] = set()
+_last_explained: dict[str, float] = {}
+_explain_lock = threading.Lock()
+
+_WHITESPACE = re.compile(r"\s+")
+_SAFE_PARAM_TYPES = (bool, int, float, uuid.UUID, date, datetime)
+
+
+def normalize_sql(statement: str) -> str:
+    # Statements are compiled with bind placeholders, so collapsing whitespace
+    # is enough to give every execution of the same query the same text.
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """
+    Keep ids, numbers and dates, which help reproduce a plan; hide everything
+    else (emails, password hashes, user content).
+    """
+    if isinstance(parameters, dict):
+        return {k: redact_parameters(v) for k, v in parameters.items()}
+    if isinstance(parameters, list | tuple):
+        return [redact_parameters(v) for v in parameters]
+    if parameters is None or isinstance(parameters, _SAFE_PARAM_TYPES):
+        return parameters
+    return f"<{type(parameters).__name__}>"
+
+
+def _current_route() -> str | None:
+    scope = current_request_scope.get()
+    if scope is None:
+        return None
+    route = getattr(scope.get("route"), "path_format", scope["path"])
+    return f"{scope['method']} {route}"
+
+
+def _explain(
+    engine: Engine, entry: dict[str, Any], statement: str, parameters: Any
+) -> None:
+    try:
+        with engine.connect().execution_options(slow_query_log=False) as conn:
+            result = conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+            )
+            plan = result.scalar_one()
+            # Never keep anything EXPLAIN ANALYZE may have touched
+            conn.rollback()
+    except Exception as e:
+        logger.warning(
+            "slow_query_explain_failed", fingerprint=entry["fingerprint"], error=str(e)
+        )
+        return
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    entry["plan"] = plan
+    top = plan[0]
+    logger.info(
+        "slow_query_plan",
+        fingerprint=entry["fingerprint"],
+        route=entry["route"],
+        plan_node=top["Plan"]["Node Type"],
+        plan_total_cost=top["Plan"]["Total Cost"],
+        plan_execution_ms=top.get("Execution Time"),
+    )
+
+
+def _should_explain(statement: str, fingerprint: str, executemany: bool) -> bool:
+    if settings.ENVIRONMENT == "production" or executemany:
+        return False
+    # Only plain reads: re-running writes or row locks is never safe here
+    head = statement.lstrip()[:6].upper()
+    if head not in ("SELECT", "WITH") or "FOR UPDATE" in statement.upper():
+        return False
+    now = time.monotonic()
+    with _explain_lock:
+        last = _last_explained.get(fingerprint)
+        if last is not None and now - last < settings.SLOW_QUERY_EXPLAIN_INTERVAL:
+            return False
+        _last_explained[fingerprint] = now
+    return True
+
+
+def _before_cursor_execute(conn: Any, *_args: Any) -> None:
+    conn.info.setdefault("slow_query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    _cursor: Any,
+    statement: str,
+    parameters: Any,
+    _context: Any,
+    executemany: bool,
+) -> None:
+    elapsed = time.perf_counter() - conn.info["slow_query_start_time"].pop()
+    elapsed_ms = elapsed * 1e3
+    if elapsed_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+    if not conn.get_execution_options().get("slow_query_log", True):
+        return
+
+    normalized = normalize_sql(statement)
+    fingerprint = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    entry: dict[str, Any] = {
+        "fingerprint": fingerprint,
+        "statement": normalized,
+        "parameters": redact_parameters(parameters),
+        "route": _current_route(),
+        "elapsed_ms": round(elapsed_ms, 2),
+        "logged_at": datetime.utcnow().isoformat(),
+        "plan": None,
+    }
+    recent_slow_queries.append(entry)
+    logger.warning(
+        "slow_query",
+        fingerprint=fingerprint,
+        statement=normalized[:1000],
+        parameters=entry["parameters"],
+        route=entry["route"],
+        elapsed_ms=entry["elapsed_ms"],
+    )
+    if _should_explain(statement, fingerprint, executemany):
+        future = _explain_executor.submit(
+            _explain, conn.engine, entry, statement, parameters
+        )
+        _pending_explains.add(future)
+        future.add_done_callback(_pending_explains.discard)
+
+
+def drain_explains(timeout: float | None = None) -> None:
+    """
+    Drop queued EXPLAINs and wait up to `timeout` for the running one, so it
+    is not cut off mid-query when the process shuts down.
+    """
+    pending = list(_pending_explains)
+    for future in pending:
+        future.cancel()
+    wait(pending, timeout=timeout)
+
+
+def instrument_slow_queries(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SlowQueryMiddleware:
+    """
+    Make the current request available to the slow-query log so each entry
+    names the route that issued the statement.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request_scope.reset(token)
@@ -0,0 +1,129 @@
+import math
+import threading
+import time
+from typing import cast
+
+import structlog
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import redis_client_sync
+
+logger = structlog.get_logger()
+
+# Sorted set of "<jti>:<exp>" members scored by when they were revoked
+DENYLIST_KEY = "token-denylist"
+# One key per used refresh token, expiring with the token
+REFRESH_USED_PREFIX = "refresh-used:"
+
+
+class TokenDenylist:
+    """
+    Revoked token ids, mirrored into every process.
+
+    Revocations are written to Redis and to the local copy. Each process
+    pulls revocations made elsewhere at most every
+    TOKEN_DENYLIST_SYNC_SECONDS, so checking a token (every authenticated
+    request) is a set lookup rather than a Redis round trip. A token
+    revoked on another worker is therefore rejected there after at most
+    that delay. If Redis is unavailable the local copy keeps being used.
+    """
+
+    def __init__(self) -> None:
+        # jti -> exp; nothing needs to be kept once the token has expired
+        self._revoked: dict[str, float] = {}
+        self._synced_until = 0.0
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def revoke(self, jti: str, exp: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._revoked[jti] = exp
+        try:
+            with redis_client_sync.pipeline() as pipe:
+                pipe.zadd(DENYLIST_KEY, {f"{jti}:{exp}": now})
+                # Revocations older than the longest token lifetime are moot
+                pipe.zremrangebyscore(
+                    DENYLIST_KEY, "-inf", now - self._max_lifetime_seconds()
+                )
+                pipe.execute()
+        except RedisError as e:
+            logger.warning("token_denylist_unavailable", error=str(e))
+
+    def is_revoked(self, jti: str) -> bool:
+        now = time.time()
+        if now >= self._next_sync:
+            self._sync(now)
+        return jti in self._revoked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+            self._synced_until = 0.0
+            self._next_sync = 0.0
+
+    def _sync(self, now: float) -> None:
+        # Requests arriving while another thread syncs use the local copy
+        # instead of queueing up behind a slow Redis
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            if now < self._next_sync:
+                return
+            self._next_sync = now + settings.TOKEN_DENYLIST_SYNC_SECONDS
+            since = self._synced_until or now - self._max_lifetime_seconds()
+            try:
+                # Inclusive, and overlapping the last sync a little, so
+                # revocations landing in the same instant are not missed
+                entries = cast(
+                    list[tuple[str, float]],
+                    redis_client_sync.zrangebyscore(
+                        DENYLIST_KEY, since - 1, "+inf", withscores=True
+                    ),
+                )
+            except RedisError as e:
+                logger.warning("token_denylist_unavailable", error=str(e))
+                return
+            with self._lock:
+                for member, revoked_at in entries:
+                    jti, _, exp = member.rpartition(":")
+                    self._revoked[jti] = float(exp)
+                    self._synced_until = max(self._synced_until, revoked_at)
+                self._revoked = {
+                    jti: exp for jti, exp in self._revoked.items() if exp > now
+                }
+        finally:
+            self._sync_lock.release()
+
+    @staticmethod
+    def _max_lifetime_seconds() -> float:
+        return 60 * max(
+            settings.ACCESS_TOKEN_EXPIRE_MINUTES, settings.REFRESH_TOKEN_EXPIRE_MINUTES
+        )
+
+
+denylist = TokenDenylist()
+
+
+def claim_refresh_token(jti: str, exp: float) -> bool:
+    """
+    Mark a refresh token as used. True for the first caller only, across all
+    workers: SET NX is atomic, so two concurrent refreshes with the same token
+    cannot both succeed. Rotation does not go through the denylist, which
+    then only holds explicit logouts.
+
+    Without Redis, fall back to revoking it in this process's denylist.
+    """
+    ttl = max(1, math.ceil(exp - time.time()))
+    try:
+        return bool(
+            redis_client_sync.set(f"{REFRESH_USED_PREFIX}{jti}", 1, nx=True, ex=ttl)
+        )
+    except RedisError as e:
+        logger.warning("token_denylist_unavailable", error=str(e))
+    if denylist.is_revoked(jti):
+        return False
+    denylist.revoke(jti, exp)
+    return True
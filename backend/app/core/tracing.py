@@ -0,0 +1,86 @@
+from typing import Any
+
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.db import engine
+
+# Set when OTEL_EXPORTER is "memory", read by the local-only /private/traces route
+memory_exporter: Any = None
+
+
+def setup_tracing(app: FastAPI) -> None:
+    """
+    Configure OpenTelemetry and instrument FastAPI, SQLAlchemy, Redis and
+    boto3. Our own spans (e.g. SMTP in app.utils.send_email) use the plain
+    API and are no-ops when tracing is disabled.
+    """
+    global memory_exporter
+    if not settings.OTEL_ENABLED:
+        return
+
+    # Imported lazily so the SDK and instrumentors cost nothing when disabled
+    from opentelemetry import trace
+    from opentelemetry.instrumentation.botocore import BotocoreInstrumentor
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.redis import RedisInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+    )
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create(
+            {
+                "service.name": settings.OTEL_SERVICE_NAME,
+                "deployment.environment": settings.ENVIRONMENT,
+            }
+        ),
+        # Follow the caller's sampling decision, sample new traces by ratio
+        sampler=ParentBased(TraceIdRatioBased(settings.OTEL_SAMPLE_RATIO)),
+    )
+    if settings.OTEL_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        provider.add_span_processor(
+            BatchSpanProcessor(
+                OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT)
+            )
+        )
+    elif settings.OTEL_EXPORTER == "memory":
+        memory_exporter = InMemorySpanExporter()
+        provider.add_span_processor(SimpleSpanProcessor(memory_exporter))
+    else:
+        provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+    trace.set_tracer_provider(provider)
+
+    FastAPIInstrumentor.instrument_app(
+        app, tracer_provider=provider, excluded_urls="metrics,health-check,ready"
+    )
+    SQLAlchemyInstrumentor().instrument(engine=engine, tracer_provider=provider)
+    RedisInstrumentor().instrument(tracer_provider=provider)
+    BotocoreInstrumentor().instrument(tracer_provider=provider)
+
+
+def flush_tracing() -> None:
+    """
+    Export spans still buffered by the batch processor. The provider itself
+    shuts down at interpreter exit.
+    """
+    if not settings.OTEL_ENABLED:
+        return
+    from opentelemetry import trace
+
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "force_flush"):
+        provider.force_flush()
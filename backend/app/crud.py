@@ -1,10 +1,30 @@
 import uuid
+from datetime import datetime, timedelta
 from typing import Any
 
-from sqlmodel import Session, select
+from sqlalchemy import delete, event, update
+from sqlmodel import Session, and_, col, func, or_, select
 
-from app.core.security import get_password_hash, verify_password
-from app.models import Item, ItemCreate, User, UserCreate, UserUpdate
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password
+from app.models import (
+    Attachment,
+    Comment,
+    DeletionJob,
+    Invitation,
+    Item,
+    ItemCreate,
+    Project,
+    ProjectMember,
+    Section,
+    Task,
+    Tombstone,
+    User,
+    UserCreate,
+    UserUpdate,
+    Workspace,
+    WorkspaceMember,
+)
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -41,14 +61,322 @@ def authenticate(*, session: Session, email: str, password: str) -> User | None:
     db_user = get_user_by_email(session=session, email=email)
     if not db_user:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    verified, new_hash = verify_and_update_password(password, db_user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # Only possible now, while we have the plain password
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        session.commit()
+        session.refresh(db_user)
     return db_user
 
 
+def membership_claims(*, session: Session, user: User) -> dict[str, Any]:
+    """
+    Access token claims with the user's workspace and project roles, or none
+    when the user has more than TOKEN_MEMBERSHIP_CLAIMS_MAX memberships.
+    """
+    # Read before the roles: a concurrent change can then only make the
+    # claims look stale, never make stale roles look current
+    version = user.membership_version
+    max_claims = settings.TOKEN_MEMBERSHIP_CLAIMS_MAX
+    workspaces = session.exec(
+        select(WorkspaceMember.workspace_id, WorkspaceMember.role)
+        .where(WorkspaceMember.user_id == user.id)
+        .limit(max_claims + 1)
+    ).all()
+    projects = session.exec(
+        select(ProjectMember.project_id, ProjectMember.role)
+        .where(ProjectMember.user_id == user.id)
+        .limit(max_claims + 1)
+    ).all()
+    if len(workspaces) + len(projects) > max_claims:
+        return {}
+    return {
+        "mv": version,
+        "ws": {workspace_id.hex: role for workspace_id, role in workspaces},
+        "pj": {project_id.hex: role for project_id, role in projects},
+    }
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_membership_versions(session: Session, *_args: Any) -> None:
+    # Any added, removed or changed membership makes the claims in the
+    # member's existing tokens stale
+    user_ids = {
+        obj.user_id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, WorkspaceMember | ProjectMember)
+        and (obj not in session.dirty or session.is_modified(obj))
+    }
+    if user_ids:
+        session.execute(
+            update(User)
+            .where(col(User.id).in_(user_ids))
+            .values(membership_version=User.membership_version + 1)
+        )
+
+
 def create_item(*, session: Session, item_in: ItemCreate, owner_id: uuid.UUID) -> Item:
     db_item = Item.model_validate(item_in, update={"owner_id": owner_id})
     session.add(db_item)
     session.commit()
     session.refresh(db_item)
     return db_item
+
+
+def create_tombstone(
+    *,
+    session: Session,
+    entity_type: str,
+    entity_id: uuid.UUID,
+    project_id: uuid.UUID | None = None,
+    workspace_id: uuid.UUID | None = None,
+) -> Tombstone:
+    # Added to the caller's session so it commits atomically with the delete
+    tombstone = Tombstone(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        project_id=project_id,
+        workspace_id=workspace_id,
+    )
+    session.add(tombstone)
+    return tombstone
+
+
+def adjust_task_counters(
+    *, session: Session, task_id: uuid.UUID, comments: int = 0, attachments: int = 0
+) -> None:
+    # Incremented in SQL so concurrent requests can't lose updates; the caller commits
+    statement = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(
+            comment_count=Task.comment_count + comments,
+            attachment_count=Task.attachment_count + attachments,
+        )
+    )
+    session.execute(statement)
+
+
+def reconcile_task_counters(*, session: Session) -> int:
+    """
+    Recompute comment_count and attachment_count from the child tables for
+    every task that has drifted. Returns the number of tasks fixed.
+    """
+    comment_count = (
+        select(func.count())
+        .select_from(Comment)
+        .where(Comment.task_id == Task.id)
+        .correlate(Task)
+        .scalar_subquery()
+    )
+    attachment_count = (
+        select(func.count())
+        .select_from(Attachment)
+        .where(Attachment.task_id == Task.id)
+        .correlate(Task)
+        .scalar_subquery()
+    )
+    statement = (
+        update(Task)
+        .where(
+            (Task.comment_count != comment_count)
+            | (Task.attachment_count != attachment_count)
+        )
+        .values(comment_count=comment_count, attachment_count=attachment_count)
+    )
+    result = session.execute(statement)
+    session.commit()
+    return result.rowcount
+
+
+def create_deletion_job(
+    *, session: Session, entity: Workspace | Project, requested_by_id: uuid.UUID
+) -> DeletionJob:
+    """
+    Soft-delete a workspace or project and queue the removal of its rows.
+    A workspace takes its projects with it, each with a tombstone so sync
+    clients drop them. The caller commits.
+    """
+    now = datetime.utcnow()
+    entity.deleted_at = now
+    session.add(entity)
+    if isinstance(entity, Workspace):
+        project_ids = (
+            session.execute(
+                update(Project)
+                .where(col(Project.workspace_id) == entity.id)
+                .where(col(Project.deleted_at).is_(None))
+                .values(deleted_at=now)
+                .returning(col(Project.id))
+            )
+            .scalars()
+            .all()
+        )
+        for project_id in project_ids:
+            create_tombstone(
+                session=session,
+                entity_type="project",
+                entity_id=project_id,
+                project_id=project_id,
+                workspace_id=entity.id,
+            )
+    job = DeletionJob(
+        entity_type="workspace" if isinstance(entity, Workspace) else "project",
+        entity_id=entity.id,
+        requested_by_id=requested_by_id,
+    )
+    session.add(job)
+    return job
+
+
+def _delete_in_batches(
+    session: Session, job: DeletionJob, model: Any, condition: Any, batch_size: int
+) -> None:
+    # Each batch is its own short transaction; comments, attachments and
+    # activity logs go with their task through ON DELETE CASCADE.
+    while True:
+        batch = select(model.id).where(condition).limit(batch_size)
+        result = session.execute(
+            delete(model)
+            .where(col(model.id).in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        job.deleted_rows += result.rowcount
+        job.heartbeat_at = datetime.utcnow()
+        session.add(job)
+        session.commit()
+        if result.rowcount < batch_size:
+            return
+
+
+def _purge_project(
+    session: Session, job: DeletionJob, project_id: uuid.UUID, batch_size: int
+) -> None:
+    _delete_in_batches(session, job, Task, Task.project_id == project_id, batch_size)
+    _delete_in_batches(
+        session, job, Section, Section.project_id == project_id, batch_size
+    )
+    _delete_in_batches(session, job, Project, Project.id == project_id, batch_size)
+
+
+def claim_deletion_job(*, session: Session, job_id: uuid.UUID) -> DeletionJob | None:
+    """
+    Take a job for this process: pending or failed with attempts left, or
+    running but stale (no batch for DELETION_STALE_SECONDS). The conditional
+    UPDATE is atomic, so of several purgers only one gets it; the others get
+    None.
+    """
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=settings.DELETION_STALE_SECONDS)
+    claimed = session.execute(
+        update(DeletionJob)
+        .where(col(DeletionJob.id) == job_id)
+        .where(col(DeletionJob.attempts) < settings.DELETION_MAX_ATTEMPTS)
+        .where(
+            or_(
+                col(DeletionJob.status).in_(["pending", "failed"]),
+                and_(
+                    col(DeletionJob.status) == "running",
+                    or_(
+                        col(DeletionJob.heartbeat_at).is_(None),
+                        col(DeletionJob.heartbeat_at) < stale,
+                    ),
+                ),
+            )
+        )
+        .values(status="running", attempts=DeletionJob.attempts + 1, heartbeat_at=now)
+        .returning(col(DeletionJob.id))
+    ).first()
+    session.commit()
+    if claimed is None:
+        return None
+    job = session.get(DeletionJob, job_id)
+    if job:
+        session.refresh(job)
+    return job
+
+
+def run_deletion_job(
+    *, session: Session, job: DeletionJob, batch_size: int = 1000
+) -> DeletionJob:
+    """
+    Remove the rows of a soft-deleted workspace or project in bounded batches,
+    recording progress (tasks, sections, projects) on the job as it goes.
+    Safe to re-run on a job that was interrupted. Claim the job first
+    (claim_deletion_job) so no other purger runs it at the same time.
+    """
+    if job.entity_type == "workspace":
+        project_ids = list(
+            session.exec(
+                select(Project.id).where(Project.workspace_id == job.entity_id)
+            ).all()
+        )
+    else:
+        project_ids = [job.entity_id]
+
+    job.status = "running"
+    job.total_rows = job.deleted_rows + (
+        len(project_ids)
+        + session.exec(
+            select(func.count())
+            .select_from(Task)
+            .where(col(Task.project_id).in_(project_ids))
+        ).one()
+        + session.exec(
+            select(func.count())
+            .select_from(Section)
+            .where(col(Section.project_id).in_(project_ids))
+        ).one()
+    )
+    session.add(job)
+    session.commit()
+
+    try:
+        for project_id in project_ids:
+            _purge_project(session, job, project_id, batch_size)
+        if job.entity_type == "workspace":
+            # Members and invitations cascade
+            session.execute(delete(Workspace).where(Workspace.id == job.entity_id))
+    except Exception as e:
+        session.rollback()
+        job.status = "failed"
+        job.error = str(e)[:1000]
+    else:
+        job.status = "done"
+    job.finished_at = datetime.utcnow()
+    session.add(job)
+    session.commit()
+    return job
+
+
+def expire_invitations(*, session: Session, batch_size: int = 1000) -> int:
+    """
+    Mark pending invitations past their expiry as expired, batch_size rows
+    per transaction. Returns the number of invitations expired.
+    """
+    # expires_at is naive UTC; now() would be compared in the session's time zone
+    now = datetime.utcnow()
+    expired = 0
+    while True:
+        # Served by the partial index on expires_at WHERE status = 'pending'
+        batch = (
+            select(Invitation.id)
+            .where(Invitation.status == "pending")
+            .where(Invitation.expires_at < now)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = session.execute(
+            update(Invitation)
+            .where(col(Invitation.id).in_(batch.scalar_subquery()))
+            .values(status="expired")
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        expired += result.rowcount
+        if result.rowcount < batch_size:
+            return expired
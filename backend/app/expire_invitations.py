@@ -0,0 +1,47 @@
+"""
+Mark pending invitations past their expires_at as expired, so their
+addresses can be invited again. docker-compose runs it as the
+expire-invitations service; on its own:
+
+    python -m app.expire_invitations
+    python -m app.expire_invitations --every 300
+"""
+
+import argparse
+import logging
+import time
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def sweep() -> int:
+    with Session(engine) as session:
+        return crud.expire_invitations(session=session)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Expire stale pending invitations")
+    parser.add_argument(
+        "--every",
+        type=int,
+        default=None,
+        help="keep running, sweeping every this many seconds (default: run once)",
+    )
+    args = parser.parse_args()
+
+    while True:
+        expired = sweep()
+        logger.info(f"Expired {expired} invitations")
+        if not args.every:
+            break
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Delete attachment blobs that no attachment row references any more.
+
+Attachment rows go away with their task, project or workspace through
+ON DELETE CASCADE, which cannot touch storage, so their files are left
+behind. This walks S3 (attachments/ prefix) and UPLOAD_DIR, checks each
+page of keys against attachment.file_path and deletes the orphans:
+
+    python -m app.gc_attachments --dry-run
+    python -m app.gc_attachments --max-deletes-per-second 500
+"""
+
+import argparse
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlmodel import Session, col, select
+
+from app.api.routes.attachments import UPLOAD_DIR
+from app.core import s3
+from app.core.db import engine
+from app.models import Attachment
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+S3_PREFIX = "attachments/"
+# DeleteObjects takes at most 1000 keys
+BATCH_SIZE = 1000
+
+
+@dataclass
+class GCStats:
+    scanned: int = 0
+    orphaned: int = 0
+    deleted: int = 0
+    failed: int = 0
+
+
+class RateLimiter:
+    """
+    Spread deletes so that at most `rate` happen per second on average.
+    """
+
+    def __init__(self, rate: float | None) -> None:
+        self.rate = rate
+        self.start = time.monotonic()
+        self.done = 0
+
+    def wait(self, count: int) -> None:
+        if self.rate:
+            ahead = self.done / self.rate - (time.monotonic() - self.start)
+            if ahead > 0:
+                time.sleep(ahead)
+        self.done += count
+
+
+def _batches(items: Iterable[str], size: int) -> Iterator[list[str]]:
+    batch: list[str] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _unreferenced(session: Session, keys: list[str]) -> list[str]:
+    referenced = set(
+        session.exec(
+            select(Attachment.file_path).where(col(Attachment.file_path).in_(keys))
+        ).all()
+    )
+    return [key for key in keys if key not in referenced]
+
+
+def _s3_candidates(older_than: datetime) -> Iterator[str]:
+    for obj in s3.list_objects(S3_PREFIX):
+        # Uploads reach S3 before their row is committed; skip recent ones
+        if obj["LastModified"] < older_than:
+            yield obj["Key"]
+
+
+def _local_candidates(older_than: datetime) -> Iterator[str]:
+    if not UPLOAD_DIR.is_dir():
+        return
+    cutoff = older_than.timestamp()
+    with os.scandir(UPLOAD_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                # Same form as the file_path stored by create_attachment
+                yield str(UPLOAD_DIR / entry.name)
+
+
+def _unlink(path: str) -> bool:
+    try:
+        Path(path).unlink(missing_ok=True)
+        return True
+    except OSError as e:
+        logger.error(f"Could not delete {path}: {e}")
+        return False
+
+
+def collect_garbage(
+    *,
+    dry_run: bool = False,
+    min_age: timedelta = timedelta(hours=1),
+    max_deletes_per_second: float | None = None,
+    workers: int = 8,
+) -> dict[str, GCStats]:
+    older_than = datetime.now(timezone.utc) - min_age
+    limiter = RateLimiter(max_deletes_per_second)
+    stats = {"s3": GCStats(), "local": GCStats()}
+
+    with Session(engine) as session, ThreadPoolExecutor(workers) as pool:
+        if s3.get_s3_client():
+            for keys in _batches(_s3_candidates(older_than), BATCH_SIZE):
+                orphans = _unreferenced(session, keys)
+                stats["s3"].scanned += len(keys)
+                stats["s3"].orphaned += len(orphans)
+                if dry_run or not orphans:
+                    continue
+                limiter.wait(len(orphans))
+                failed = s3.delete_files_from_s3(orphans)
+                stats["s3"].deleted += len(orphans) - len(failed)
+                stats["s3"].failed += len(failed)
+
+        for paths in _batches(_local_candidates(older_than), BATCH_SIZE):
+            orphans = _unreferenced(session, paths)
+            stats["local"].scanned += len(paths)
+            stats["local"].orphaned += len(orphans)
+            if dry_run or not orphans:
+                continue
+            limiter.wait(len(orphans))
+            results = list(pool.map(_unlink, orphans))
+            stats["local"].deleted += sum(results)
+            stats["local"].failed += results.count(False)
+
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete orphaned attachment blobs")
+    parser.add_argument("--dry-run", action="store_true", help="only report orphans")
+    parser.add_argument(
+        "--min-age-minutes",
+        type=int,
+        default=60,
+        help="ignore blobs newer than this; uploads may not be committed yet",
+    )
+    parser.add_argument("--max-deletes-per-second", type=float, default=None)
+    parser.add_argument("--workers", type=int, default=8, help="parallel local unlinks")
+    args = parser.parse_args()
+
+    dry_run_note = " (dry run)" if args.dry_run else ""
+    logger.info(f"Collecting orphaned attachment blobs{dry_run_note}")
+    stats = collect_garbage(
+        dry_run=args.dry_run,
+        min_age=timedelta(minutes=args.min_age_minutes),
+        max_deletes_per_second=args.max_deletes_per_second,
+        workers=args.workers,
+    )
+    for store, s in stats.items():
+        logger.info(
+            f"{store}: scanned {s.scanned}, orphaned {s.orphaned}, "
+            f"deleted {s.deleted}, failed {s.failed}"
+        )
+
+
+if __name__ == "__main__":
+    main()
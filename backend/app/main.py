@@ -1,10 +1,16 @@
-import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.api.profiling import ProfilerMiddleware, install_thread_profiling
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.lifespan import lifespan
+from app.core.metrics import MetricsMiddleware, metrics_endpoint
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.slow_queries import SlowQueryMiddleware
+from app.core.tracing import setup_tracing
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -12,14 +18,34 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 
 
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
+    import sentry_sdk
+
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
+if settings.SLOW_QUERY_LOG_ENABLED:
+    app.add_middleware(SlowQueryMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+if settings.PROFILING_ENABLED:
+    install_thread_profiling()
+    app.add_middleware(ProfilerMiddleware)
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # Set all CORS enabled origins
 if settings.all_cors_origins:
     app.add_middleware(
@@ -31,3 +57,5 @@ if settings.all_cors_origins:
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
+
+setup_tracing(app)
@@ -1,8 +1,9 @@
 import uuid
 from typing import Any, Optional
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import EmailStr
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -47,18 +48,31 @@ class UpdatePassword(SQLModel):
 
 # Database model, database table inferred from class name
 class WorkspaceMember(SQLModel, table=True):
-    workspace_id: uuid.UUID = Field(foreign_key="workspace.id", primary_key=True)
+    workspace_id: uuid.UUID = Field(
+        foreign_key="workspace.id", primary_key=True, ondelete="CASCADE"
+    )
     user_id: uuid.UUID = Field(foreign_key="user.id", primary_key=True)
     role: str = Field(default="member")
 
 class ProjectMember(SQLModel, table=True):
-    project_id: uuid.UUID = Field(foreign_key="project.id", primary_key=True)
+    project_id: uuid.UUID = Field(
+        foreign_key="project.id", primary_key=True, ondelete="CASCADE"
+    )
     user_id: uuid.UUID = Field(foreign_key="user.id", primary_key=True)
     role: str = Field(default="viewer")
 
 class User(UserBase, table=True):
+    # Substring search (ILIKE '%q%') on email and full_name is served by
+    # pg_trgm GIN indexes where the extension is available. Migration
+    # 7e1d5a9c3f28 creates them; they are not declared here because they are
+    # optional (see app/alembic/env.py)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
+    # Set by "log out everywhere"; tokens issued before it are rejected
+    tokens_valid_after: datetime | None = Field(default=None)
+    # Bumped whenever a workspace or project membership of the user changes,
+    # so membership claims in older access tokens are known to be stale
+    membership_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     items: list["Item"] = Relationship(back_populates="owner", cascade_delete=True)
     workspaces: list["Workspace"] = Relationship(back_populates="members", link_model=WorkspaceMember)
     projects: list["Project"] = Relationship(back_populates="members", link_model=ProjectMember)
@@ -73,7 +87,10 @@ class UserPublic(UserBase):
 
 class UsersPublic(SQLModel):
     data: list[UserPublic]
-    count: int
+    count: int | None = None
+    has_more: bool = False
+    # Pass as cursor to fetch the next page
+    next_cursor: str | None = None
 
 
 # Shared properties
@@ -131,8 +148,12 @@ class WorkspaceUpdate(WorkspaceBase):
 class Workspace(WorkspaceBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
+    # Set when deletion is requested; the rows are purged in the background
+    deleted_at: datetime | None = Field(default=None)
     members: list[User] = Relationship(back_populates="workspaces", link_model=WorkspaceMember)
-    projects: list["Project"] = Relationship(back_populates="workspace", cascade_delete=True)
+    projects: list["Project"] = Relationship(
+        back_populates="workspace", cascade_delete=True, passive_deletes=True
+    )
 
 
 class WorkspacePublic(WorkspaceBase):
@@ -142,7 +163,8 @@ class WorkspacePublic(WorkspaceBase):
 
 class WorkspacesPublic(SQLModel):
     data: list[WorkspacePublic]
-    count: int
+    count: int | None = None
+    has_more: bool = False
 
 
 
@@ -167,13 +189,21 @@ class ProjectUpdate(ProjectBase):
 
 class Project(ProjectBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    workspace_id: uuid.UUID = Field(foreign_key="workspace.id", nullable=False)
+    workspace_id: uuid.UUID = Field(
+        foreign_key="workspace.id", nullable=False, index=True, ondelete="CASCADE"
+    )
     owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
+    # Set when deletion is requested; the rows are purged in the background
+    deleted_at: datetime | None = Field(default=None)
     
     workspace: Workspace = Relationship(back_populates="projects")
     members: list[User] = Relationship(back_populates="projects", link_model=ProjectMember)
-    tasks: list["Task"] = Relationship(back_populates="project", cascade_delete=True)
-    sections: list["Section"] = Relationship(back_populates="project", cascade_delete=True)
+    tasks: list["Task"] = Relationship(
+        back_populates="project", cascade_delete=True, passive_deletes=True
+    )
+    sections: list["Section"] = Relationship(
+        back_populates="project", cascade_delete=True, passive_deletes=True
+    )
 
 
 class ProjectPublic(ProjectBase):
@@ -207,10 +237,17 @@ class SectionUpdate(SectionBase):
 
 class Section(SectionBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    project_id: uuid.UUID = Field(foreign_key="project.id", nullable=False)
+    project_id: uuid.UUID = Field(
+        foreign_key="project.id", nullable=False, index=True, ondelete="CASCADE"
+    )
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        index=True,
+        sa_column_kwargs={"onupdate": datetime.utcnow},
+    )
     
     project: Project = Relationship(back_populates="sections")
-    tasks: list["Task"] = Relationship(back_populates="section")
+    tasks: list["Task"] = Relationship(back_populates="section", passive_deletes=True)
 
 
 class SectionPublic(SectionBase):
@@ -220,7 +257,8 @@ class SectionPublic(SectionBase):
 
 class SectionsPublic(SQLModel):
     data: list[SectionPublic]
-    count: int
+    count: int | None = None
+    has_more: bool = False
 
 
 class TaskBase(SQLModel):
@@ -228,7 +266,7 @@ class TaskBase(SQLModel):
     description: str | None = Field(default=None, max_length=255)
     status: str = Field(default="todo") # todo, in_progress, done
     priority: str = Field(default="medium") # low, medium, high
-    due_date: str | None = Field(default=None) # ISO string YYYY-MM-DD
+    due_date: date | None = Field(default=None)
 
 
 class TaskCreate(TaskBase):
@@ -245,17 +283,45 @@ class TaskUpdate(TaskBase):
 
 
 class Task(TaskBase, table=True):
+    __table_args__ = (
+        # Range scans for "overdue" / "due this week" views, per assignee or per project
+        Index("ix_task_assignee_id_due_date", "assignee_id", "due_date"),
+        Index("ix_task_project_id_due_date", "project_id", "due_date"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    project_id: uuid.UUID = Field(foreign_key="project.id", nullable=False)
-    section_id: uuid.UUID | None = Field(foreign_key="section.id", default=None, nullable=True)
+    project_id: uuid.UUID = Field(
+        foreign_key="project.id", nullable=False, ondelete="CASCADE"
+    )
+    section_id: uuid.UUID | None = Field(
+        foreign_key="section.id",
+        default=None,
+        nullable=True,
+        index=True,
+        ondelete="SET NULL",
+    )
     owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     assignee_id: uuid.UUID | None = Field(foreign_key="user.id", default=None, nullable=True)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        index=True,
+        sa_column_kwargs={"onupdate": datetime.utcnow},
+    )
+    # Denormalized for task cards, kept in step by crud.adjust_task_counters
+    comment_count: int = Field(default=0)
+    attachment_count: int = Field(default=0)
 
     project: Project = Relationship(back_populates="tasks")
     section: Section | None = Relationship(back_populates="tasks")
-    comments: list["Comment"] = Relationship(back_populates="task", cascade_delete=True)
-    activity_logs: list["ActivityLog"] = Relationship(back_populates="task", cascade_delete=True)
-    attachments: list["Attachment"] = Relationship(back_populates="task", cascade_delete=True)
+    comments: list["Comment"] = Relationship(
+        back_populates="task", cascade_delete=True, passive_deletes=True
+    )
+    activity_logs: list["ActivityLog"] = Relationship(
+        back_populates="task", cascade_delete=True, passive_deletes=True
+    )
+    attachments: list["Attachment"] = Relationship(
+        back_populates="task", cascade_delete=True, passive_deletes=True
+    )
 
     # Optional relationships to owner and assignee
     # owner: User = Relationship(sa_relationship_kwargs={"foreign_keys": "Task.owner_id"})
@@ -268,6 +334,8 @@ class TaskPublic(TaskBase):
     section_id: uuid.UUID | None
     owner_id: uuid.UUID
     assignee_id: uuid.UUID | None
+    comment_count: int = 0
+    attachment_count: int = 0
 
 
 class TasksPublic(SQLModel):
@@ -290,12 +358,21 @@ class CommentUpdate(CommentBase):
 
 class Comment(CommentBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    task_id: uuid.UUID = Field(foreign_key="task.id", nullable=False)
+    task_id: uuid.UUID = Field(
+        foreign_key="task.id", nullable=False, index=True, ondelete="CASCADE"
+    )
     user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        index=True,
+        sa_column_kwargs={"onupdate": datetime.utcnow},
+    )
     
     task: Task = Relationship(back_populates="comments")
-    attachments: list["Attachment"] = Relationship(back_populates="comment", cascade_delete=True)
+    attachments: list["Attachment"] = Relationship(
+        back_populates="comment", cascade_delete=True, passive_deletes=True
+    )
     # user: User = Relationship(sa_relationship_kwargs={"foreign_keys": "Comment.user_id"})
 
 
@@ -309,7 +386,8 @@ class CommentPublic(CommentBase):
 
 class CommentsPublic(SQLModel):
     data: list[CommentPublic]
-    count: int
+    count: int | None = None
+    has_more: bool = False
 
 
 class ActivityLogBase(SQLModel):
@@ -318,7 +396,9 @@ class ActivityLogBase(SQLModel):
 
 class ActivityLog(ActivityLogBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    task_id: uuid.UUID = Field(foreign_key="task.id", nullable=False)
+    task_id: uuid.UUID = Field(
+        foreign_key="task.id", nullable=False, index=True, ondelete="CASCADE"
+    )
     user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -344,8 +424,18 @@ class AttachmentBase(SQLModel):
 
 class Attachment(AttachmentBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    task_id: uuid.UUID = Field(foreign_key="task.id", nullable=False)
-    comment_id: uuid.UUID | None = Field(foreign_key="comment.id", default=None, nullable=True)
+    # Indexed for the orphaned blob sweep in app/gc_attachments.py
+    file_path: str = Field(index=True)
+    task_id: uuid.UUID = Field(
+        foreign_key="task.id", nullable=False, index=True, ondelete="CASCADE"
+    )
+    comment_id: uuid.UUID | None = Field(
+        foreign_key="comment.id",
+        default=None,
+        nullable=True,
+        index=True,
+        ondelete="CASCADE",
+    )
     user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -371,12 +461,30 @@ class InvitationCreate(InvitationBase):
 
 
 class Invitation(InvitationBase, table=True):
+    __table_args__ = (
+        # Only pending invitations are ever looked up by expiry or by address
+        Index(
+            "ix_invitation_pending_expires_at",
+            "expires_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index(
+            "uq_invitation_pending_workspace_id_email",
+            "workspace_id",
+            "email",
+            unique=True,
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     token: str = Field(unique=True, index=True)
     expires_at: datetime
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
-    workspace_id: uuid.UUID = Field(foreign_key="workspace.id", nullable=False)
+    workspace_id: uuid.UUID = Field(
+        foreign_key="workspace.id", nullable=False, index=True, ondelete="CASCADE"
+    )
     inviter_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     
     workspace: Workspace = Relationship()
@@ -391,9 +499,83 @@ class InvitationPublic(InvitationBase):
     created_at: datetime
 
 
+class InvitationBulkCreate(SQLModel):
+    workspace_id: uuid.UUID
+    emails: list[EmailStr] = Field(min_length=1, max_length=1000)
+    role: str = Field(default="member")
+
+
+class InvitationSkipped(SQLModel):
+    email: str
+    reason: str  # already_member, already_invited
+
+
+class InvitationsBulkPublic(SQLModel):
+    data: list[InvitationPublic]
+    skipped: list[InvitationSkipped]
+
+
 class AttachmentsPublic(SQLModel):
     data: list[AttachmentPublic]
-    count: int
+    count: int | None = None
+    has_more: bool = False
+
+
+# Deleted rows, kept so that delta sync can tell clients what to drop.
+# No foreign keys: the referenced rows are gone by the time this is read.
+class Tombstone(SQLModel, table=True):
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    entity_type: str = Field(max_length=50)  # task, section, comment, project
+    entity_id: uuid.UUID
+    project_id: uuid.UUID | None = Field(default=None, index=True)
+    workspace_id: uuid.UUID | None = Field(default=None, index=True)
+    deleted_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+class TombstonePublic(SQLModel):
+    entity_type: str
+    entity_id: uuid.UUID
+    project_id: uuid.UUID | None = None
+    deleted_at: datetime
+
+
+class SyncPublic(SQLModel):
+    tasks: list[TaskPublic]
+    sections: list[SectionPublic]
+    comments: list[CommentPublic]
+    deleted: list[TombstonePublic]
+    next_token: str
+    has_more: bool = False
+
+
+# Background removal of a soft-deleted workspace or project and its children.
+# No foreign keys: the job outlives the rows it deletes.
+class DeletionJob(SQLModel, table=True):
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    entity_type: str = Field(max_length=50)  # workspace, project
+    entity_id: uuid.UUID = Field(index=True)
+    requested_by_id: uuid.UUID
+    status: str = Field(default="pending", max_length=20)  # running, done, failed
+    total_rows: int = 0
+    deleted_rows: int = 0
+    error: str | None = Field(default=None, max_length=1000)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: datetime | None = None
+    # Runs so far, and when the running one last made progress
+    attempts: int = 0
+    heartbeat_at: datetime | None = None
+
+
+class DeletionJobPublic(SQLModel):
+    id: uuid.UUID
+    entity_type: str
+    entity_id: uuid.UUID
+    status: str
+    total_rows: int
+    deleted_rows: int
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
 
 
 # Generic message
@@ -404,12 +586,25 @@ class Message(SQLModel):
 # JSON payload containing access token
 class Token(SQLModel):
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
 
 
+class RefreshToken(SQLModel):
+    refresh_token: str
+
+
 # Contents of JWT token
 class TokenPayload(SQLModel):
     sub: str | None = None
+    jti: str | None = None
+    iat: float | None = None
+    exp: float | None = None
+    type: str | None = None
+    # Membership claims: version, workspace and project roles by id (hex)
+    mv: int | None = None
+    ws: dict[str, str] | None = None
+    pj: dict[str, str] | None = None
 
 
 
@@ -430,10 +625,23 @@ class WorkspaceMembersPublic(SQLModel):
     data: list[WorkspaceMemberPublic]
     count: int
 
+class ProjectMemberPublic(SQLModel):
+    id: uuid.UUID
+    full_name: str | None = None
+    email: EmailStr
+    avatar_url: str | None = None
+    role: str
+    project_id: uuid.UUID
+
+class ProjectMembersPublic(SQLModel):
+    data: list[ProjectMemberPublic]
+    count: int
+
 class TaskPublicWithProject(TaskPublic):
     project_name: str
     project_color: str | None = None
 
 class TasksPublicWithProject(SQLModel):
     data: list[TaskPublicWithProject]
-    count: int
+    count: int | None = None
+    has_more: bool = False
@@ -0,0 +1,78 @@
+"""
+Resume workspace and project deletions whose purge never finished: the
+worker running it died, or it failed. docker-compose runs it as the
+purge-deleted service; on its own:
+
+    python -m app.purge_deleted
+    python -m app.purge_deleted --every 300
+
+A job still being purged by a live worker is left alone (see
+crud.claim_deletion_job), and one that failed DELETION_MAX_ATTEMPTS times
+is given up on.
+"""
+
+import argparse
+import logging
+import time
+
+from sqlmodel import Session, col, select
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.models import DeletionJob
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def resume() -> int:
+    """
+    Run every unfinished job this process can claim. Returns how many ran.
+    """
+    with Session(engine) as session:
+        job_ids = session.exec(
+            select(DeletionJob.id)
+            .where(col(DeletionJob.status).in_(["pending", "running", "failed"]))
+            .where(col(DeletionJob.attempts) < settings.DELETION_MAX_ATTEMPTS)
+            .order_by(col(DeletionJob.created_at))
+        ).all()
+        processed = 0
+        for job_id in job_ids:
+            job = crud.claim_deletion_job(session=session, job_id=job_id)
+            if not job:
+                continue
+            crud.run_deletion_job(
+                session=session, job=job, batch_size=settings.DELETION_BATCH_SIZE
+            )
+            processed += 1
+            logger.info(
+                f"{job.entity_type} {job.entity_id}: {job.status} "
+                f"(attempt {job.attempts}), {job.deleted_rows}/{job.total_rows} rows"
+            )
+        return processed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Resume unfinished workspace and project deletions"
+    )
+    parser.add_argument(
+        "--every",
+        type=int,
+        default=None,
+        help="keep running, resuming every this many seconds (default: run once)",
+    )
+    args = parser.parse_args()
+
+    while True:
+        logger.info("Resuming unfinished workspace/project deletions")
+        count = resume()
+        logger.info(f"Processed {count} deletion jobs")
+        if not args.every:
+            break
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import logging
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def repair() -> int:
+    with Session(engine) as session:
+        return crud.reconcile_task_counters(session=session)
+
+
+def main() -> None:
+    logger.info("Reconciling task comment/attachment counters")
+    fixed = repair()
+    logger.info(f"Fixed counters on {fixed} tasks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Run the API with uvicorn, configured from settings (SERVER_*):
+
+    python -m app.server
+
+Workers default to the CPUs available to the container. A worker that has
+served SERVER_MAX_REQUESTS requests (plus a random jitter, so they don't
+all restart at once) exits and the supervisor starts a fresh one, which
+bounds slow memory leaks.
+
+Workers write Prometheus samples to PROMETHEUS_MULTIPROC_DIR. The
+launcher empties it before starting them, so /metrics does not keep
+adding up the files of earlier runs.
+"""
+
+import logging
+import math
+import os
+import random
+from pathlib import Path
+from socket import socket
+
+import uvicorn
+from prometheus_client import multiprocess
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may use: its affinity mask, further limited by a
+    cgroup v2 CPU quota (docker --cpus, Kubernetes limits) if there is one.
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else 0
+    cpus = cpus or os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+
+
+def clear_metrics_dir() -> None:
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not metrics_dir:
+        return
+    for path in Path(metrics_dir).glob("*.db"):
+        path.unlink()
+
+
+class Supervisor(Multiprocess):
+    def keep_subprocess_alive(self) -> None:
+        pids = {process.pid for process in self.processes}
+        super().keep_subprocess_alive()
+        # Workers that died without shutting down (crash, OOM kill) leave their
+        # live gauges behind; workers that did shut down have removed them
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            for pid in pids - {process.pid for process in self.processes}:
+                if pid is not None:
+                    multiprocess.mark_process_dead(pid)  # type: ignore[no-untyped-call]
+
+
+class Server(uvicorn.Server):
+    def run(self, sockets: list[socket] | None = None) -> None:
+        # Called in each worker process, so every worker gets its own limit
+        if self.config.limit_max_requests and settings.SERVER_MAX_REQUESTS_JITTER:
+            self.config.limit_max_requests += random.randint(
+                0, settings.SERVER_MAX_REQUESTS_JITTER
+            )
+        super().run(sockets)
+
+
+def get_config() -> uvicorn.Config:
+    return uvicorn.Config(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=settings.SERVER_WORKERS or available_cpus(),
+        loop=settings.SERVER_LOOP,
+        http=settings.SERVER_HTTP,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE_TIMEOUT,
+        backlog=settings.SERVER_BACKLOG,
+        limit_max_requests=settings.SERVER_MAX_REQUESTS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+    )
+
+
+def main() -> None:
+    clear_metrics_dir()
+    config = get_config()
+    server = Server(config)
+    logger.info(
+        f"Starting {config.workers} worker(s), loop={config.loop}, http={config.http}"
+    )
+    if config.workers > 1:
+        sock = config.bind_socket()
+        Supervisor(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,26 @@
+import functools
 import logging
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 # import emails  # type: ignore
 import jwt
-from jinja2 import Template
 from jwt.exceptions import InvalidTokenError
+from opentelemetry import trace
 
 from app.core import security
 from app.core.config import settings
+from app.core.metrics import EMAIL_SEND_DURATION, EMAIL_SEND_FAILURES
+
+if TYPE_CHECKING:
+    from jinja2 import Template
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 
 @dataclass
@@ -25,14 +29,31 @@ class EmailData:
     subject: str
 
 
+EMAIL_TEMPLATES_DIR = Path(__file__).parent / "email-templates" / "build"
+
+
+@functools.cache
+def _load_email_template(template_name: str) -> "Template":
+    # jinja2, smtplib and email are imported on first use, not at startup
+    from jinja2 import Template
+
+    return Template((EMAIL_TEMPLATES_DIR / template_name).read_text())
+
+
+def preload_email_templates() -> None:
+    """
+    Read and compile every email template ahead of the first email.
+    """
+    for path in EMAIL_TEMPLATES_DIR.glob("*.html"):
+        _load_email_template(path.name)
+
+
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (
-        Path(__file__).parent / "email-templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
+    html_content = _load_email_template(template_name).render(context)
     return html_content
 
 
+@tracer.start_as_current_span("smtp.send_email")
 def send_email(
     *,
     email_to: str,
@@ -40,6 +61,9 @@ def send_email(
     html_content: str = "",
 ) -> None:
     assert settings.emails_enabled, "no provided configuration for email variables"
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
     
     # OLD ERROR-PRONE CODE (COMMENTED OUT)
     # message = emails.Message(
@@ -59,6 +83,7 @@ def send_email(
     # logger.info(f"send email result: {response}")
 
     # NEW IMPLEMENTATION USING SMTPLIB
+    start = time.perf_counter()
     try:
         logger.info(f"Preparing to send email to {email_to}")
         logger.info(f"SMTP Config: Host={settings.SMTP_HOST}, Port={settings.SMTP_PORT}, TLS={settings.SMTP_TLS}, User={settings.SMTP_USER}")
@@ -89,9 +114,68 @@ def send_email(
             logger.info("Email sent successfully")
             
     except Exception as e:
+        EMAIL_SEND_FAILURES.inc()
+        span = trace.get_current_span()
+        span.record_exception(e)
+        span.set_status(trace.StatusCode.ERROR)
         logger.error(f"Failed to send email: {e}")
         import traceback
         logger.error(traceback.format_exc())
+    finally:
+        EMAIL_SEND_DURATION.observe(time.perf_counter() - start)
+
+
+@tracer.start_as_current_span("smtp.send_emails")
+def send_emails(*, messages: list[tuple[str, EmailData]]) -> int:
+    """
+    Send many emails, reusing one SMTP connection per EMAILS_BATCH_SIZE
+    messages. Returns the number sent; failures are logged and counted.
+    """
+    assert settings.emails_enabled, "no provided configuration for email variables"
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
+    sent = 0
+    batch_size = settings.EMAILS_BATCH_SIZE
+    for start_index in range(0, len(messages), batch_size):
+        batch = messages[start_index : start_index + batch_size]
+        # Messages sent or refused, and already counted either way
+        settled = 0
+        try:
+            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
+                server.ehlo()
+                if settings.SMTP_TLS:
+                    server.starttls()
+                    server.ehlo()
+                if settings.SMTP_USER and settings.SMTP_PASSWORD:
+                    server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+                for email_to, email_data in batch:
+                    start = time.perf_counter()
+                    msg = MIMEMultipart()
+                    msg['From'] = f"{settings.EMAILS_FROM_NAME} <{settings.EMAILS_FROM_EMAIL}>"
+                    msg['To'] = email_to
+                    msg['Subject'] = email_data.subject
+                    msg.attach(MIMEText(email_data.html_content, 'html'))
+                    try:
+                        server.send_message(msg)
+                        sent += 1
+                    except smtplib.SMTPRecipientsRefused as e:
+                        EMAIL_SEND_FAILURES.inc()
+                        logger.error(f"Failed to send email to {email_to}: {e}")
+                    finally:
+                        EMAIL_SEND_DURATION.observe(time.perf_counter() - start)
+                    settled += 1
+        except Exception as e:
+            # The connection is gone; the message in flight and the rest of
+            # the batch failed
+            EMAIL_SEND_FAILURES.inc(len(batch) - settled)
+            span = trace.get_current_span()
+            span.record_exception(e)
+            span.set_status(trace.StatusCode.ERROR)
+            logger.error(f"Failed to send email batch: {e}")
+    logger.info(f"Sent {sent} of {len(messages)} emails")
+    return sent
 
 
 def generate_test_email(email_to: str) -> EmailData:
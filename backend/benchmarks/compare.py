@@ -0,0 +1,45 @@
+"""
+Compare two load benchmark result files, e.g. before and after a change:
+
+    python benchmarks/compare.py results/base.json results/head.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+
+def pct(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two load benchmark results")
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    args = parser.parse_args()
+
+    before = json.loads(args.before.read_text())
+    after = json.loads(args.after.read_text())
+    if before["shape"] != after["shape"]:
+        print("warning: results were taken on different tenant shapes")  # noqa: T201
+
+    print(f"{before['commit']} -> {after['commit']}")  # noqa: T201
+    print(f"{'endpoint':<22}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}")  # noqa: T201
+    for name in sorted(set(before["endpoints"]) | set(after["endpoints"])):
+        b = before["endpoints"].get(name)
+        a = after["endpoints"].get(name)
+        if not a or not b:
+            print(f"{name:<22}{'only in ' + ('before' if b else 'after'):>40}")  # noqa: T201
+            continue
+        print(  # noqa: T201
+            f"{name:<22}{pct(b['rps'], a['rps']):>10}{pct(b['p50_ms'], a['p50_ms']):>10}"
+            f"{pct(b['p95_ms'], a['p95_ms']):>10}{pct(b['p99_ms'], a['p99_ms']):>10}"
+        )
+    print(f"{'total':<22}{pct(before['total_rps'], after['total_rps']):>10}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
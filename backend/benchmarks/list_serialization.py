@@ -0,0 +1,126 @@
+"""
+Per-row cost of building and serializing a GET /tasks/ page.
+
+Compares the old path (ORM entities -> model_dump -> TaskPublicWithProject(**d)
+-> response_model validation -> JSONResponse) with the projected path (plain
+column rows -> dict -> validated and dumped by pydantic-core, see
+app.api.fieldsets.list_response). No database is needed: the rows are built
+in memory so only the Python-side overhead is measured.
+
+    python benchmarks/list_serialization.py --rows 1000 --repeat 20
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+from collections import namedtuple
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.api.fieldsets import list_response
+from app.api.routes.tasks import TASK_LIST_COLUMNS
+from app.models import Project, Task, TaskPublicWithProject, TasksPublicWithProject
+
+
+def make_entities(n: int) -> list[tuple[Task, Project]]:
+    project = Project(
+        id=uuid.uuid4(),
+        name="Benchmark Project",
+        color="#336699",
+        workspace_id=uuid.uuid4(),
+        owner_id=uuid.uuid4(),
+    )
+    return [
+        (
+            Task(
+                id=uuid.uuid4(),
+                title=f"Task {i}",
+                description="Lorem ipsum dolor sit amet " * 4,
+                status="todo",
+                priority="medium",
+                due_date=date(2030, 1, 1 + i % 28),
+                project_id=project.id,
+                owner_id=project.owner_id,
+                assignee_id=project.owner_id,
+                updated_at=datetime.utcnow(),
+            ),
+            project,
+        )
+        for i in range(n)
+    ]
+
+
+def make_rows(entities: list[tuple[Task, Project]]) -> list[Any]:
+    # namedtuple exposes the same _asdict() as SQLAlchemy's Row
+    Row = namedtuple("Row", [c.key for c in TASK_LIST_COLUMNS])  # type: ignore[misc]
+    return [
+        Row(
+            *(getattr(task, name) for name in Row._fields[:-2]),
+            project.name,
+            project.color,
+        )
+        for task, project in entities
+    ]
+
+
+def old_path(entities: list[tuple[Task, Project]]) -> bytes:
+    tasks_data = []
+    for task, project in entities:
+        task_dict = task.model_dump()
+        task_dict["project_name"] = project.name
+        task_dict["project_color"] = project.color
+        tasks_data.append(TaskPublicWithProject(**task_dict))
+    result = TasksPublicWithProject(data=tasks_data, count=len(tasks_data))
+    # What FastAPI does with a model returned under response_model
+    adapter = TypeAdapter(TasksPublicWithProject)
+    validated = adapter.validate_python(result.model_dump())
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def new_path(rows: list[Any]) -> bytes:
+    response = list_response(
+        TasksPublicWithProject, rows, None, count=len(rows), has_more=False
+    )
+    return bytes(response.body)
+
+
+def measure(fn: Any, arg: Any, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    entities = make_entities(args.rows)
+    rows = make_rows(entities)
+    assert (
+        json.loads(old_path(entities[:1]))["data"]
+        == json.loads(new_path(rows[:1]))["data"]
+    ), "both paths must produce the same payload"
+
+    old = measure(old_path, entities, args.repeat)
+    new = measure(new_path, rows, args.repeat)
+    print(f"rows per page: {args.rows}")  # noqa: T201
+    print(f"before: {old * 1e3:8.2f} ms/page {old / args.rows * 1e6:8.2f} us/row")  # noqa: T201
+    print(f"after:  {new * 1e3:8.2f} ms/page {new / args.rows * 1e6:8.2f} us/row")  # noqa: T201
+    print(f"speedup: {old / new:.1f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
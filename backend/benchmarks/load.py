@@ -0,0 +1,287 @@
+"""
+Drive concurrent scripted scenarios against a running API and report
+per-endpoint latency percentiles and throughput.
+
+Scenarios (weights are configurable with --mix):
+
+* board_open: project, its sections and its tasks
+* task_update: read a task, change its status
+* comment_thread: list a task's comments, post a reply
+* project_listing: list workspaces and projects
+
+Seed a tenant with benchmarks/seed.py first, start the API, then:
+
+    python benchmarks/load.py --base-url http://localhost:8000 \\
+        --concurrency 32 --duration 60
+
+Results are written to benchmarks/results/<timestamp>-<commit>.json and can
+be compared with benchmarks/compare.py.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+RESULTS_DIR = Path(__file__).parent / "results"
+MANIFEST_PATH = RESULTS_DIR / "manifest.json"
+API = "/api/v1"
+DEFAULT_MIX = "board_open=4,task_update=2,comment_thread=2,project_listing=1"
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def request(
+        self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs: Any
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+            return None
+        return response.json()
+
+
+async def board_open(
+    client: httpx.AsyncClient, rec: Recorder, ctx: dict[str, Any]
+) -> None:
+    project_id = ctx["rng"].choice(ctx["projects"])
+    await rec.request(
+        client, "GET /projects/{id}", "GET", f"{API}/projects/{project_id}"
+    )
+    await rec.request(
+        client,
+        "GET /sections/",
+        "GET",
+        f"{API}/sections/",
+        params={"project_id": project_id},
+    )
+    await rec.request(
+        client, "GET /tasks/", "GET", f"{API}/tasks/", params={"project_id": project_id}
+    )
+
+
+async def task_update(
+    client: httpx.AsyncClient, rec: Recorder, ctx: dict[str, Any]
+) -> None:
+    task_id = ctx["rng"].choice(ctx["tasks"][ctx["rng"].choice(ctx["projects"])])
+    await rec.request(client, "GET /tasks/{id}", "GET", f"{API}/tasks/{task_id}")
+    await rec.request(
+        client,
+        "PUT /tasks/{id}",
+        "PUT",
+        f"{API}/tasks/{task_id}",
+        json={"status": ctx["rng"].choice(["todo", "in_progress", "done"])},
+    )
+
+
+async def comment_thread(
+    client: httpx.AsyncClient, rec: Recorder, ctx: dict[str, Any]
+) -> None:
+    task_id = ctx["rng"].choice(ctx["tasks"][ctx["rng"].choice(ctx["projects"])])
+    await rec.request(
+        client, "GET /comments/", "GET", f"{API}/comments/", params={"task_id": task_id}
+    )
+    await rec.request(
+        client,
+        "POST /comments/",
+        "POST",
+        f"{API}/comments/",
+        json={"task_id": task_id, "content": "load test reply"},
+    )
+
+
+async def project_listing(
+    client: httpx.AsyncClient, rec: Recorder, ctx: dict[str, Any]
+) -> None:
+    await rec.request(client, "GET /workspaces/", "GET", f"{API}/workspaces/")
+    await rec.request(
+        client,
+        "GET /projects/",
+        "GET",
+        f"{API}/projects/",
+        params={"workspace_id": ctx["rng"].choice(ctx["workspaces"])},
+    )
+
+
+SCENARIOS = {
+    "board_open": board_open,
+    "task_update": task_update,
+    "comment_thread": comment_thread,
+    "project_listing": project_listing,
+}
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(
+                f"Unknown scenario {name!r}, choose from {list(SCENARIOS)}"
+            )
+        weights[name] = int(weight or 1)
+    return weights
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    r = await client.post(
+        f"{API}/login/access-token", data={"username": email, "password": password}
+    )
+    r.raise_for_status()
+    return str(r.json()["access_token"])
+
+
+async def worker(
+    base_url: str,
+    token: str,
+    rec: Recorder,
+    manifest: dict[str, Any],
+    weights: dict[str, int],
+    deadline: float,
+    seed: int,
+) -> None:
+    ctx = {**manifest, "rng": random.Random(seed)}
+    names, counts = list(weights), list(weights.values())
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(
+        base_url=base_url, headers=headers, timeout=30
+    ) as client:
+        while time.perf_counter() < deadline:
+            scenario = ctx["rng"].choices(names, counts)[0]
+            await SCENARIOS[scenario](client, rec, ctx)
+
+
+def summarize(rec: Recorder, elapsed: float) -> dict[str, Any]:
+    endpoints = {}
+    for name in sorted(set(rec.latencies) | set(rec.errors)):
+        samples = sorted(rec.latencies[name])
+        if len(samples) >= 2:
+            q = statistics.quantiles(samples, n=100, method="inclusive")
+            p50, p95, p99 = q[49], q[94], q[98]
+        else:
+            p50 = p95 = p99 = samples[0] if samples else 0.0
+        endpoints[name] = {
+            "requests": len(samples),
+            "errors": rec.errors[name],
+            "rps": round(len(samples) / elapsed, 2),
+            "p50_ms": round(p50 * 1e3, 2),
+            "p95_ms": round(p95 * 1e3, 2),
+            "p99_ms": round(p99 * 1e3, 2),
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "total_requests": total,
+        "total_rps": round(total / elapsed, 2),
+        "endpoints": endpoints,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    manifest = json.loads(args.manifest.read_text())
+    weights = parse_mix(args.mix)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        users = manifest["users"][: args.users]
+        tokens = await asyncio.gather(
+            *(login(client, email, manifest["password"]) for email in users)
+        )
+
+    rec = Recorder()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(
+        *(
+            worker(
+                args.base_url,
+                tokens[i % len(tokens)],
+                rec,
+                manifest,
+                weights,
+                deadline,
+                args.seed + i,
+            )
+            for i in range(args.concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    return {
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 2),
+        "mix": weights,
+        "shape": manifest["shape"],
+        **summarize(rec, elapsed),
+    }
+
+
+def print_report(result: dict[str, Any]) -> None:
+    print(  # noqa: T201
+        f"{'endpoint':<22}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    )
+    for name, e in result["endpoints"].items():
+        print(  # noqa: T201
+            f"{name:<22}{e['requests']:>8}{e['errors']:>6}{e['rps']:>9}"
+            f"{e['p50_ms']:>9}{e['p95_ms']:>9}{e['p99_ms']:>9}"
+        )
+    print(f"total: {result['total_requests']} requests, {result['total_rps']} rps")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run API load scenarios")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument(
+        "--users", type=int, default=10, help="distinct users to log in"
+    )
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--manifest", type=Path, default=MANIFEST_PATH)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print_report(result)
+
+    output = args.output or RESULTS_DIR / (
+        f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{result['commit']}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"Results saved to {output}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
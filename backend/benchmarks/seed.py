@@ -0,0 +1,216 @@
+"""
+Seed a synthetic tenant for load benchmarks.
+
+Shape: workspaces x projects x sections x tasks x comments, with a pool of
+member users that belong to every workspace and project. Rows are bulk
+inserted straight into Postgres, and the projects cache in Redis is cleared
+so every run starts cold. A manifest with the users and ids the load driver
+needs is written next to the results.
+
+Seed into an empty database:
+
+    python benchmarks/seed.py --workspaces 2 --projects 5 --sections 4 \\
+        --tasks 50 --comments 5 --members 20
+"""
+
+import argparse
+import json
+import random
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+from app.core.db import engine
+from app.core.redis_client import redis_client_sync
+from app.core.security import get_password_hash
+from app.models import (
+    Comment,
+    Project,
+    ProjectMember,
+    Section,
+    Task,
+    User,
+    Workspace,
+    WorkspaceMember,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+MANIFEST_PATH = RESULTS_DIR / "manifest.json"
+BENCH_PASSWORD = "bench-password"
+BATCH_SIZE = 5000
+
+
+def bulk_insert(
+    session: Session, model: type[SQLModel], rows: list[dict[str, Any]]
+) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        session.execute(insert(model), rows[start : start + BATCH_SIZE])
+
+
+def seed(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    run_id = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+    # One bcrypt hash shared by every bench user keeps seeding fast
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    now = datetime.utcnow()
+
+    users = [
+        {
+            "id": uuid.UUID(int=rng.getrandbits(128)),
+            "email": f"bench-{run_id}-{i}@example.com",
+            "full_name": f"Bench User {i}",
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "is_superuser": False,
+        }
+        for i in range(args.members)
+    ]
+    owner_id = users[0]["id"]
+
+    workspaces, workspace_members = [], []
+    projects, project_members = [], []
+    sections, tasks, comments = [], [], []
+    for w in range(args.workspaces):
+        workspace_id = uuid.UUID(int=rng.getrandbits(128))
+        workspaces.append(
+            {"id": workspace_id, "name": f"Bench {run_id} {w}", "owner_id": owner_id}
+        )
+        workspace_members += [
+            {
+                "workspace_id": workspace_id,
+                "user_id": u["id"],
+                "role": "owner" if u["id"] == owner_id else "member",
+            }
+            for u in users
+        ]
+        for p in range(args.projects):
+            project_id = uuid.UUID(int=rng.getrandbits(128))
+            projects.append(
+                {
+                    "id": project_id,
+                    "name": f"Project {w}.{p}",
+                    "color": "#336699",
+                    "is_private": False,
+                    "workspace_id": workspace_id,
+                    "owner_id": owner_id,
+                }
+            )
+            project_members += [
+                {
+                    "project_id": project_id,
+                    "user_id": u["id"],
+                    "role": "owner" if u["id"] == owner_id else "member",
+                }
+                for u in users
+            ]
+            for s in range(args.sections):
+                section_id = uuid.UUID(int=rng.getrandbits(128))
+                sections.append(
+                    {
+                        "id": section_id,
+                        "title": f"Section {s}",
+                        "order": float(s),
+                        "project_id": project_id,
+                        "updated_at": now,
+                    }
+                )
+                for t in range(args.tasks):
+                    task_id = uuid.UUID(int=rng.getrandbits(128))
+                    assignee = rng.choice(users)["id"]
+                    tasks.append(
+                        {
+                            "id": task_id,
+                            "title": f"Task {s}.{t}",
+                            "description": "Seeded by benchmarks/seed.py",
+                            "status": rng.choice(["todo", "in_progress", "done"]),
+                            "priority": rng.choice(["low", "medium", "high"]),
+                            "due_date": date.today()
+                            + timedelta(days=rng.randint(-30, 60)),
+                            "project_id": project_id,
+                            "section_id": section_id,
+                            "owner_id": owner_id,
+                            "assignee_id": assignee,
+                            "updated_at": now,
+                            "comment_count": args.comments,
+                            "attachment_count": 0,
+                        }
+                    )
+                    comments += [
+                        {
+                            "id": uuid.UUID(int=rng.getrandbits(128)),
+                            "content": f"Comment {c} on task {s}.{t}",
+                            "task_id": task_id,
+                            "user_id": rng.choice(users)["id"],
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for c in range(args.comments)
+                    ]
+
+    with Session(engine) as session:
+        bulk_insert(session, User, users)
+        bulk_insert(session, Workspace, workspaces)
+        bulk_insert(session, WorkspaceMember, workspace_members)
+        bulk_insert(session, Project, projects)
+        bulk_insert(session, ProjectMember, project_members)
+        bulk_insert(session, Section, sections)
+        bulk_insert(session, Task, tasks)
+        bulk_insert(session, Comment, comments)
+        session.commit()
+
+    try:
+        for key in redis_client_sync.scan_iter("projects:*"):
+            redis_client_sync.delete(key)
+    except Exception:
+        # Redis is only a cache; a warm cache just makes the first run faster
+        pass
+
+    # A sample of task ids per project is enough for the update/comment scenarios
+    task_sample: dict[str, list[str]] = {str(p["id"]): [] for p in projects}
+    for t in tasks:
+        sample = task_sample[str(t["project_id"])]
+        if len(sample) < 200:
+            sample.append(str(t["id"]))
+
+    return {
+        "run_id": run_id,
+        "shape": {
+            "workspaces": args.workspaces,
+            "projects": args.projects,
+            "sections": args.sections,
+            "tasks": args.tasks,
+            "comments": args.comments,
+            "members": args.members,
+        },
+        "password": BENCH_PASSWORD,
+        "users": [u["email"] for u in users],
+        "workspaces": [str(w["id"]) for w in workspaces],
+        "projects": [str(p["id"]) for p in projects],
+        "tasks": task_sample,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a benchmark tenant")
+    parser.add_argument("--workspaces", type=int, default=2)
+    parser.add_argument("--projects", type=int, default=5, help="per workspace")
+    parser.add_argument("--sections", type=int, default=4, help="per project")
+    parser.add_argument("--tasks", type=int, default=50, help="per section")
+    parser.add_argument("--comments", type=int, default=5, help="per task")
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--manifest", type=Path, default=MANIFEST_PATH)
+    args = parser.parse_args()
+
+    manifest = seed(args)
+    args.manifest.parent.mkdir(parents=True, exist_ok=True)
+    args.manifest.write_text(json.dumps(manifest, indent=2))
+    print(f"Seeded tenant {manifest['run_id']}, manifest at {args.manifest}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.models import Task
+
+
+def create_task(client: TestClient, headers: dict) -> dict:
+    ws = client.post(
+        f"{settings.API_V1_STR}/workspaces/",
+        headers=headers,
+        json={"name": "Comment Workspace"},
+    ).json()
+    proj = client.post(
+        f"{settings.API_V1_STR}/projects/",
+        headers=headers,
+        json={"name": "Comment Project", "workspace_id": ws["id"]},
+    ).json()
+    response = client.post(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        json={"title": "Comment Task", "project_id": proj["id"]},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_comment_count_tracks_create_and_delete(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    task = create_task(client, superuser_token_headers)
+    assert task["comment_count"] == 0
+
+    comment = client.post(
+        f"{settings.API_V1_STR}/comments/",
+        headers=superuser_token_headers,
+        json={"content": "First", "task_id": task["id"]},
+    ).json()
+    client.post(
+        f"{settings.API_V1_STR}/comments/",
+        headers=superuser_token_headers,
+        json={"content": "Second", "task_id": task["id"]},
+    )
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/{task['id']}", headers=superuser_token_headers
+    )
+    assert r.json()["comment_count"] == 2
+
+    client.delete(
+        f"{settings.API_V1_STR}/comments/{comment['id']}",
+        headers=superuser_token_headers,
+    )
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/{task['id']}", headers=superuser_token_headers
+    )
+    assert r.json()["comment_count"] == 1
+
+
+def test_reconcile_task_counters(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    task = create_task(client, superuser_token_headers)
+    client.post(
+        f"{settings.API_V1_STR}/comments/",
+        headers=superuser_token_headers,
+        json={"content": "Drift", "task_id": task["id"]},
+    )
+    db_task = db.get(Task, task["id"])
+    assert db_task
+    db_task.comment_count = 42
+    db.add(db_task)
+    db.commit()
+
+    assert crud.reconcile_task_counters(session=db) >= 1
+    db.refresh(db_task)
+    assert db_task.comment_count == 1
+
+
+def test_read_comments(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    task = create_task(client, superuser_token_headers)
+    client.post(
+        f"{settings.API_V1_STR}/comments/",
+        headers=superuser_token_headers,
+        json={"content": "Listed", "task_id": task["id"]},
+    )
+
+    r = client.get(
+        f"{settings.API_V1_STR}/comments/",
+        headers=superuser_token_headers,
+        params={"task_id": task["id"]},
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 1
+    comment = content["data"][0]
+    assert comment["content"] == "Listed"
+    assert comment["task_id"] == task["id"]
+    assert comment["user_full_name"] == settings.FIRST_SUPERUSER
@@ -0,0 +1,61 @@
+import gzip
+from collections.abc import Callable
+
+import brotli
+import pytest
+import zstandard
+from fastapi.testclient import TestClient
+
+from app.core.compression import negotiate
+from app.core.config import settings
+
+OPENAPI_URL = f"{settings.API_V1_STR}/openapi.json"
+
+
+def _raw_get(
+    client: TestClient, url: str, accept_encoding: str
+) -> tuple[dict[str, str], bytes]:
+    with client.stream("GET", url, headers={"Accept-Encoding": accept_encoding}) as r:
+        assert r.status_code == 200
+        return dict(r.headers), b"".join(r.iter_raw())
+
+
+def test_negotiate() -> None:
+    encodings = ["zstd", "br", "gzip"]
+    assert negotiate("gzip, deflate, br, zstd", encodings) == "zstd"
+    assert negotiate("gzip, br;q=0.5", encodings) == "gzip"
+    assert negotiate("br, zstd;q=0", encodings) == "br"
+    assert negotiate("*", encodings) == "zstd"
+    assert negotiate("*, zstd;q=0", encodings) == "br"
+    assert negotiate("identity", encodings) is None
+    assert negotiate("", encodings) is None
+
+
+@pytest.mark.parametrize(
+    ("encoding", "decompress"),
+    [
+        ("gzip", gzip.decompress),
+        ("br", brotli.decompress),
+        (
+            "zstd",
+            lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+        ),
+    ],
+)
+def test_large_json_is_compressed(
+    client: TestClient, encoding: str, decompress: Callable[[bytes], bytes]
+) -> None:
+    _, identity = _raw_get(client, OPENAPI_URL, "identity")
+    headers, body = _raw_get(client, OPENAPI_URL, encoding)
+    assert headers["content-encoding"] == encoding
+    assert "Accept-Encoding" in headers["vary"]
+    assert int(headers["content-length"]) == len(body) < len(identity)
+    assert decompress(body) == identity
+
+
+def test_small_response_is_not_compressed(client: TestClient) -> None:
+    headers, body = _raw_get(
+        client, f"{settings.API_V1_STR}/utils/health-check/", "gzip"
+    )
+    assert "content-encoding" not in headers
+    assert body == b"true"
@@ -0,0 +1,150 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.models import Invitation, Workspace
+from tests.utils.utils import assert_query_budget, random_email
+
+
+def test_create_invitations_bulk(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    workspace = client.post(
+        f"{settings.API_V1_STR}/workspaces/",
+        headers=superuser_token_headers,
+        json={"name": "Bulk Invite Workspace"},
+    ).json()
+    emails = [random_email() for _ in range(20)]
+    data = {
+        "workspace_id": workspace["id"],
+        # A duplicate and the inviter, who is already a member, in other cases
+        "emails": [*emails, emails[0].upper(), settings.FIRST_SUPERUSER.upper()],
+    }
+
+    r = client.post(
+        f"{settings.API_V1_STR}/invitations/bulk",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert sorted(i["email"] for i in content["data"]) == sorted(emails)
+    assert content["skipped"] == [
+        {"email": settings.FIRST_SUPERUSER, "reason": "already_member"}
+    ]
+    # Independent of the number of emails
+    assert_query_budget(r, max_queries=8)
+
+    r = client.post(
+        f"{settings.API_V1_STR}/invitations/bulk",
+        headers=superuser_token_headers,
+        json={"workspace_id": workspace["id"], "emails": emails[:3]},
+    )
+    assert r.status_code == 200
+    assert r.json()["data"] == []
+    assert {s["reason"] for s in r.json()["skipped"]} == {"already_invited"}
+
+
+def test_create_invitations_bulk_not_member(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    workspace = client.post(
+        f"{settings.API_V1_STR}/workspaces/",
+        headers=superuser_token_headers,
+        json={"name": "Bulk Invite Private Workspace"},
+    ).json()
+    r = client.post(
+        f"{settings.API_V1_STR}/invitations/bulk",
+        headers=normal_user_token_headers,
+        json={"workspace_id": workspace["id"], "emails": [random_email()]},
+    )
+    assert r.status_code == 403
+
+
+def test_expire_invitations(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    workspace = client.post(
+        f"{settings.API_V1_STR}/workspaces/",
+        headers=superuser_token_headers,
+        json={"name": "Expiring Invite Workspace"},
+    ).json()
+    email = random_email()
+    r = client.post(
+        f"{settings.API_V1_STR}/invitations/bulk",
+        headers=superuser_token_headers,
+        json={"workspace_id": workspace["id"], "emails": [email]},
+    )
+    invitation = db.get(Invitation, uuid.UUID(r.json()["data"][0]["id"]))
+    assert invitation
+    invitation.expires_at = datetime.utcnow() - timedelta(days=1)
+    db.add(invitation)
+    db.commit()
+
+    assert crud.expire_invitations(session=db, batch_size=1) >= 1
+    db.refresh(invitation)
+    assert invitation.status == "expired"
+
+    # Compared in UTC whatever the session's time zone (here UTC+14)
+    r = client.post(
+        f"{settings.API_V1_STR}/invitations/bulk",
+        headers=superuser_token_headers,
+        json={"workspace_id": workspace["id"], "emails": [random_email()]},
+    )
+    pending = db.get(Invitation, uuid.UUID(r.json()["data"][0]["id"]))
+    assert pending
+    pending.expires_at = datetime.utcnow() + timedelta(hours=1)
+    db.add(pending)
+    db.commit()
+    db.execute(text("SET LOCAL TIME ZONE 'Pacific/Kiritimati'"))
+    crud.expire_invitations(session=db)
+    db.refresh(pending)
+    assert pending.status == "pending"
+
+    # The address can be invited again
+    r = client.post(
+        f"{settings.API_V1_STR}/invitations/bulk",
+        headers=superuser_token_headers,
+        json={"workspace_id": workspace["id"], "emails": [email]},
+    )
+    assert [i["email"] for i in r.json()["data"]] == [email]
+
+
+def test_accept_invitation_deleted_workspace(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+    db: Session,
+) -> None:
+    workspace = client.post(
+        f"{settings.API_V1_STR}/workspaces/",
+        headers=superuser_token_headers,
+        json={"name": "Deleted Invite Workspace"},
+    ).json()
+    r = client.post(
+        f"{settings.API_V1_STR}/invitations/bulk",
+        headers=superuser_token_headers,
+        json={"workspace_id": workspace["id"], "emails": [settings.EMAIL_TEST_USER]},
+    )
+    invitation = db.get(Invitation, uuid.UUID(r.json()["data"][0]["id"]))
+    db_workspace = db.get(Workspace, uuid.UUID(workspace["id"]))
+    assert invitation and db_workspace
+    crud.create_deletion_job(
+        session=db, entity=db_workspace, requested_by_id=db_workspace.owner_id
+    )
+    db.commit()
+
+    r = client.post(
+        f"{settings.API_V1_STR}/invitations/accept",
+        headers=normal_user_token_headers,
+        params={"token": invitation.token},
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Workspace not found"
@@ -1,12 +1,17 @@
+import time
 from unittest.mock import patch
 
+import jwt
+from fakeredis import FakeAsyncRedis, FakeServer
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
+from app.api import deps, rate_limit
 from app.core.config import settings
 from app.core.security import verify_password
+from app.core.token_denylist import TokenDenylist, claim_refresh_token
 from app.crud import create_user
-from app.models import UserCreate
+from app.models import UserCreate, WorkspaceMember
 from app.utils import generate_password_reset_token
 from tests.utils.user import user_authentication_headers
 from tests.utils.utils import random_email, random_lower_string
@@ -116,3 +121,181 @@ def test_reset_password_invalid_token(
     assert "detail" in response
     assert r.status_code == 400
     assert response["detail"] == "Invalid token"
+
+
+def _login(client: TestClient) -> dict[str, str]:
+    login_data = {
+        "username": settings.FIRST_SUPERUSER,
+        "password": settings.FIRST_SUPERUSER_PASSWORD,
+    }
+    r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == 200
+    tokens: dict[str, str] = r.json()
+    return tokens
+
+
+def _test_token(client: TestClient, access_token: str) -> int:
+    r = client.post(
+        f"{settings.API_V1_STR}/login/test-token",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    return r.status_code
+
+
+def test_refresh_token(client: TestClient) -> None:
+    tokens = _login(client)
+    r = client.post(
+        f"{settings.API_V1_STR}/login/refresh-token",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 200
+    refreshed = r.json()
+    assert _test_token(client, refreshed["access_token"]) == 200
+
+    # Refresh tokens are single use, and access tokens cannot refresh
+    for token in (tokens["refresh_token"], refreshed["access_token"]):
+        r = client.post(
+            f"{settings.API_V1_STR}/login/refresh-token", json={"refresh_token": token}
+        )
+        assert r.status_code == 403
+
+    # Rotation is tracked apart from the denylist, which only holds logouts
+    refresh_jti = jwt.decode(
+        tokens["refresh_token"], options={"verify_signature": False}
+    )["jti"]
+    assert not TokenDenylist().is_revoked(refresh_jti)
+
+
+def test_refresh_token_claimed_once() -> None:
+    assert claim_refresh_token("jti-claimed-once", time.time() + 60)
+    assert not claim_refresh_token("jti-claimed-once", time.time() + 60)
+
+
+def test_logout(client: TestClient) -> None:
+    tokens = _login(client)
+    other_session = _login(client)
+    r = client.post(
+        f"{settings.API_V1_STR}/login/logout",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 200
+    assert _test_token(client, tokens["access_token"]) == 403
+    r = client.post(
+        f"{settings.API_V1_STR}/login/refresh-token",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 403
+    assert _test_token(client, other_session["access_token"]) == 200
+
+    # Other workers pick the revocation up from Redis
+    assert TokenDenylist().is_revoked(
+        jwt.decode(tokens["access_token"], options={"verify_signature": False})["jti"]
+    )
+
+
+def test_logout_all(client: TestClient) -> None:
+    first = _login(client)
+    second = _login(client)
+    r = client.post(
+        f"{settings.API_V1_STR}/login/logout-all",
+        headers={"Authorization": f"Bearer {first['access_token']}"},
+    )
+    assert r.status_code == 200
+    for tokens in (first, second):
+        assert _test_token(client, tokens["access_token"]) == 403
+        r = client.post(
+            f"{settings.API_V1_STR}/login/refresh-token",
+            json={"refresh_token": tokens["refresh_token"]},
+        )
+        assert r.status_code == 403
+    assert _test_token(client, _login(client)["access_token"]) == 200
+
+
+def test_membership_claims(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    r = client.post(
+        f"{settings.API_V1_STR}/workspaces/", headers=headers, json={"name": "Claims"}
+    )
+    workspace_id = r.json()["id"]
+
+    with patch("app.core.config.settings.TOKEN_MEMBERSHIP_CLAIMS", True):
+        headers = user_authentication_headers(
+            client=client, email=email, password=password
+        )
+        claims = jwt.decode(
+            headers["Authorization"].removeprefix("Bearer "),
+            options={"verify_signature": False},
+        )
+        assert claims["ws"] == {workspace_id.replace("-", ""): "owner"}
+
+        # Authorized from the token: the user and the workspace, no membership
+        with patch("app.api.deps.decode_token", wraps=deps.decode_token) as decode:
+            r = client.get(
+                f"{settings.API_V1_STR}/workspaces/{workspace_id}", headers=headers
+            )
+        assert r.status_code == 200
+        assert r.headers["x-db-query-count"] == "2"
+        # Once for both the current user and the memberships
+        decode.assert_called_once()
+
+        # The change bumps the user's membership version, so the same token's
+        # claims are stale and the database is asked instead
+        member = db.get(WorkspaceMember, (workspace_id, user.id))
+        db.delete(member)
+        db.commit()
+        r = client.get(
+            f"{settings.API_V1_STR}/workspaces/{workspace_id}", headers=headers
+        )
+        assert r.status_code == 400
+
+
+def test_login_rate_limited_per_email(client: TestClient) -> None:
+    login_data = {"username": random_email(), "password": "incorrect"}
+    with patch("app.core.config.settings.RATE_LIMIT_LOGIN_PER_EMAIL", "2/minute"):
+        for _ in range(2):
+            r = client.post(
+                f"{settings.API_V1_STR}/login/access-token", data=login_data
+            )
+            assert r.status_code == 400
+        r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+        assert r.status_code == 429
+        assert 0 < int(r.headers["retry-after"]) <= 60
+
+        # Other accounts are not affected
+        login_data["username"] = random_email()
+        r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+        assert r.status_code == 400
+
+
+def test_password_recovery_rate_limited_before_lookup(client: TestClient) -> None:
+    email = random_email()
+    with patch(
+        "app.core.config.settings.RATE_LIMIT_PASSWORD_RECOVERY_PER_EMAIL", "1/hour"
+    ):
+        r = client.post(f"{settings.API_V1_STR}/password-recovery/{email}")
+        assert r.status_code == 404
+        with patch("app.crud.get_user_by_email") as get_user_by_email:
+            r = client.post(f"{settings.API_V1_STR}/password-recovery/{email}")
+        assert r.status_code == 429
+        get_user_by_email.assert_not_called()
+
+
+def test_rate_limit_lets_requests_through_without_redis(client: TestClient) -> None:
+    server = FakeServer()
+    server.connected = False
+    login_data = {
+        "username": settings.FIRST_SUPERUSER,
+        "password": settings.FIRST_SUPERUSER_PASSWORD,
+    }
+    with (
+        patch.object(rate_limit, "redis_client", FakeAsyncRedis(server=server)),
+        patch("app.core.config.settings.RATE_LIMIT_LOGIN_PER_IP", "0/minute"),
+    ):
+        r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == 200
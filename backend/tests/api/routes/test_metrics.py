@@ -0,0 +1,20 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_metrics_endpoint(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/v1/users/me",status="200"}'
+        in body
+    )
+    assert "db_pool_checkout_wait_seconds_count" in body
+    assert "http_requests_in_flight" in body
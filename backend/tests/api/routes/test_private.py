@@ -1,6 +1,9 @@
+from typing import Any
+
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
+from app.core import slow_queries
 from app.core.config import settings
 from app.models import User
 
@@ -24,3 +27,27 @@ def test_create_user(client: TestClient, db: Session) -> None:
     assert user
     assert user.email == "pollo@listo.com"
     assert user.full_name == "Pollo Listo"
+
+
+def test_read_slow_queries(
+    client: TestClient, superuser_token_headers: dict[str, str], monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert r.status_code == 200
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 1e9)
+    slow_queries._explain_executor.submit(lambda: None).result(timeout=10)
+
+    r = client.get(f"{settings.API_V1_STR}/private/slow-queries/")
+    entries = [e for e in r.json() if e["route"] == "GET /api/v1/users/me"]
+    assert entries
+    entry = entries[0]
+    assert entry["statement"].startswith("SELECT")
+    assert entry["plan"][0]["Plan"]["Node Type"]
+
+
+def test_slow_query_parameters_are_redacted() -> None:
+    redacted = slow_queries.redact_parameters(
+        {"email_1": "pollo@listo.com", "param_1": 5, "id_1": None}
+    )
+    assert redacted == {"email_1": "<str>", "param_1": 5, "id_1": None}
@@ -0,0 +1,63 @@
+import anyio.to_thread
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import profiling
+from app.api.profiling import ProfilerMiddleware, install_thread_profiling
+from app.core.config import settings
+from app.main import app
+
+
+@pytest.fixture
+def profiled_client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    # Put the original back afterwards
+    monkeypatch.setattr(anyio.to_thread, "run_sync", anyio.to_thread.run_sync)
+    install_thread_profiling()
+    return TestClient(ProfilerMiddleware(app))
+
+
+def test_threadpool_untouched_by_default() -> None:
+    assert anyio.to_thread.run_sync is profiling._original_run_sync
+    # Building the middleware alone must not swap it either
+    ProfilerMiddleware(app)
+    assert anyio.to_thread.run_sync is profiling._original_run_sync
+
+
+def test_profile_request_as_superuser(
+    profiled_client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = profiled_client.get(
+        f"{settings.API_V1_STR}/users/me",
+        headers={**superuser_token_headers, "X-Profile": "speedscope"},
+    )
+    assert r.status_code == 200
+    assert r.headers["x-profiled-status"] == "200"
+    profile = r.json()
+    assert profile["$schema"].startswith("https://www.speedscope.app/")
+    assert "id" not in profile
+    # Sync dependencies run in the threadpool and are profiled there
+    frames = {frame["name"] for frame in profile["shared"]["frames"]}
+    assert "get_current_user" in frames
+
+
+def test_profile_request_html(
+    profiled_client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = profiled_client.get(
+        f"{settings.API_V1_STR}/users/me",
+        headers={**superuser_token_headers, "X-Profile": "1"},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/html")
+
+
+def test_profile_header_ignored_for_normal_user(
+    profiled_client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = profiled_client.get(
+        f"{settings.API_V1_STR}/users/me",
+        headers={**normal_user_token_headers, "X-Profile": "speedscope"},
+    )
+    assert r.status_code == 200
+    assert "x-profiled-status" not in r.headers
+    assert r.json()["email"]
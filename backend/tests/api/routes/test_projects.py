@@ -1,12 +1,21 @@
 
 import uuid
+from typing import Any
+
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, col, select
 
 from app import crud
 from app.core.config import settings
-from app.models import Project, User, Workspace, WorkspaceMember
-from tests.utils.utils import random_email, random_lower_string
+from app.models import (
+    Comment,
+    Project,
+    Tombstone,
+    User,
+    Workspace,
+    WorkspaceMember,
+)
+from tests.utils.utils import assert_query_budget, random_email, random_lower_string
 
 def create_workspace(client: TestClient, headers: dict) -> dict:
     data = {"name": "Test Workspace", "description": "Description"}
@@ -108,3 +117,187 @@ def test_delete_project(
         headers=superuser_token_headers
     )
     assert response.status_code == 404
+
+def test_read_projects_query_budget(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    workspace = create_workspace(client, normal_user_token_headers)
+    for i in range(settings.QUERY_STATS_REPEAT_THRESHOLD + 1):
+        client.post(
+            f"{settings.API_V1_STR}/projects/",
+            headers=normal_user_token_headers,
+            json={
+                "name": f"Budget Project {i}",
+                "workspace_id": workspace["id"],
+                "is_private": bool(i % 2),
+            },
+        )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/",
+        headers=normal_user_token_headers,
+        params={"workspace_id": workspace["id"]},
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == settings.QUERY_STATS_REPEAT_THRESHOLD + 1
+    assert_query_budget(response, max_queries=6)
+
+
+def test_delete_workspace_purges_children_in_batches(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    monkeypatch: Any,
+) -> None:
+    monkeypatch.setattr(settings, "DELETION_BATCH_SIZE", 2)
+    workspace = create_workspace(client, superuser_token_headers)
+    project = client.post(
+        f"{settings.API_V1_STR}/projects/",
+        headers=superuser_token_headers,
+        json={"name": "Purged Project", "workspace_id": workspace["id"]},
+    ).json()
+    section = client.post(
+        f"{settings.API_V1_STR}/sections/",
+        headers=superuser_token_headers,
+        json={"title": "Purged Section", "project_id": project["id"]},
+    ).json()
+    task_ids = []
+    for i in range(5):
+        task = client.post(
+            f"{settings.API_V1_STR}/tasks/",
+            headers=superuser_token_headers,
+            json={
+                "title": f"Purged Task {i}",
+                "project_id": project["id"],
+                "section_id": section["id"],
+            },
+        ).json()
+        client.post(
+            f"{settings.API_V1_STR}/comments/",
+            headers=superuser_token_headers,
+            json={"content": "Purged", "task_id": task["id"]},
+        )
+        task_ids.append(task["id"])
+
+    # TestClient runs background tasks before returning the response
+    response = client.delete(
+        f"{settings.API_V1_STR}/workspaces/{workspace['id']}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        f"{settings.API_V1_STR}/workspaces/{workspace['id']}/deletion",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    job = response.json()
+    assert job["status"] == "done"
+    # 5 tasks, 1 section, 1 project
+    assert job["total_rows"] == job["deleted_rows"] == 7
+
+    db.expire_all()
+    assert db.get(Workspace, uuid.UUID(workspace["id"])) is None
+    assert db.get(Project, uuid.UUID(project["id"])) is None
+    assert db.exec(
+        select(Comment).where(col(Comment.task_id).in_(task_ids))
+    ).first() is None
+
+
+def test_deleted_project_hidden_before_purge(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    workspace = create_workspace(client, superuser_token_headers)
+    project = client.post(
+        f"{settings.API_V1_STR}/projects/",
+        headers=superuser_token_headers,
+        json={"name": "Soft Deleted Project", "workspace_id": workspace["id"]},
+    ).json()
+    db_project = db.get(Project, uuid.UUID(project["id"]))
+    assert db_project
+    crud.create_deletion_job(
+        session=db, entity=db_project, requested_by_id=db_project.owner_id
+    )
+    db.commit()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/{project['id']}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 404
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/",
+        headers=superuser_token_headers,
+        params={"workspace_id": workspace["id"]},
+    )
+    assert response.json()["count"] == 0
+
+
+def test_deleted_project_tasks_hidden_before_purge(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    workspace = create_workspace(client, superuser_token_headers)
+    project = client.post(
+        f"{settings.API_V1_STR}/projects/",
+        headers=superuser_token_headers,
+        json={"name": "Soft Deleted Tasks", "workspace_id": workspace["id"]},
+    ).json()
+    task = client.post(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=superuser_token_headers,
+        json={"title": "Orphaned", "project_id": project["id"]},
+    ).json()
+    db_workspace = db.get(Workspace, uuid.UUID(workspace["id"]))
+    assert db_workspace
+    crud.create_deletion_job(
+        session=db, entity=db_workspace, requested_by_id=db_workspace.owner_id
+    )
+    db.commit()
+
+    # The workspace took its project with it, and told sync clients so
+    tombstones = db.exec(
+        select(Tombstone).where(Tombstone.entity_id == uuid.UUID(project["id"]))
+    ).all()
+    assert [(t.entity_type, str(t.workspace_id)) for t in tombstones] == [
+        ("project", workspace["id"])
+    ]
+    url = f"{settings.API_V1_STR}/tasks/{task['id']}"
+    assert client.get(url, headers=superuser_token_headers).status_code == 404
+    response = client.put(url, headers=superuser_token_headers, json={"title": "x"})
+    assert response.status_code == 404
+    assert client.delete(url, headers=superuser_token_headers).status_code == 404
+
+
+def test_read_projects_fields(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    workspace = create_workspace(client, superuser_token_headers)
+    r = client.post(
+        f"{settings.API_V1_STR}/projects/",
+        headers=superuser_token_headers,
+        json={"name": "Sparse Project", "workspace_id": workspace["id"]},
+    )
+    project = r.json()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/",
+        headers=superuser_token_headers,
+        params={"workspace_id": workspace["id"], "fields": "name,workspace_name"},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"] == [
+        {
+            "id": project["id"],
+            "name": "Sparse Project",
+            "workspace_name": workspace["name"],
+        }
+    ]
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/{project['id']}/members",
+        headers=superuser_token_headers,
+        params={"fields": "role"},
+    )
+    assert response.status_code == 200
+    assert [set(m) for m in response.json()["data"]] == [{"id", "role"}]
+    assert response.json()["data"][0]["role"] == "owner"
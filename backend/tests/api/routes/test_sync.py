@@ -0,0 +1,190 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def create_project(client: TestClient, headers: dict) -> dict:
+    ws = client.post(
+        f"{settings.API_V1_STR}/workspaces/",
+        headers=headers,
+        json={"name": "Sync Workspace"},
+    ).json()
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/",
+        headers=headers,
+        json={"name": "Sync Project", "workspace_id": ws["id"]},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_sync_returns_only_changes_since_token(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    proj = create_project(client, normal_user_token_headers)
+    task = client.post(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=normal_user_token_headers,
+        json={"title": "Sync Task", "project_id": proj["id"]},
+    ).json()
+
+    r = client.get(f"{settings.API_V1_STR}/sync/", headers=normal_user_token_headers)
+    assert r.status_code == 200
+    content = r.json()
+    assert task["id"] in [t["id"] for t in content["tasks"]]
+    token = content["next_token"]
+
+    client.delete(
+        f"{settings.API_V1_STR}/tasks/{task['id']}", headers=normal_user_token_headers
+    )
+
+    r = client.get(
+        f"{settings.API_V1_STR}/sync/",
+        headers=normal_user_token_headers,
+        params={"since": token},
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert task["id"] not in [t["id"] for t in content["tasks"]]
+    assert {"entity_type": "task", "entity_id": task["id"]}.items() <= content[
+        "deleted"
+    ][-1].items()
+
+
+def test_sync_hides_other_users_projects(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    proj = create_project(client, superuser_token_headers)
+    task = client.post(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=superuser_token_headers,
+        json={"title": "Hidden Task", "project_id": proj["id"]},
+    ).json()
+
+    r = client.get(f"{settings.API_V1_STR}/sync/", headers=normal_user_token_headers)
+    assert r.status_code == 200
+    assert task["id"] not in [t["id"] for t in r.json()["tasks"]]
+
+
+def test_sync_invalid_token(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/sync/",
+        headers=normal_user_token_headers,
+        params={"since": "not-a-token"},
+    )
+    assert r.status_code == 400
+
+
+def test_sync_pages_through_changes(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    proj = create_project(client, normal_user_token_headers)
+    created = {
+        client.post(
+            f"{settings.API_V1_STR}/tasks/",
+            headers=normal_user_token_headers,
+            json={"title": f"Paged Task {i}", "project_id": proj["id"]},
+        ).json()["id"]
+        for i in range(5)
+    }
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    for _ in range(20):
+        r = client.get(
+            f"{settings.API_V1_STR}/sync/",
+            headers=normal_user_token_headers,
+            params=params,
+        )
+        assert r.status_code == 200
+        content = r.json()
+        assert len(content["tasks"]) <= 2
+        seen += [t["id"] for t in content["tasks"]]
+        params["since"] = content["next_token"]
+        if not content["has_more"]:
+            break
+    assert created <= set(seen)
+    # Each task once within a round
+    assert len(seen) == len(set(seen))
+
+
+def test_sync_round_ignores_changes_made_while_paging(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    proj = create_project(client, normal_user_token_headers)
+    for i in range(2):
+        client.post(
+            f"{settings.API_V1_STR}/tasks/",
+            headers=normal_user_token_headers,
+            json={"title": f"Round Task {i}", "project_id": proj["id"]},
+        )
+    r = client.get(
+        f"{settings.API_V1_STR}/sync/",
+        headers=normal_user_token_headers,
+        params={"limit": 1},
+    )
+    assert r.json()["has_more"]
+    late = client.post(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=normal_user_token_headers,
+        json={"title": "Late Task", "project_id": proj["id"]},
+    ).json()
+
+    seen: list[str] = []
+    content = r.json()
+    while content["has_more"]:
+        r = client.get(
+            f"{settings.API_V1_STR}/sync/",
+            headers=normal_user_token_headers,
+            params={"since": content["next_token"], "limit": 1},
+        )
+        content = r.json()
+        seen += [t["id"] for t in content["tasks"]]
+    assert late["id"] not in seen
+
+    # The next round picks it up
+    r = client.get(
+        f"{settings.API_V1_STR}/sync/",
+        headers=normal_user_token_headers,
+        params={"since": content["next_token"]},
+    )
+    assert late["id"] in [t["id"] for t in r.json()["tasks"]]
+
+
+def test_sync_drops_deleted_projects(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    proj = create_project(client, normal_user_token_headers)
+    task = client.post(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=normal_user_token_headers,
+        json={"title": "Deleted Project Task", "project_id": proj["id"]},
+    ).json()
+    r = client.get(f"{settings.API_V1_STR}/sync/", headers=normal_user_token_headers)
+    token = r.json()["next_token"]
+
+    # The purge runs in the background; until then the rows still exist
+    with patch("app.api.routes.projects.purge"):
+        r = client.delete(
+            f"{settings.API_V1_STR}/projects/{proj['id']}",
+            headers=normal_user_token_headers,
+        )
+    assert r.status_code == 200
+
+    for since in (None, token):
+        r = client.get(
+            f"{settings.API_V1_STR}/sync/",
+            headers=normal_user_token_headers,
+            params={"since": since} if since else {},
+        )
+        content = r.json()
+        assert task["id"] not in [t["id"] for t in content["tasks"]]
+    assert {"entity_type": "project", "entity_id": proj["id"]}.items() <= content[
+        "deleted"
+    ][-1].items()
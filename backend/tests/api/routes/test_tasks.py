@@ -3,6 +3,7 @@ import uuid
 from fastapi.testclient import TestClient
 
 from app.core.config import settings
+from tests.utils.utils import assert_query_budget
 
 def create_workspace(client: TestClient, headers: dict) -> dict:
     data = {"name": "Task Workspace", "description": "Description"}
@@ -103,3 +104,162 @@ def test_delete_task(
         headers=superuser_token_headers
     )
     assert response.status_code == 404
+
+def test_read_tasks_due_date_range(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    ws = create_workspace(client, superuser_token_headers)
+    proj = create_project(client, superuser_token_headers, ws["id"])
+
+    for title, due_date in [
+        ("Overdue Task", "2030-01-01"),
+        ("This Week Task", "2030-01-10"),
+        ("Later Task", "2030-02-01"),
+    ]:
+        r = client.post(
+            f"{settings.API_V1_STR}/tasks/",
+            headers=superuser_token_headers,
+            json={"title": title, "project_id": proj["id"], "due_date": due_date},
+        )
+        assert r.status_code == 200
+        assert r.json()["due_date"] == due_date
+
+    response = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=superuser_token_headers,
+        params={
+            "project_id": proj["id"],
+            "due_after": "2030-01-05",
+            "due_before": "2030-01-12",
+        },
+    )
+    assert response.status_code == 200
+    titles = [t["title"] for t in response.json()["data"]]
+    assert titles == ["This Week Task"]
+
+    response = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=superuser_token_headers,
+        params={"project_id": proj["id"], "due_before": "2030-01-05"},
+    )
+    assert [t["title"] for t in response.json()["data"]] == ["Overdue Task"]
+
+
+def test_create_task_invalid_due_date(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    ws = create_workspace(client, superuser_token_headers)
+    proj = create_project(client, superuser_token_headers, ws["id"])
+
+    response = client.post(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=superuser_token_headers,
+        json={"title": "Bad Date", "project_id": proj["id"], "due_date": "next week"},
+    )
+    assert response.status_code == 422
+
+
+def test_read_tasks_count_modes(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    ws = create_workspace(client, superuser_token_headers)
+    proj = create_project(client, superuser_token_headers, ws["id"])
+    for i in range(3):
+        client.post(
+            f"{settings.API_V1_STR}/tasks/",
+            headers=superuser_token_headers,
+            json={"title": f"Page Task {i}", "project_id": proj["id"]},
+        )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=superuser_token_headers,
+        params={"project_id": proj["id"], "limit": 2, "include_count": "none"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert len(content["data"]) == 2
+    assert content["count"] is None
+    assert content["has_more"] is True
+
+    response = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=superuser_token_headers,
+        params={"project_id": proj["id"], "limit": 2, "include_count": "exact"},
+    )
+    content = response.json()
+    assert content["count"] == 3
+    assert content["has_more"] is True
+
+    response = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=superuser_token_headers,
+        params={"project_id": proj["id"], "skip": 2, "include_count": "estimated"},
+    )
+    content = response.json()
+    assert len(content["data"]) == 1
+    assert content["count"] == 3
+    assert content["has_more"] is False
+
+
+def test_read_tasks_query_budget(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    ws = create_workspace(client, superuser_token_headers)
+    proj = create_project(client, superuser_token_headers, ws["id"])
+    for i in range(settings.QUERY_STATS_REPEAT_THRESHOLD + 1):
+        client.post(
+            f"{settings.API_V1_STR}/tasks/",
+            headers=superuser_token_headers,
+            json={"title": f"Budget Task {i}", "project_id": proj["id"]},
+        )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=superuser_token_headers,
+        params={"project_id": proj["id"]},
+    )
+    assert response.status_code == 200
+    assert_query_budget(response, max_queries=3)
+
+
+def test_read_tasks_fields(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    ws = create_workspace(client, normal_user_token_headers)
+    proj = create_project(client, normal_user_token_headers, ws["id"])
+    r = client.post(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=normal_user_token_headers,
+        json={
+            "title": "Sparse Task",
+            "description": "Not wanted on mobile",
+            "project_id": proj["id"],
+            "due_date": "2031-03-01",
+        },
+    )
+    task = r.json()
+
+    # Without project_id: the DISTINCT query over the user's projects, ordered
+    # by a column that was not asked for
+    response = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=normal_user_token_headers,
+        params={
+            "fields": "title,status,assignee_id",
+            "due_after": "2031-01-01",
+            "due_before": "2032-01-01",
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["data"] == [
+        {"id": task["id"], "title": "Sparse Task", "status": "todo", "assignee_id": None}
+    ]
+
+    response = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=normal_user_token_headers,
+        params={"fields": "title,secret"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: secret"
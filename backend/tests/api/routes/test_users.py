@@ -5,6 +5,7 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
 from app import crud
+from app.api.pagination import encode_cursor
 from app.core.config import settings
 from app.core.security import verify_password
 from app.models import User, UserCreate
@@ -484,3 +485,64 @@ def test_delete_user_without_privileges(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "The user doesn't have enough privileges"
+
+
+def test_retrieve_users_search_and_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    tag = random_lower_string()[:12]
+    emails = sorted(f"{tag}.{i}@example.com" for i in range(5))
+    for email in emails:
+        crud.create_user(
+            session=db, user_create=UserCreate(email=email, password="password123")
+        )
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": tag.upper(), "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get(
+            f"{settings.API_V1_STR}/users/",
+            headers=superuser_token_headers,
+            params=params,
+        )
+        assert r.status_code == 200
+        page = r.json()
+        seen += [u["email"] for u in page["data"]]
+        if not cursor:
+            assert page["count"] == 5
+        cursor = page["next_cursor"]
+        assert page["has_more"] == (cursor is not None)
+        if not cursor:
+            break
+    assert seen == emails
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"q": "%"},
+    )
+    assert r.json()["data"] == []
+
+
+def test_retrieve_users_invalid_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid cursor"
+
+    # Well-formed, but with more values than the ordering has columns
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"cursor": encode_cursor(["a@example.com", str(uuid.uuid4()), 1])},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,52 @@
+import smtplib
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app import utils
+from app.core.config import settings
+from app.core.db import engine
+from app.main import app
+
+
+def test_ready_after_warmup(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/utils/ready/")
+    assert r.status_code == 200
+    assert r.json() is True
+    assert engine.pool.checkedin() >= min(settings.WARMUP_DB_CONNECTIONS, 5)
+    assert utils._load_email_template.cache_info().currsize > 0
+
+
+def test_not_ready_after_shutdown() -> None:
+    with TestClient(app) as c:
+        assert c.get(f"{settings.API_V1_STR}/utils/ready/").status_code == 200
+    assert app.state.ready is False
+    # A new startup warms up again
+    with TestClient(app) as c:
+        assert c.get(f"{settings.API_V1_STR}/utils/ready/").status_code == 200
+
+
+def test_send_emails_counts_failed_message_when_connection_drops() -> None:
+    messages = [
+        (f"user{i}@example.com", utils.EmailData(html_content="", subject="Hi"))
+        for i in range(4)
+    ]
+    before = REGISTRY.get_sample_value("email_send_failures_total") or 0.0
+    with (
+        patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "info@example.com"),
+        patch("app.core.config.settings.EMAILS_BATCH_SIZE", 10),
+        patch("smtplib.SMTP") as smtp,
+    ):
+        server = smtp.return_value.__enter__.return_value
+        server.send_message.side_effect = [
+            None,
+            smtplib.SMTPRecipientsRefused({}),
+            smtplib.SMTPServerDisconnected("gone"),
+        ]
+        assert utils.send_emails(messages=messages) == 1
+    # The refused one, the one in flight when the connection dropped and
+    # the one never tried
+    after = REGISTRY.get_sample_value("email_send_failures_total")
+    assert after == before + 3
@@ -1,9 +1,12 @@
 from collections.abc import Generator
 
 import pytest
+from fakeredis import FakeAsyncRedis, FakeRedis, FakeServer
 from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
 
+from app.api import rate_limit
+from app.core import lifespan, token_denylist
 from app.core.config import settings
 from app.core.db import engine, init_db
 from app.main import app
@@ -24,6 +27,28 @@ def db() -> Generator[Session, None, None]:
         session.commit()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def fake_redis() -> Generator[FakeRedis, None, None]:
+    server = FakeServer()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(rate_limit, "redis_client", FakeAsyncRedis(server=server))
+        mp.setattr(
+            token_denylist,
+            "redis_client_sync",
+            FakeRedis(server=server, decode_responses=True),
+        )
+        # Own clients, since every TestClient closes them on shutdown
+        mp.setattr(lifespan, "redis_client", FakeAsyncRedis(server=server))
+        mp.setattr(lifespan, "redis_client_sync", FakeRedis(server=server))
+        yield FakeRedis(server=server)
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits(fake_redis: FakeRedis) -> None:
+    # Tests log in far more often than any real client would
+    fake_redis.flushall()
+
+
 @pytest.fixture(scope="module")
 def client() -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
@@ -1,7 +1,10 @@
+from unittest.mock import patch
+
 from fastapi.encoders import jsonable_encoder
 from sqlmodel import Session
 
 from app import crud
+from app.core import security
 from app.core.security import verify_password
 from app.models import User, UserCreate, UserUpdate
 from tests.utils.utils import random_email, random_lower_string
@@ -26,6 +29,30 @@ def test_authenticate_user(db: Session) -> None:
     assert user.email == authenticated_user.email
 
 
+def test_authenticate_user_rehashes_outdated_hash(db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=email, password=password)
+    with patch.object(
+        security, "pwd_context", security.password_context(bcrypt_rounds=4)
+    ):
+        user = crud.create_user(session=db, user_create=user_in)
+    assert user.hashed_password.startswith("$2b$04$")
+
+    argon2 = security.password_context(
+        "argon2", argon2_time_cost=1, argon2_memory_cost=1024
+    )
+    with patch.object(security, "pwd_context", argon2):
+        authenticated_user = crud.authenticate(
+            session=db, email=email, password=password
+        )
+        assert authenticated_user
+        db.refresh(user)
+        assert user.hashed_password.startswith("$argon2id$")
+        assert not argon2.needs_update(user.hashed_password)
+        assert crud.authenticate(session=db, email=email, password=password)
+
+
 def test_not_authenticate_user(db: Session) -> None:
     email = random_email()
     password = random_lower_string()
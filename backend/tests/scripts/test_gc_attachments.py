@@ -0,0 +1,51 @@
+import os
+import time
+import uuid
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.api.routes.attachments import UPLOAD_DIR
+from app.core.config import settings
+from app.gc_attachments import collect_garbage
+from tests.api.routes.test_comments import create_task
+
+
+def _orphan(age_seconds: float) -> Path:
+    path = UPLOAD_DIR / f"{uuid.uuid4()}.txt"
+    path.write_text("orphan")
+    mtime = time.time() - age_seconds
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_collect_garbage_local(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    task = create_task(client, superuser_token_headers)
+    r = client.post(
+        f"{settings.API_V1_STR}/attachments/",
+        headers=superuser_token_headers,
+        params={"task_id": task["id"]},
+        files={"file": ("kept.txt", b"kept", "text/plain")},
+    )
+    assert r.status_code == 200
+    kept = Path(r.json()["file_path"])
+    os.utime(kept, (time.time() - 7200, time.time() - 7200))
+    old_orphan = _orphan(age_seconds=7200)
+    new_orphan = _orphan(age_seconds=0)
+
+    stats = collect_garbage(dry_run=True)
+    assert stats["local"].orphaned >= 1
+    assert stats["local"].deleted == 0
+    assert old_orphan.exists()
+
+    stats = collect_garbage(max_deletes_per_second=10_000)
+    assert stats["local"].deleted >= 1
+    assert not old_orphan.exists()
+    assert kept.exists()
+    # Too recent: its row may not be committed yet
+    assert new_orphan.exists()
+
+    kept.unlink()
+    new_orphan.unlink()
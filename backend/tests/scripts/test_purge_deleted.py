@@ -0,0 +1,70 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.models import DeletionJob, Project
+from app.purge_deleted import resume
+from tests.api.routes.test_projects import create_workspace
+
+
+def _deleted_project_job(
+    client: TestClient, headers: dict[str, str], db: Session
+) -> DeletionJob:
+    workspace = create_workspace(client, headers)
+    project = client.post(
+        f"{settings.API_V1_STR}/projects/",
+        headers=headers,
+        json={"name": "Orphaned Deletion", "workspace_id": workspace["id"]},
+    ).json()
+    db_project = db.get(Project, uuid.UUID(project["id"]))
+    assert db_project
+    # As if the worker died before its background purge ran
+    job = crud.create_deletion_job(
+        session=db, entity=db_project, requested_by_id=db_project.owner_id
+    )
+    db.commit()
+    return job
+
+
+def test_job_claimed_once(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    job = _deleted_project_job(client, superuser_token_headers, db)
+    assert crud.claim_deletion_job(session=db, job_id=job.id)
+    # Running with a fresh heartbeat: someone is purging it
+    assert crud.claim_deletion_job(session=db, job_id=job.id) is None
+
+    job.heartbeat_at = datetime.utcnow() - timedelta(
+        seconds=settings.DELETION_STALE_SECONDS + 1
+    )
+    db.add(job)
+    db.commit()
+    claimed = crud.claim_deletion_job(session=db, job_id=job.id)
+    assert claimed
+    assert claimed.attempts == 2
+
+
+def test_resume_runs_orphaned_jobs_up_to_max_attempts(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    orphaned = _deleted_project_job(client, superuser_token_headers, db)
+    exhausted = _deleted_project_job(client, superuser_token_headers, db)
+    exhausted.status = "failed"
+    exhausted.attempts = settings.DELETION_MAX_ATTEMPTS
+    db.add(exhausted)
+    db.commit()
+
+    assert resume() >= 1
+
+    db.refresh(orphaned)
+    assert orphaned.status == "done"
+    assert orphaned.attempts == 1
+    assert db.get(Project, orphaned.entity_id) is None
+    db.refresh(exhausted)
+    assert exhausted.status == "failed"
+    assert exhausted.attempts == settings.DELETION_MAX_ATTEMPTS
+    assert db.get(Project, exhausted.entity_id) is not None
@@ -0,0 +1,80 @@
+from pathlib import Path
+from unittest.mock import Mock, mock_open, patch
+
+import pytest
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.server import (
+    Server,
+    Supervisor,
+    available_cpus,
+    clear_metrics_dir,
+    get_config,
+)
+
+
+def test_workers_default_to_available_cpus() -> None:
+    with patch("app.core.config.settings.SERVER_WORKERS", None):
+        assert get_config().workers == available_cpus()
+    with patch("app.core.config.settings.SERVER_WORKERS", 3):
+        assert get_config().workers == 3
+
+
+def test_available_cpus_respects_cgroup_quota() -> None:
+    with (
+        patch("os.sched_getaffinity", return_value=set(range(8))),
+        patch("builtins.open", mock_open(read_data="150000 100000\n")),
+    ):
+        assert available_cpus() == 2
+    with (
+        patch("os.sched_getaffinity", return_value=set(range(8))),
+        patch("builtins.open", mock_open(read_data="max 100000\n")),
+    ):
+        assert available_cpus() == 8
+
+
+def test_max_requests_jitter_per_worker() -> None:
+    with (
+        patch("app.core.config.settings.SERVER_MAX_REQUESTS", 1000),
+        patch("app.core.config.settings.SERVER_MAX_REQUESTS_JITTER", 50),
+        patch.object(uvicorn.Server, "run"),
+    ):
+        config = get_config()
+        Server(config).run()
+    assert config.limit_max_requests is not None
+    assert 1000 <= config.limit_max_requests <= 1050
+
+
+def test_forwarded_allow_ips_from_settings() -> None:
+    with patch("app.core.config.settings.SERVER_FORWARDED_ALLOW_IPS", "10.0.0.0/8"):
+        config = get_config()
+    assert config.proxy_headers
+    assert config.forwarded_allow_ips == "10.0.0.0/8"
+
+
+def test_clear_metrics_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "counter_123.db").write_bytes(b"")
+    (tmp_path / "gauge_livesum_123.db").write_bytes(b"")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    clear_metrics_dir()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_supervisor_marks_dead_workers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    with patch("signal.signal"):
+        supervisor = Supervisor(get_config(), target=Mock(), sockets=[])
+    supervisor.processes = [Mock(pid=1), Mock(pid=2)]
+
+    def restart_first() -> None:
+        supervisor.processes[0] = Mock(pid=3)
+
+    with (
+        patch.object(Multiprocess, "keep_subprocess_alive", side_effect=restart_first),
+        patch("prometheus_client.multiprocess.mark_process_dead") as mark_process_dead,
+    ):
+        supervisor.keep_subprocess_alive()
+    mark_process_dead.assert_called_once_with(1)
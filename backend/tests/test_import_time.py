@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Generous default so slow CI machines pass; lower it locally to hunt regressions
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "5000"))
+# Only needed by some requests; must be imported on first use, not at startup
+LAZY_MODULES = {
+    "boto3",
+    "botocore",
+    "email.mime.multipart",
+    "jinja2",
+    "pyinstrument",
+    "sentry_sdk",
+    "smtplib",
+}
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _run(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_times() -> dict[str, tuple[int, int]]:
+    """
+    Module -> (self, cumulative) import time in microseconds.
+    """
+    stderr = _run("-X", "importtime", "-c", "import app.main").stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def test_startup_does_not_import_lazy_modules() -> None:
+    code = "import sys, app.main; print(' '.join(sys.modules))"
+    imported = set(_run("-c", code).stdout.split())
+    assert not LAZY_MODULES & imported
+
+
+def test_startup_import_time_budget() -> None:
+    # Best of three, to keep a busy machine from failing the test
+    runs = [_import_times() for _ in range(3)]
+    times = min(runs, key=lambda t: t["app.main"][1])
+    total_ms = times["app.main"][1] / 1000
+    slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    report = ", ".join(f"{module} {us / 1000:.0f}ms" for module, (us, _) in slowest)
+    assert total_ms <= IMPORT_TIME_BUDGET_MS, (
+        f"importing app.main took {total_ms:.0f}ms, budget is "
+        f"{IMPORT_TIME_BUDGET_MS:.0f}ms; slowest modules (self time): {report}"
+    )
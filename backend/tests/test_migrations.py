@@ -0,0 +1,54 @@
+from datetime import date
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+
+from app.core.db import engine
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _migration(revision: str) -> object:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "app" / "alembic"))
+    script = ScriptDirectory.from_config(config).get_revision(revision)
+    assert script is not None
+    return script.module
+
+
+def test_due_date_backfill_drops_impossible_dates() -> None:
+    migration = _migration("3c9e5a1f7b42")
+    values = [
+        "2024-02-29",
+        "2024-03-01T09:30:00Z",
+        "2024-02-30",
+        "2023-02-29T00:00:00",
+        "0000-01-01",
+        "2024-13-01",
+        "next week",
+    ]
+    with engine.connect() as connection:
+        # Shadows the real table on this connection, which is rolled back
+        connection.execute(
+            text(
+                "CREATE TEMP TABLE task (n serial, assignee_id uuid, "
+                "project_id uuid, due_date varchar)"
+            )
+        )
+        for value in values:
+            connection.execute(
+                text("INSERT INTO task (due_date) VALUES (:value)"), {"value": value}
+            )
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()  # type: ignore[attr-defined]
+        due_dates = (
+            connection.execute(text("SELECT due_date FROM task ORDER BY n"))
+            .scalars()
+            .all()
+        )
+        connection.rollback()
+    assert due_dates == [date(2024, 2, 29), date(2024, 3, 1), *[None] * 5]
@@ -2,6 +2,7 @@ import random
 import string
 
 from fastapi.testclient import TestClient
+from httpx import Response
 
 from app.core.config import settings
 
@@ -24,3 +25,14 @@ def get_superuser_token_headers(client: TestClient) -> dict[str, str]:
     a_token = tokens["access_token"]
     headers = {"Authorization": f"Bearer {a_token}"}
     return headers
+
+
+def assert_query_budget(response: Response, max_queries: int) -> None:
+    """
+    Fail if the request behind response ran more than max_queries SQL
+    statements or repeated a statement shape (a likely N+1 loop).
+    """
+    count = int(response.headers["x-db-query-count"])
+    assert count <= max_queries, f"{count} queries, budget is {max_queries}"
+    repeated = int(response.headers["x-db-repeated-queries"])
+    assert repeated == 0, f"{repeated} statements repeated per row (N+1)"